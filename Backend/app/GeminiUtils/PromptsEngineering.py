@@ -29,3 +29,29 @@ The secret word is: {{SECRET_WORD}}
 You must ONLY respond with one of the allowed responses. Nothing else."""
 
 
+BATCH_OUTPUT_FORMAT = """### OUTPUT FORMAT
+For this message only, respond with a JSON object mapping each question number to its answer, using only the allowed responses, e.g. {"1": "Yes", "2": "No"}. Output nothing but the JSON object."""
+
+
+def batch_questions_prompt(questions: list[str]) -> str:
+    """Message asking for the answers to several numbered questions at once, as a JSON object."""
+    numbered = "\n".join(f"{i}. {question}" for i, question in enumerate(questions, 1))
+    return f"""Answer each of the questions below on its own, following all of the rules above.
+
+### QUESTIONS
+{numbered}
+
+{BATCH_OUTPUT_FORMAT}"""
+
+
+def multi_game_batch_prompt(items: list[tuple[str, str]]) -> str:
+    """Message asking for the answers to questions from several games, each with its own secret word."""
+    numbered = "\n".join(
+        f"{i}. [Secret word: {secret_word}] {question}" for i, (secret_word, question) in enumerate(items, 1)
+    )
+    return f"""You are the Game Master of several independent games at once. Each numbered question below comes with its own secret word: answer it about that secret word only, as if it were the only game, following all of the rules above.
+
+### QUESTIONS
+{numbered}
+
+{BATCH_OUTPUT_FORMAT}"""
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import List, Union
+from typing import Dict, List, Optional, Union
 from pydantic import field_validator
 from pathlib import Path
 
@@ -30,12 +30,114 @@ class Settings(BaseSettings):
 
     # Database - Railway PostgreSQL URL using TCP Proxy
     # TCP Proxy: caboose.proxy.rlwy.net:23203 -> :5432
-    # Loaded from .env file
-    DATABASE_URL: str
+    # Loaded from .env file; optional - the app boots without a database
+    DATABASE_URL: Optional[str] = None
 
     # Gemini API - Loaded from .env file
     GOOGLE_API_KEY: str
     GEMINI_MODEL: str = "gemini-2.5-flash-live"  # Using stable model with full path
+    # Cheaper model asked game questions first; its unsure, unparseable or contradictory
+    # answers are re-asked of GEMINI_MODEL (empty sends everything to GEMINI_MODEL)
+    GEMINI_FAST_MODEL: str = ""
+    # Import LangChain in a background thread at startup instead of on the loop at the first question
+    LLM_PRELOAD: bool = True
+
+    # Server launch profile - "development" (auto-reload) or "production" (see app/core/server.py)
+    SERVER_MODE: str = "development"
+    HOST: str = "0.0.0.0"
+    PORT: int = 8000
+    # Lobby state lives in process memory, so more than one worker needs sticky routing by PIN
+    WEB_CONCURRENCY: int = 1
+    SERVER_KEEP_ALIVE: int = 65  # seconds; keep above the load balancer's idle timeout
+    SERVER_BACKLOG: int = 2048
+    SERVER_ACCESS_LOG: bool = False
+    SERVER_LIMIT_CONCURRENCY: Optional[int] = None  # connections beyond this get a 503
+    # Peers trusted to set X-Forwarded-For/-Proto (comma-separated IPs or CIDRs, "*" for any);
+    # only a proxy in front of the server should be, or clients can spoof their address
+    FORWARDED_ALLOW_IPS: str = "127.0.0.1"
+    LOG_LEVEL: str = "info"
+    # App logs - "json" (one object per line) or "text", and the fraction of
+    # records kept for high-frequency polling routes
+    LOG_FORMAT: str = "json"
+    LOG_SAMPLE_RATES: Dict[str, float] = {"get_lobby_info": 0.01, "get_leaderboard": 0.01, "sync_lobby": 0.01}
+
+    @field_validator("SERVER_MODE")
+    @classmethod
+    def parse_server_mode(cls, v):
+        if v not in ("development", "production"):
+            raise ValueError("SERVER_MODE must be 'development' or 'production'")
+        return v
+
+    # Background question answering (POST /lobby/{pin}/question/async)
+    QUESTION_WORKERS: int = 8
+    QUESTION_QUEUE_SIZE: int = 1000
+    # Question rate limits - token buckets refilling at RATE questions per second up to BURST,
+    # per asking user and per lobby (a rate of 0 disables that limit)
+    QUESTION_RATE_PER_USER: float = 0.5
+    QUESTION_BURST_PER_USER: int = 5
+    QUESTION_RATE_PER_LOBBY: float = 2.0
+    QUESTION_BURST_PER_LOBBY: int = 15
+    # Answer a question from a near-duplicate already answered in its lobby when their
+    # hashed n-gram cosine similarity reaches this (0 disables; see benchmarks/eval_question_reuse.py)
+    QUESTION_REUSE_THRESHOLD: float = 0.9
+    # A fast-tier Yes/No contradicting the answer to an earlier question at least this similar is escalated;
+    # 0.85 keeps false similarity under 5% in eval_question_reuse (0.75 flagged 27.6% of different pairs)
+    QUESTION_CONFLICT_THRESHOLD: float = 0.85
+    # Precompute the answers to common opening questions when a lobby is created (needs reuse enabled)
+    OPENING_ANSWERS_ENABLED: bool = True
+
+    # Cross-lobby micro-batching of game questions - collect questions for up to this many seconds
+    # (or LLM_BATCH_MAX questions) and answer them in one LLM call (0 disables; see benchmarks/bench_batching.py)
+    LLM_BATCH_WINDOW: float = 0.0
+    LLM_BATCH_MAX: int = 16
+
+    # LLM token metering - USD per million input/output tokens for cost estimates, and the
+    # most tokens one lobby may use before its questions are refused (0 means no limit)
+    LLM_INPUT_COST_PER_MTOK: float = 0.30
+    LLM_OUTPUT_COST_PER_MTOK: float = 2.50
+    LOBBY_TOKEN_BUDGET: int = 0
+
+    # QR codes - number of rendered images kept in the LRU cache (0 disables caching)
+    QR_CACHE_SIZE: int = 256
+    # PNG rasterizer for QR codes: "pil" (qrcode's Pillow drawing) or "numpy" (vectorized)
+    QR_RASTERIZER: str = "numpy"
+    # Off-loop QR rendering: "thread" or "process" pool, its size, and max renders queued or running
+    QR_RENDER_EXECUTOR: str = "thread"
+    QR_RENDER_WORKERS: int = 2
+    QR_RENDER_CONCURRENCY: int = 8
+    # Batch QR rendering (POST /qr/batch) - process pool size, images in flight, max links per request
+    QR_BATCH_WORKERS: int = 2
+    QR_BATCH_WINDOW: int = 8
+    QR_BATCH_MAX_LINKS: int = 500
+    # Frontend origin used to build lobby join links for GET /qr/{pin}.png|.svg
+    FRONTEND_URL: str = "http://localhost:5173"
+
+    # Lobby event log - set EVENT_LOG_DIR to persist events to local segment files
+    EVENT_LOG_DIR: Optional[str] = None
+    EVENT_LOG_SEGMENT_BYTES: int = 1_048_576
+
+    # Metrics - expose GET /metrics and record per-route latency; seconds between event-loop lag samples,
+    # and how long (seconds) one event-loop step may block before its route and stack are recorded (0 disables);
+    # only blocks that delay a lag sample are caught, so a lower interval catches more of them
+    METRICS_ENABLED: bool = True
+    LOOP_LAG_INTERVAL: float = 0.5
+    LOOP_SLOW_CALLBACK_THRESHOLD: float = 0.1
+
+    # Admin endpoints (/api/v1/admin/...) require this token in the X-Admin-Token header; unset disables them
+    ADMIN_TOKEN: Optional[str] = None
+
+    # Per-request profiling - when enabled, requests sent with X-Profile: 1 and the admin
+    # token, plus a random PROFILING_SAMPLE_RATE fraction, are profiled with cProfile;
+    # the last PROFILING_KEEP are served by the admin endpoints and, if set, written to PROFILING_DIR
+    PROFILING_ENABLED: bool = False
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_DIR: Optional[str] = None
+    PROFILING_KEEP: int = 50
+
+    # Graceful shutdown - seconds to wait for in-flight LLM calls, and to keep
+    # serving after SIGTERM while readiness reports "draining"
+    SHUTDOWN_DRAIN_TIMEOUT: float = 25.0
+    SHUTDOWN_READINESS_DELAY: float = 0.0
 
     # LangChain
     LANGCHAIN_TRACING_V2: str = "false"
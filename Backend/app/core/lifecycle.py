@@ -0,0 +1,93 @@
+import asyncio
+import logging
+import signal
+import threading
+from contextlib import asynccontextmanager
+logger = logging.getLogger(__name__)
+
+DRAIN_POLL_INTERVAL = 0.05  # seconds between in-flight checks while draining
+
+
+class ServiceDraining(Exception):
+    """Raised when new work is refused because the instance is shutting down."""
+
+
+class Lifecycle:
+    """
+    Tracks the draining state of the app and its in-flight upstream LLM calls.
+
+    Once draining starts, `admit` refuses new questions, readiness reports
+    "draining", and shutdown waits for `in_flight` to reach zero.
+    """
+
+    def __init__(self):
+        self.draining = False
+        self.in_flight = 0
+
+    def admit(self) -> None:
+        """Check that new work may start; raise ServiceDraining otherwise."""
+        if self.draining:
+            raise ServiceDraining("Server is shutting down, please retry shortly")
+
+    @asynccontextmanager
+    async def track(self):
+        """Count an upstream call as in-flight for the duration of the block."""
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+
+    def begin_drain(self) -> None:
+        """Stop admitting new work."""
+        if not self.draining:
+            self.draining = True
+            logger.info(f"Draining started with {self.in_flight} upstream calls in flight")
+
+    async def wait_idle(self, timeout: float) -> bool:
+        """
+        Wait for all in-flight upstream calls to finish.
+
+        Args:
+            timeout: Maximum number of seconds to wait
+
+        Returns:
+            True if everything finished, False if the deadline expired first
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        # Shutdown-only path, so a short poll is simpler than cross-loop signalling
+        while self.in_flight > 0 and loop.time() < deadline:
+            await asyncio.sleep(DRAIN_POLL_INTERVAL)
+        return self.in_flight == 0
+
+    def install_signal_handlers(self, readiness_delay: float = 0) -> None:
+        """
+        Start draining as soon as SIGTERM/SIGINT arrives.
+
+        The server's own handler is chained and, if `readiness_delay` is set,
+        deferred by that many seconds so the load balancer sees the failing
+        readiness probe before the listening socket closes.
+        """
+        if threading.current_thread() is not threading.main_thread():
+            return
+
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            previous = signal.getsignal(sig)
+
+            def handler(signum, frame, previous=previous):
+                self.begin_drain()
+                if not callable(previous):
+                    return
+                if readiness_delay > 0:
+                    timer = threading.Timer(readiness_delay, previous, (signum, frame))
+                    timer.daemon = True
+                    timer.start()
+                else:
+                    previous(signum, frame)
+
+            signal.signal(sig, handler)
+
+
+# Global instance - shared by the app lifespan, routes and agents
+lifecycle = Lifecycle()
@@ -0,0 +1,194 @@
+"""
+Logging - Structured JSON logs written off the request path
+"""
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Iterable, Optional
+import json
+import logging
+import queue
+import sys
+import threading
+from urllib.parse import urlsplit
+from app.core.config import Settings, settings
+
+# Structured fields whose values never reach the log output
+REDACTED_FIELDS = frozenset({
+    "secret_concept", "context", "api_key", "google_api_key", "password", "authorization", "token"
+})
+REDACTED = "[redacted]"
+
+# Attributes every LogRecord has; anything else was passed via `extra=` and is a structured field
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+
+
+def _scrub(text: str, secrets: Iterable[str]) -> str:
+    for secret in secrets:
+        if secret in text:
+            text = text.replace(secret, REDACTED)
+    return text
+
+
+class RouteSampler:
+    """
+    Decide which log calls of high-frequency routes are kept.
+
+    Routes listed in `rates` are kept at that rate (0.01 keeps one call in a
+    hundred), deterministically, so a burst of polls still yields evenly
+    spaced samples; other routes are always kept. Checked before the log
+    call, so a skipped record is never even created.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        self.rates = dict(rates)
+        self._credit: Dict[str, float] = {}
+
+    def __call__(self, route: str) -> bool:
+        rate = self.rates.get(route)
+        if rate is None:
+            return True
+        credit = self._credit.get(route, 1.0) + rate
+        if credit >= 1.0:
+            self._credit[route] = credit - 1.0
+            return True
+        self._credit[route] = credit
+        return False
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Queue handler that hands the record over unformatted.
+
+    The stock QueueHandler renders the message in the calling thread; here
+    the %-style arguments are only merged by the listener thread, so a
+    request pays for creating the record and a queue put, nothing more.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    One JSON object per line: time, level, logger, message and any `extra=` fields.
+
+    Fields named in REDACTED_FIELDS are masked, and the configured secret
+    values (API keys, the database password) are scrubbed from the text.
+    """
+
+    def __init__(self, secrets: Iterable[str] = ()):
+        super().__init__()
+        self.secrets = [s for s in secrets if s and len(s) >= 4]
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": _scrub(record.getMessage(), self.secrets),
+        }
+        for key, value in vars(record).items():
+            if key in _RECORD_ATTRS:
+                continue
+            if key in REDACTED_FIELDS:
+                value = REDACTED
+            elif isinstance(value, str):
+                value = _scrub(value, self.secrets)
+            entry[key] = value
+        if record.exc_info:
+            entry["exception"] = _scrub(self.formatException(record.exc_info), self.secrets)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable lines for local development, with the same redaction as JSONFormatter."""
+
+    def __init__(self, secrets: Iterable[str] = ()):
+        super().__init__("%(asctime)s %(levelname)-7s %(name)s: %(message)s")
+        self.secrets = [s for s in secrets if s and len(s) >= 4]
+
+    def format(self, record: logging.LogRecord) -> str:
+        return _scrub(super().format(record), self.secrets)
+
+
+def configured_secrets(config: Settings = settings) -> list:
+    """Secret values from the settings that must never appear in a log line."""
+    secrets = [config.GOOGLE_API_KEY, config.LANGCHAIN_API_KEY, config.ADMIN_TOKEN]
+    if config.DATABASE_URL:
+        secrets.append(urlsplit(config.DATABASE_URL).password)
+    return [s for s in secrets if s]
+
+
+_listener: Optional[QueueListener] = None
+_lock = threading.Lock()
+
+
+def setup_logging(config: Settings = settings) -> None:
+    """
+    Route the app's log records through a queue to a background writer thread.
+
+    Records are level-checked in the calling thread, then formatted and
+    written to stdout by the listener. Calling it again is a no-op.
+    """
+    global _listener
+    with _lock:
+        if _listener is not None:
+            return
+
+        formatter_cls = JSONFormatter if config.LOG_FORMAT == "json" else TextFormatter
+        output = logging.StreamHandler(sys.stdout)
+        output.setFormatter(formatter_cls(configured_secrets(config)))
+
+        records: queue.SimpleQueue = queue.SimpleQueue()
+        handler = DeferredQueueHandler(records)
+
+        app_logger = logging.getLogger("app")
+        # uvicorn-only levels such as "trace" fall back to INFO
+        app_logger.setLevel(getattr(logging, config.LOG_LEVEL.upper(), logging.INFO))
+        app_logger.addHandler(handler)
+        app_logger.propagate = False
+
+        _listener = QueueListener(records, output, respect_handler_level=True)
+        _listener.start()
+
+
+def setup_worker_logging(config: Settings = settings) -> None:
+    """
+    Log straight to stdout in a forked worker process (a ProcessPoolExecutor initializer).
+
+    The worker inherits the parent's queue handler but not its listener
+    thread, so records queued there would never be written and the queue
+    would grow for the life of the pool. Workers only report failures, so
+    they write WARNING and above synchronously.
+    """
+    global _listener
+    _listener = None
+    output = logging.StreamHandler(sys.stdout)
+    formatter_cls = JSONFormatter if config.LOG_FORMAT == "json" else TextFormatter
+    output.setFormatter(formatter_cls(configured_secrets(config)))
+
+    app_logger = logging.getLogger("app")
+    for handler in list(app_logger.handlers):
+        app_logger.removeHandler(handler)
+    app_logger.addHandler(output)
+    app_logger.setLevel(max(getattr(logging, config.LOG_LEVEL.upper(), logging.INFO), logging.WARNING))
+    app_logger.propagate = False
+
+
+def shutdown_logging() -> None:
+    """Write out queued records and stop the writer thread."""
+    global _listener
+    with _lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        _listener = None
+        app_logger = logging.getLogger("app")
+        for handler in list(app_logger.handlers):
+            if isinstance(handler, DeferredQueueHandler):
+                app_logger.removeHandler(handler)
+        app_logger.propagate = True
+
+
+# Global instance - guard polling-route log calls with `if sampled("route_name"):`
+sampled = RouteSampler(settings.LOG_SAMPLE_RATES)
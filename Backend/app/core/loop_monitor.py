@@ -0,0 +1,180 @@
+"""
+Loop Monitor - Measure how late the event loop runs scheduled work, and catch what blocks it
+"""
+from collections import deque
+from datetime import datetime, timezone
+from typing import Deque, Dict, List, Optional
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from app.core.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+STACK_LIMIT = 20
+STALLS_KEEP = 50
+
+LOOP_LAG = metrics.histogram(
+    "event_loop_lag_seconds",
+    "How much later than scheduled a periodic sleep on the event loop woke up"
+)
+SLOW_CALLBACKS = metrics.counter(
+    "event_loop_slow_callbacks_total",
+    "Event-loop steps that blocked longer than the slow-callback threshold, by route",
+    ("route",)
+)
+LOOP_BLOCKED = metrics.histogram(
+    "event_loop_blocked_seconds",
+    "How long slow event-loop steps kept the loop blocked, by route",
+    ("route",)
+)
+
+
+def _request_scope(frame) -> Optional[dict]:
+    """The outermost HTTP scope found in the locals of a stack of frames."""
+    found = None
+    while frame is not None:
+        if "scope" in frame.f_code.co_varnames:
+            scope = frame.f_locals.get("scope")
+            if isinstance(scope, dict) and scope.get("type") == "http":
+                found = scope
+        frame = frame.f_back
+    return found
+
+
+class Stall:
+    """One event-loop step caught blocking past the threshold."""
+
+    def __init__(self, route: str, path: Optional[str], stack: List[str]):
+        self.started_at = datetime.now(timezone.utc)
+        self.route = route
+        self.path = path
+        self.stack = stack
+        self.blocked_seconds = 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            "started_at": self.started_at.isoformat(),
+            "route": self.route,
+            "path": self.path,
+            "blocked_seconds": round(self.blocked_seconds, 6),
+            "stack": self.stack,
+        }
+
+
+class LoopMonitor:
+    """
+    Background task sampling event-loop lag, plus a watchdog thread catching slow steps.
+
+    Every `interval` seconds the sampler sleeps and records how much later
+    than requested it woke up; anything above a few milliseconds is time the
+    loop spent running someone else's synchronous code.
+
+    The lag only says that the loop was blocked, not by what. For that, a
+    watchdog thread checks every `slow_threshold` seconds whether the
+    sampler's next wake-up is overdue by more than the threshold and, if so,
+    grabs the loop thread's stack with sys._current_frames() and the route
+    of the request it belongs to. The stall is logged, counted in the
+    metrics and kept for the admin endpoint; when the sampler finally wakes,
+    its lag is recorded as the blocked time. The watchdog never schedules
+    anything on the loop, so it costs the loop nothing, but it only sees
+    blocks that hold up a sample: a lower `interval` catches more of them.
+    A threshold of 0 disables the watchdog.
+    """
+
+    def __init__(self, interval: float = 0.5, slow_threshold: float = 0.1):
+        self.interval = interval
+        self.slow_threshold = slow_threshold
+        self.last_lag = 0.0
+        self.stalls: Deque[Stall] = deque(maxlen=STALLS_KEEP)
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        # Monotonic time the sampler should next wake up, None while it isn't sleeping
+        self._due: Optional[float] = None
+        self._stall: Optional[Stall] = None
+
+    async def _sample(self) -> None:
+        try:
+            while True:
+                self._due = time.monotonic() + self.interval
+                await asyncio.sleep(self.interval)
+                self.last_lag = max(time.monotonic() - self._due, 0.0)
+                self._due = None
+                LOOP_LAG.observe(self.last_lag)
+                self._close_stall(self.last_lag)
+        finally:
+            self._due = None
+
+    def _close_stall(self, blocked: float) -> None:
+        """Runs on the loop once the sampler got through: record how long the open stall lasted."""
+        stall, self._stall = self._stall, None
+        if stall is None:
+            return
+        stall.blocked_seconds = blocked
+        LOOP_BLOCKED.observe(blocked, stall.route)
+        logger.warning(
+            "Event loop blocked for %.3fs in %s",
+            blocked, stall.route,
+            extra={"route": stall.route, "blocked_seconds": blocked}
+        )
+
+    def _capture(self, loop_thread_id: int) -> Optional[Stall]:
+        """Snapshot what the loop thread is running right now."""
+        frame = sys._current_frames().get(loop_thread_id)
+        if frame is None:
+            return None
+        scope = _request_scope(frame)
+        route = getattr(scope.get("route"), "path", scope["path"]) if scope else "background"
+        stack = traceback.format_list(traceback.extract_stack(frame, limit=STACK_LIMIT))
+        return Stall(route, scope["path"] if scope else None, [line.rstrip() for line in stack])
+
+    def _watch(self, loop_thread_id: int) -> None:
+        while not self._stopping.wait(self.slow_threshold):
+            due = self._due
+            if self._stall is not None or due is None or time.monotonic() - due < self.slow_threshold:
+                continue
+            stall = self._capture(loop_thread_id)
+            # Drop the snapshot if the sampler got through while it was taken
+            if stall is not None and self._due is due:
+                self._stall = stall
+                self.stalls.append(stall)
+                SLOW_CALLBACKS.inc(stall.route)
+
+    def start(self) -> None:
+        """Start sampling and, if a threshold is set, the watchdog, on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._sample(), name="loop-lag-sampler")
+        if self.slow_threshold > 0 and self._watchdog is None:
+            self._stopping.clear()
+            self._stall = None
+            self._watchdog = threading.Thread(
+                target=self._watch,
+                args=(threading.get_ident(),),
+                name="loop-watchdog",
+                daemon=True
+            )
+            self._watchdog.start()
+
+    async def stop(self) -> None:
+        """Stop sampling and the watchdog."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._watchdog is not None:
+            self._stopping.set()
+            await asyncio.to_thread(self._watchdog.join, 1.0)
+            self._watchdog = None
+
+    def recent_stalls(self) -> List[Dict]:
+        """The most recent stalls, newest first."""
+        return [stall.to_dict() for stall in reversed(self.stalls)]
+
+
+# Global instance - started and stopped by the app lifespan
+loop_monitor = LoopMonitor(interval=settings.LOOP_LAG_INTERVAL, slow_threshold=settings.LOOP_SLOW_CALLBACK_THRESHOLD)
@@ -0,0 +1,221 @@
+"""
+Profiling - Opt-in cProfile capture of individual requests
+"""
+from collections import deque
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Deque, Dict, List, Optional
+import asyncio
+import cProfile
+import io
+import json
+import logging
+import pstats
+import random
+import secrets
+import time
+import uuid
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+ADMIN_TOKEN_HEADER = b"x-admin-token"
+TOP_FUNCTIONS = 25
+
+# Profile of the request running in the current task, if it is being profiled
+_current: ContextVar[Optional["RequestProfile"]] = ContextVar("current_profile", default=None)
+
+
+def record_wait(kind: str, seconds: float) -> None:
+    """
+    Add time spent awaiting something (e.g. the upstream LLM) to the current request's profile.
+
+    cProfile only sees CPU time on the event loop thread, so awaited time is
+    reported from these explicit measurements. A no-op unless the request is
+    being profiled.
+    """
+    profile = _current.get()
+    if profile is not None:
+        profile.waits[kind] = profile.waits.get(kind, 0.0) + seconds
+
+
+def _is_loop_idle(filename: str, name: str) -> bool:
+    # The selector poll is where the loop sleeps while everything awaits
+    return filename == "~" and name.startswith(("<method 'poll' of 'select.", "<method 'select' of 'select.", "<method 'control' of 'select."))
+
+
+def _is_serialization(filename: str, name: str) -> bool:
+    return "pydantic" in filename or "pydantic" in name or filename.endswith(("fastapi/encoders.py", "json/encoder.py"))
+
+
+class RequestProfile:
+    """A captured profile of one request and its summary."""
+
+    def __init__(self, method: str, path: str):
+        self.profile_id = uuid.uuid4().hex[:12]
+        self.method = method
+        self.path = path
+        self.route = path
+        self.status = 0
+        self.started_at = datetime.now(timezone.utc)
+        self.wall_seconds = 0.0
+        self.waits: Dict[str, float] = {}
+        self.profiler = cProfile.Profile()
+        self.summary: Dict = {}
+        self.report = ""
+
+    def finish(self) -> None:
+        """Build the summary and text report from the collected stats."""
+        stream = io.StringIO()
+        stats = pstats.Stats(self.profiler, stream=stream)
+        stats.sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+        self.report = stream.getvalue()
+
+        serialization = 0.0
+        idle = 0.0
+        top: List[Dict] = []
+        for (filename, line, name), (_, calls, own, cumulative, _) in stats.stats.items():
+            if _is_serialization(filename, name):
+                serialization += own
+            elif _is_loop_idle(filename, name):
+                idle += own
+            top.append({
+                "function": f"{filename}:{line}({name})",
+                "calls": calls,
+                "own_seconds": round(own, 6),
+                "cumulative_seconds": round(cumulative, 6),
+            })
+        top.sort(key=lambda f: f["cumulative_seconds"], reverse=True)
+
+        self.summary = {
+            "profile_id": self.profile_id,
+            "method": self.method,
+            "route": self.route,
+            "path": self.path,
+            "status": self.status,
+            "started_at": self.started_at.isoformat(),
+            "wall_seconds": round(self.wall_seconds, 6),
+            "busy_seconds": round(stats.total_tt - idle, 6),
+            "loop_idle_seconds": round(idle, 6),
+            "serialization_seconds": round(serialization, 6),
+            "wait_seconds": {kind: round(s, 6) for kind, s in self.waits.items()},
+            "top_functions": top[:TOP_FUNCTIONS],
+        }
+
+    def write(self, directory: Path) -> None:
+        """Write the raw stats (.prof, for snakeviz/pstats) and the summary (.json)."""
+        directory.mkdir(parents=True, exist_ok=True)
+        stem = f"{self.started_at:%Y%m%dT%H%M%S}-{self.method}-{self.profile_id}"
+        self.profiler.dump_stats(str(directory / f"{stem}.prof"))
+        (directory / f"{stem}.json").write_text(json.dumps(self.summary, indent=2), encoding="utf-8")
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware profiling selected requests with cProfile.
+
+    A request is profiled when it carries `X-Profile: 1` together with a valid
+    `X-Admin-Token`, or when it is picked at random at `sample_rate`. Its
+    summary is kept in memory for the admin endpoints, optionally written to
+    `output_dir`, and its id is returned in the `X-Profile-Id` header.
+
+    cProfile hooks the whole event-loop thread, so only one request is profiled
+    at a time and other requests interleaving with it show up in its stats.
+    The app only installs this middleware when PROFILING_ENABLED is set, so
+    it costs nothing otherwise.
+    """
+
+    def __init__(
+        self,
+        app,
+        admin_token: Optional[str] = None,
+        sample_rate: float = 0.0,
+        output_dir: Optional[str] = None
+    ):
+        self.app = app
+        self.admin_token = admin_token
+        self.sample_rate = sample_rate
+        self.output_dir = Path(output_dir) if output_dir else None
+        self._active = False
+
+    def _requested(self, scope) -> bool:
+        if not self.admin_token:
+            return False
+        headers = dict(scope["headers"])
+        if headers.get(PROFILE_HEADER) not in (b"1", b"true"):
+            return False
+        token = headers.get(ADMIN_TOKEN_HEADER, b"").decode("latin-1")
+        return secrets.compare_digest(token, self.admin_token)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self._active:
+            await self.app(scope, receive, send)
+            return
+        if not (self._requested(scope) or (self.sample_rate and random.random() < self.sample_rate)):
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(scope["method"], scope["path"])
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                profile.status = message["status"]
+                message = dict(message)
+                message["headers"] = list(message.get("headers", [])) + [(b"x-profile-id", profile.profile_id.encode())]
+            await send(message)
+
+        self._active = True
+        token = _current.set(profile)
+        started = time.perf_counter()
+        profile.profiler.enable()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profile.profiler.disable()
+            profile.wall_seconds = time.perf_counter() - started
+            _current.reset(token)
+            self._active = False
+            route = scope.get("route")
+            profile.route = getattr(route, "path", profile.path)
+            if await asyncio.to_thread(self._finish, profile):
+                profiles.add(profile)
+
+    def _finish(self, profile: RequestProfile) -> bool:
+        """Summarize (and optionally write out) a profile; runs off the event loop."""
+        try:
+            profile.finish()
+            if self.output_dir:
+                profile.write(self.output_dir)
+            return True
+        except Exception as e:
+            logger.error("Could not store request profile %s: %s", profile.profile_id, e)
+            return False
+
+
+class ProfileStore:
+    """The most recent request profiles, newest last."""
+
+    def __init__(self, keep: int = 50):
+        self._profiles: Deque[RequestProfile] = deque(maxlen=keep)
+
+    def add(self, profile: RequestProfile) -> None:
+        self._profiles.append(profile)
+
+    def list(self) -> List[Dict]:
+        """Summaries without the per-function breakdown, newest first."""
+        return [
+            {k: v for k, v in p.summary.items() if k != "top_functions"}
+            for p in reversed(self._profiles)
+        ]
+
+    def get(self, profile_id: str) -> Optional[RequestProfile]:
+        for profile in self._profiles:
+            if profile.profile_id == profile_id:
+                return profile
+        return None
+
+
+# Global instance - filled by the middleware, read by the admin routes
+profiles = ProfileStore(keep=settings.PROFILING_KEEP)
@@ -0,0 +1,111 @@
+"""
+Rate Limit - Token-bucket limits on question submission per user and per lobby
+"""
+from collections import OrderedDict
+import time
+from app.core.config import settings
+from app.core.metrics import metrics
+
+RATE_LIMITED = metrics.counter(
+    "questions_rate_limited_total", "Questions refused by the rate limiter, by the limit that was hit", ("scope",)
+)
+
+
+class RateLimited(Exception):
+    """Raised when a question is refused because a rate limit was hit."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucketLimiter:
+    """
+    Token buckets keyed by string, refilling at `rate` tokens per second up to `burst`.
+
+    Each bucket is a (tokens, updated) pair kept in least-recently-updated
+    order; a bucket idle long enough to have refilled completely is the same
+    as no bucket, so those are dropped from the front whenever one is taken
+    from. Memory therefore only holds keys active in the last burst/rate
+    seconds. A rate of 0 disables the limiter.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._full_after = self.burst / rate if rate > 0 else 0.0
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def _tokens(self, key: str, now: float) -> float:
+        state = self._buckets.get(key)
+        if state is None:
+            return float(self.burst)
+        tokens, updated = state
+        return min(self.burst, tokens + (now - updated) * self.rate)
+
+    def retry_after(self, key: str, now: float) -> float:
+        """Seconds until `key` has a token to take (0 if it has one now)."""
+        if self.rate <= 0:
+            return 0.0
+        return max(0.0, (1.0 - self._tokens(key, now)) / self.rate)
+
+    def take(self, key: str, now: float) -> None:
+        """Take one token from `key`'s bucket; check `retry_after` first."""
+        if self.rate <= 0:
+            return
+        self._buckets[key] = (self._tokens(key, now) - 1.0, now)
+        self._buckets.move_to_end(key)
+        self._expire(now)
+
+    def _expire(self, now: float) -> None:
+        buckets = self._buckets
+        while buckets:
+            key, (_, updated) = next(iter(buckets.items()))
+            if now - updated < self._full_after:
+                break
+            del buckets[key]
+
+
+class QuestionRateLimiter:
+    """
+    Per-user and per-lobby limits on asking the game master.
+
+    A question takes a token from both the asking user's bucket and their
+    lobby's, and only if both have one, so a refused question never uses up
+    the other limit.
+    """
+
+    def __init__(self, user_rate: float, user_burst: int, lobby_rate: float, lobby_burst: int):
+        self.users = TokenBucketLimiter(user_rate, user_burst)
+        self.lobbies = TokenBucketLimiter(lobby_rate, lobby_burst)
+
+    def acquire(self, pin: str, user_id: str) -> None:
+        """
+        Admit one question from `user_id` in lobby `pin`.
+
+        Raises:
+            RateLimited: If the user or the lobby is over its limit
+        """
+        now = time.monotonic()
+        user_wait = self.users.retry_after(user_id, now)
+        if user_wait > 0:
+            RATE_LIMITED.inc("user")
+            raise RateLimited("You are asking questions too fast, please slow down", user_wait)
+        lobby_wait = self.lobbies.retry_after(pin, now)
+        if lobby_wait > 0:
+            RATE_LIMITED.inc("lobby")
+            raise RateLimited("This lobby is asking questions too fast, please slow down", lobby_wait)
+        self.users.take(user_id, now)
+        self.lobbies.take(pin, now)
+
+
+# Global instance - checked by the game master before any LLM work
+question_limiter = QuestionRateLimiter(
+    user_rate=settings.QUESTION_RATE_PER_USER,
+    user_burst=settings.QUESTION_BURST_PER_USER,
+    lobby_rate=settings.QUESTION_RATE_PER_LOBBY,
+    lobby_burst=settings.QUESTION_BURST_PER_LOBBY
+)
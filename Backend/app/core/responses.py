@@ -0,0 +1,12 @@
+from starlette.responses import Response
+
+
+class PreSerializedJSONResponse(Response):
+    """
+    JSON response for a body that is already encoded.
+
+    The bytes are written as-is: no validation, no jsonable_encoder and no
+    json.dumps, so serving a cached payload is a lookup plus a socket write.
+    """
+
+    media_type = "application/json"
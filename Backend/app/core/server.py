@@ -0,0 +1,54 @@
+import importlib.util
+import logging
+from typing import Any, Dict
+from app.core.config import Settings, settings
+
+logger = logging.getLogger(__name__)
+
+APP_PATH = "app.main:app"
+
+
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def uvicorn_options(config: Settings = settings) -> Dict[str, Any]:
+    """
+    Build the keyword arguments for `uvicorn.run` for the configured SERVER_MODE.
+
+    development: single process with auto-reload and access logs.
+    production: no reload, WEB_CONCURRENCY workers, uvloop/httptools when
+    installed, tuned keep-alive and backlog, optional concurrency cap, a
+    graceful-shutdown window that covers the lifespan drain, and proxy
+    headers trusted only from FORWARDED_ALLOW_IPS.
+    """
+    options: Dict[str, Any] = {
+        "host": config.HOST,
+        "port": config.PORT,
+        "log_level": config.LOG_LEVEL,
+    }
+
+    if config.SERVER_MODE == "development":
+        options.update(reload=True, access_log=True)
+        return options
+
+    if config.WEB_CONCURRENCY > 1:
+        logger.warning(
+            f"Starting {config.WEB_CONCURRENCY} workers: lobbies are held in process memory, "
+            "so requests for a PIN must always reach the same worker"
+        )
+
+    options.update(
+        reload=False,
+        workers=config.WEB_CONCURRENCY,
+        loop="uvloop" if _installed("uvloop") else "asyncio",
+        http="httptools" if _installed("httptools") else "h11",
+        timeout_keep_alive=config.SERVER_KEEP_ALIVE,
+        backlog=config.SERVER_BACKLOG,
+        access_log=config.SERVER_ACCESS_LOG,
+        limit_concurrency=config.SERVER_LIMIT_CONCURRENCY,
+        timeout_graceful_shutdown=int(config.SHUTDOWN_DRAIN_TIMEOUT + config.SHUTDOWN_READINESS_DELAY) + 5,
+        proxy_headers=True,
+        forwarded_allow_ips=config.FORWARDED_ALLOW_IPS,
+    )
+    return options
@@ -1,22 +1,43 @@
+from typing import Optional
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
-)
+_engine: Optional[Engine] = None
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Bound to the engine on first use, so importing this module never touches the database
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
+
+
+def get_engine() -> Engine:
+    """Get the database engine, creating it on first use."""
+    global _engine
+    if _engine is None:
+        if not settings.DATABASE_URL:
+            raise RuntimeError("DATABASE_URL is not configured")
+        _engine = create_engine(
+            settings.DATABASE_URL,
+            pool_pre_ping=True,
+            pool_size=10,
+            max_overflow=20,
+        )
+        SessionLocal.configure(bind=_engine)
+    return _engine
+
+
+def init_db() -> None:
+    """Create database tables for all registered models."""
+    from app.models import Base  # Import all models
+
+    Base.metadata.create_all(bind=get_engine())
 
 
 def get_db():
     """Database session dependency."""
+    get_engine()
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
-
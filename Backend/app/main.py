@@ -1,17 +1,85 @@
+from contextlib import asynccontextmanager
+import asyncio
+import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
 from app.core.config import settings
-from app.database.session import engine
-from app.models import Base  # Import all models
-from app.routes import api_router
+from app.core.lifecycle import lifecycle
+from app.core.logs import setup_logging, shutdown_logging
+from app.core.loop_monitor import loop_monitor
+from app.core.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsMiddleware, metrics
+from app.core.profiling import ProfilingMiddleware
+from app.routes import admin_router, api_router
+from app.services.GameMasterAgent import game_master
+from app.services.OpeningAnswers import opening_answers
+from app.services.QuestionDispatcher import question_dispatcher
+
+logger = logging.getLogger(__name__)
+
+
+async def _init_database() -> None:
+    """Create database tables off the event loop; a failure is logged, not fatal."""
+    from app.database.session import init_db
+
+    try:
+        await asyncio.to_thread(init_db)
+        logger.info("Database tables are ready")
+    except Exception as e:
+        logger.error(f"Database initialization failed: {str(e)}")
+
+
+async def _preload_llm() -> None:
+    """Import the LLM client libraries off the event loop; a failure is logged, not fatal."""
+    from app.services.GeminiAgent import preload
+
+    try:
+        await asyncio.to_thread(preload)
+    except Exception as e:
+        logger.error(f"Preloading the LLM client failed: {str(e)}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Restore lobby state on startup; drain in-flight LLM calls and flush state on shutdown."""
+    setup_logging()
+    # Nothing on the request path needs the database, so don't hold up startup for it
+    db_init = asyncio.create_task(_init_database()) if settings.DATABASE_URL else None
+    # Likewise the LangChain import, which would otherwise block the loop at the first question
+    llm_preload = asyncio.create_task(_preload_llm()) if settings.LLM_PRELOAD else None
+    game_master.restore_lobbies()
+    lifecycle.install_signal_handlers(readiness_delay=settings.SHUTDOWN_READINESS_DELAY)
+    if settings.METRICS_ENABLED:
+        loop_monitor.start()
+
+    yield
+
+    lifecycle.begin_drain()
+    await loop_monitor.stop()
+    # Speculative work only; not worth holding shutdown for
+    await opening_answers.stop()
+    if db_init and not db_init.done():
+        db_init.cancel()
+    if llm_preload and not llm_preload.done():
+        llm_preload.cancel()
+    deadline = asyncio.get_running_loop().time() + settings.SHUTDOWN_DRAIN_TIMEOUT
+    await question_dispatcher.stop(settings.SHUTDOWN_DRAIN_TIMEOUT)
+    remaining = max(deadline - asyncio.get_running_loop().time(), 0)
+    if not await lifecycle.wait_idle(remaining):
+        logger.warning(f"Shutdown deadline reached with {lifecycle.in_flight} upstream calls still in flight")
+    if game_master.event_store:
+        game_master.event_store.close()
+    from app.services.QRService import QRService
+    QRService.shutdown()
+    logger.info("Shutdown complete")
+    shutdown_logging()
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
     description=settings.DESCRIPTION,
+    lifespan=lifespan,
 )
 
 # Set up CORS
@@ -23,8 +91,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware, registry=metrics)
+
+# Not installed at all unless enabled, so unprofiled deployments pay nothing
+if settings.PROFILING_ENABLED:
+    app.add_middleware(
+        ProfilingMiddleware,
+        admin_token=settings.ADMIN_TOKEN,
+        sample_rate=settings.PROFILING_SAMPLE_RATE,
+        output_dir=settings.PROFILING_DIR
+    )
+
 # Include API routes
 app.include_router(api_router, prefix=settings.API_V1_STR)
+app.include_router(admin_router, prefix=f"{settings.API_V1_STR}/admin", tags=["admin"])
 
 
 @app.get("/")
@@ -37,14 +118,23 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness probe - fails while draining so the load balancer stops routing here."""
+    if lifecycle.draining:
+        return JSONResponse(status_code=503, content={"status": "draining", "in_flight": lifecycle.in_flight})
+    return {"status": "ready", "in_flight": lifecycle.in_flight}
+
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics_endpoint():
+        """Prometheus scrape target: request, upstream LLM, QR, game state and event-loop metrics."""
+        return Response(metrics.render(), media_type=METRICS_CONTENT_TYPE)
+
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(
-        "app.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
-        log_level="info"
-    )
-
+    from app.core.server import APP_PATH, uvicorn_options
 
+    uvicorn.run(APP_PATH, **uvicorn_options())
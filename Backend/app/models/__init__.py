@@ -1,8 +1,16 @@
+
 # Import all models here so they are registered with SQLAlchemy
-from .base import Base
 from .user import User
 from .lobby import Lobby
 from .question import Question
+from .event import LobbyEvent, LobbyEventLog, LobbyEventType
+
+__all__ = ["Base", "User", "Lobby", "Question", "LobbyEvent", "LobbyEventLog", "LobbyEventType"]
 
-__all__ = ["Base", "User", "Lobby", "Question"]
 
+def __getattr__(name):
+    # SQLAlchemy is only needed to create tables, so `Base` is imported on first access
+    if name == "Base":
+        from .base import Base
+        return Base
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,172 @@
+import asyncio
+import logging
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LobbyEventType(str, Enum):
+    """Kinds of mutation recorded in a lobby's event log."""
+
+    LOBBY_CREATED = "lobby_created"
+    PARTICIPANT_JOINED = "participant_joined"
+    PARTICIPANT_LEFT = "participant_left"
+    LOBBY_UPDATED = "lobby_updated"
+    LOBBY_STARTED = "lobby_started"
+    QUESTION_SUBMITTED = "question_submitted"
+    QUESTION_ANSWERED = "question_answered"
+    QUESTION_FAILED = "question_failed"
+    LOBBY_DELETED = "lobby_deleted"
+
+
+# Fields of the lobby that only the host is allowed to see
+HOST_ONLY_FIELDS = ("secret_concept", "context")
+
+# Events about a single user's question; participants only see their own
+QUESTION_EVENTS = (
+    LobbyEventType.QUESTION_SUBMITTED,
+    LobbyEventType.QUESTION_ANSWERED,
+    LobbyEventType.QUESTION_FAILED,
+)
+
+
+class LobbyEvent:
+    """A single immutable entry in a lobby's append-only event log."""
+
+    def __init__(
+        self,
+        event_type: LobbyEventType,
+        pin: str,
+        data: Optional[Dict[str, Any]] = None,
+        seq: int = 0,
+        timestamp: Optional[datetime] = None
+    ):
+        self.type = LobbyEventType(event_type)
+        self.pin = pin
+        self.data = data or {}
+        self.seq = seq  # assigned by the log on append, 1-based
+        self.timestamp = timestamp or datetime.now()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the event to a JSON-compatible dict."""
+        return {
+            "seq": self.seq,
+            "type": self.type.value,
+            "pin": self.pin,
+            "timestamp": self.timestamp.isoformat(),
+            "data": self.data,
+        }
+
+    @classmethod
+    def from_dict(cls, raw: Dict[str, Any]) -> "LobbyEvent":
+        """Rebuild an event from the dict produced by `to_dict`."""
+        return cls(
+            event_type=raw["type"],
+            pin=raw["pin"],
+            data=raw.get("data") or {},
+            seq=raw["seq"],
+            timestamp=datetime.fromisoformat(raw["timestamp"])
+        )
+
+    def visible_data(self, user_id: str, is_host: bool) -> Optional[Dict[str, Any]]:
+        """
+        Get the event payload as seen by a given viewer.
+
+        Args:
+            user_id: ID of the user viewing the event
+            is_host: Whether the viewer is the lobby host
+
+        Returns:
+            The (possibly redacted) payload, or None if the viewer may not see the event at all
+        """
+        if is_host:
+            return self.data
+
+        if self.type in QUESTION_EVENTS and self.data.get("user_id") != user_id:
+            return None
+
+        if self.type in (LobbyEventType.LOBBY_CREATED, LobbyEventType.LOBBY_UPDATED):
+            return {k: v for k, v in self.data.items() if k not in HOST_ONLY_FIELDS}
+
+        return self.data
+
+
+class LobbyEventLog:
+    """
+    Append-only, in-memory log of a lobby's events.
+
+    The log is the single source of change notifications for a lobby:
+    listeners (e.g. the on-disk event store) are called synchronously on
+    every append, with their errors logged rather than raised, and
+    coroutines can await new events for push/long-poll delivery.
+    """
+
+    def __init__(self, pin: str, events: Optional[List[LobbyEvent]] = None):
+        self.pin = pin
+        self.events: List[LobbyEvent] = list(events or [])
+        self._listeners: List[Callable[[LobbyEvent], None]] = []
+        self._waiters: List[asyncio.Future] = []
+
+    @property
+    def version(self) -> int:
+        """Sequence number of the latest event (0 for an empty log)."""
+        return self.events[-1].seq if self.events else 0
+
+    def append(self, event: LobbyEvent) -> LobbyEvent:
+        """Assign the next sequence number to an event and append it."""
+        event.seq = self.version + 1
+        self.events.append(event)
+
+        # The event has already been applied, so a failing listener must not fail the mutation
+        for listener in self._listeners:
+            try:
+                listener(event)
+            except Exception:
+                logger.exception("Event listener failed for lobby %s", self.pin, extra={"pin": self.pin})
+
+        waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+        return event
+
+    def since(self, seq: int) -> List[LobbyEvent]:
+        """Get all events with a sequence number greater than `seq`."""
+        # Sequence numbers are contiguous and 1-based, so they double as list offsets
+        return self.events[max(seq, 0):]
+
+    def add_listener(self, listener: Callable[[LobbyEvent], None]) -> None:
+        """Register a callback invoked with every newly appended event."""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[LobbyEvent], None]) -> None:
+        """Unregister a callback previously added with `add_listener`."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    async def wait_for(self, since: int, timeout: float) -> List[LobbyEvent]:
+        """
+        Wait until the log holds events newer than `since`, or the timeout expires.
+
+        Args:
+            since: Sequence number the caller has already seen
+            timeout: Maximum number of seconds to wait
+
+        Returns:
+            Events newer than `since` (empty if the timeout expired)
+        """
+        if self.version <= since and timeout > 0:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await asyncio.wait_for(waiter, timeout)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+
+        return self.since(since)
@@ -1,19 +1,29 @@
 from datetime import datetime
-from typing import Optional, Dict
+from typing import Any, Dict, List, Optional, Tuple
 import uuid
 import random
 import string
 from .user import User
+from .question import Question
+from .event import LobbyEvent, LobbyEventLog, LobbyEventType
 
 
 class Lobby:
-    """Internal lobby model for managing lobby state."""
-    
+    """
+    Internal lobby model for managing lobby state.
+
+    Every mutation is recorded as a `LobbyEvent` in `self.events` and applied
+    through `apply`, so the lobby can be rebuilt by replaying its log.
+    """
+
+    # Fields that can be changed after creation via `update`
+    UPDATABLE_FIELDS = ("secret_concept", "context", "topic", "timelimit")
+
     @staticmethod
     def generate_pin() -> str:
         """Generate a 7-digit PIN for a lobby."""
         return ''.join(random.choices(string.digits, k=7))
-    
+
     def __init__(self, pin: str, host: User, timelimit: int, secret_concept: str, topic: str, context: Optional[str] = None):
         self.pin = pin
         self.host = host
@@ -23,7 +33,98 @@ class Lobby:
         self.timelimit = timelimit
         self.participants: Dict[str, User] = {}  # key: user_id, value: User object
         self.start_time: Optional[datetime] = None
-    
+        self.deleted = False
+        # key: (user_id, client idempotency key), value: question_id
+        self.idempotency_keys: Dict[Tuple[str, str], str] = {}
+        self.events = LobbyEventLog(pin)
+        self.events.append(LobbyEvent(LobbyEventType.LOBBY_CREATED, pin, {
+            "host_id": host.user_id,
+            "host_name": host.name,
+            "secret_concept": secret_concept,
+            "context": context,
+            "topic": topic,
+            "timelimit": timelimit,
+        }))
+
+    @classmethod
+    def from_events(cls, events: List[LobbyEvent]) -> "Lobby":
+        """
+        Rebuild a lobby by replaying its event log.
+
+        Args:
+            events: The lobby's events in sequence order, starting with LOBBY_CREATED
+
+        Returns:
+            The reconstructed Lobby, holding the replayed events as its log
+        """
+        if not events or events[0].type != LobbyEventType.LOBBY_CREATED:
+            raise ValueError("Event log must start with a lobby_created event")
+
+        created = events[0]
+        lobby = cls(
+            pin=created.pin,
+            host=User(name=created.data["host_name"], user_id=created.data["host_id"]),
+            timelimit=created.data["timelimit"],
+            secret_concept=created.data["secret_concept"],
+            topic=created.data["topic"],
+            context=created.data.get("context")
+        )
+        for event in events[1:]:
+            lobby.apply(event)
+        lobby.events = LobbyEventLog(created.pin, events)
+        return lobby
+
+    def apply(self, event: LobbyEvent) -> None:
+        """Apply a single event to the in-memory state (no validation, no logging)."""
+        data = event.data
+
+        if event.type == LobbyEventType.PARTICIPANT_JOINED:
+            self.participants[data["user_id"]] = User(name=data["name"], user_id=data["user_id"])
+        elif event.type == LobbyEventType.PARTICIPANT_LEFT:
+            self.participants.pop(data["user_id"], None)
+        elif event.type == LobbyEventType.LOBBY_UPDATED:
+            for field, value in data.items():
+                setattr(self, field, value)
+        elif event.type == LobbyEventType.LOBBY_STARTED:
+            self.start_time = datetime.fromisoformat(data["start_time"])
+        elif event.type in (LobbyEventType.QUESTION_SUBMITTED, LobbyEventType.QUESTION_ANSWERED):
+            user = self.get_user(data["user_id"])
+            if user:
+                question = user.get_question(data["question_id"])
+                if question is None:
+                    question = Question(
+                        message=data["message"],
+                        user_id=data["user_id"],
+                        question_id=data["question_id"],
+                        timestamp=datetime.fromisoformat(data["timestamp"])
+                    )
+                    user.add_question(question)
+                question.answer = data.get("answer")
+            if data.get("idempotency_key"):
+                self.idempotency_keys[(data["user_id"], data["idempotency_key"])] = data["question_id"]
+        elif event.type == LobbyEventType.QUESTION_FAILED:
+            user = self.get_user(data["user_id"])
+            question = user.get_question(data["question_id"]) if user else None
+            if question:
+                question.error = data["error"]
+            # Free the question's idempotency key, so retrying the request asks again
+            for key, question_id in list(self.idempotency_keys.items()):
+                if question_id == data["question_id"]:
+                    del self.idempotency_keys[key]
+        elif event.type == LobbyEventType.LOBBY_DELETED:
+            self.deleted = True
+
+    def _record(self, event_type: LobbyEventType, data: Dict[str, Any]) -> LobbyEvent:
+        """Apply a new event and append it to the log."""
+        event = LobbyEvent(event_type, self.pin, data)
+        self.apply(event)
+        return self.events.append(event)
+
+    @property
+    def version(self) -> int:
+        """Current lobby version, i.e. the sequence number of the latest event."""
+        return self.events.version
+
     def add_participant(self, participant: User) -> None:
         """Add a participant to the lobby."""
         # Check if name already exists
@@ -31,26 +132,113 @@ class Lobby:
             raise ValueError("Participant name already exists in this lobby")
         if participant.name == self.host.name:
             raise ValueError("Cannot use the same name as the host")
-        
+
+        self._record(LobbyEventType.PARTICIPANT_JOINED, {
+            "user_id": participant.user_id,
+            "name": participant.name,
+        })
+        # Keep the caller's instance so references to it stay live
         self.participants[participant.user_id] = participant
 
     def remove_participant(self, user_id: str) -> None:
         """Remove a participant from the lobby."""
         if user_id in self.participants:
-            del self.participants[user_id]
-    
+            self._record(LobbyEventType.PARTICIPANT_LEFT, {"user_id": user_id})
+
     def get_participant_names(self) -> list[str]:
         """Get list of all participant names."""
         return [p.name for p in self.participants.values()]
-    
+
     def get_participant(self, user_id: str) -> Optional[User]:
         """Get a participant by user_id."""
         return self.participants.get(user_id)
-    
+
+    def get_user(self, user_id: str) -> Optional[User]:
+        """Get a participant or the host by user_id."""
+        if self.host.user_id == user_id:
+            return self.host
+        return self.participants.get(user_id)
+
+    def update(self, **fields: Any) -> None:
+        """
+        Update lobby settings.
+
+        Args:
+            **fields: Any of UPDATABLE_FIELDS; None values are ignored
+        """
+        changes = {k: v for k, v in fields.items() if v is not None}
+        unknown = set(changes) - set(self.UPDATABLE_FIELDS)
+        if unknown:
+            raise ValueError(f"Cannot update lobby fields: {', '.join(sorted(unknown))}")
+        if changes:
+            self._record(LobbyEventType.LOBBY_UPDATED, changes)
+
+    def _question_data(self, user_id: str, question: Question) -> Dict[str, Any]:
+        return {
+            "user_id": user_id,
+            "question_id": question.question_id,
+            "message": question.message,
+            "answer": question.answer,
+            "timestamp": question.timestamp.isoformat(),
+        }
+
+    def add_question(self, user_id: str, question: Question) -> None:
+        """Record an answered question for a participant or the host."""
+        user = self.get_user(user_id)
+        if not user:
+            raise ValueError("User not found in lobby")
+
+        self._record(LobbyEventType.QUESTION_ANSWERED, self._question_data(user_id, question))
+        user.add_question(question)
+
+    def submit_question(self, user_id: str, question: Question, idempotency_key: Optional[str] = None) -> None:
+        """Record a question that is still waiting for its answer."""
+        user = self.get_user(user_id)
+        if not user:
+            raise ValueError("User not found in lobby")
+
+        data = self._question_data(user_id, question)
+        if idempotency_key:
+            data["idempotency_key"] = idempotency_key
+        self._record(LobbyEventType.QUESTION_SUBMITTED, data)
+        user.add_question(question)
+
+    def answer_question(self, user_id: str, question_id: str, answer: str) -> None:
+        """Record the answer to a previously submitted question."""
+        user = self.get_user(user_id)
+        question = user.get_question(question_id) if user else None
+        if not question:
+            raise ValueError("Question not found in lobby")
+
+        question.set_answer(answer)
+        self._record(LobbyEventType.QUESTION_ANSWERED, self._question_data(user_id, question))
+
+    def fail_question(self, user_id: str, question_id: str, error: str) -> None:
+        """Record that a submitted question could not be answered, freeing its idempotency key."""
+        self._record(LobbyEventType.QUESTION_FAILED, {
+            "user_id": user_id,
+            "question_id": question_id,
+            "error": error,
+        })
+
+    def find_idempotent_question(self, user_id: str, idempotency_key: str) -> Optional[Question]:
+        """Get the question a user already submitted under an idempotency key."""
+        question_id = self.idempotency_keys.get((user_id, idempotency_key))
+        user = self.get_user(user_id)
+        if question_id is None or user is None:
+            return None
+        return user.get_question(question_id)
+
     def start(self, start_time: Optional[datetime] = None) -> None:
         """Start the lobby."""
         if self.start_time is not None:
             raise ValueError("Lobby has already started")
         if len(self.participants) == 0:
             raise ValueError("Cannot start lobby without participants")
-        self.start_time = start_time if start_time else datetime.now()
+        start_time = start_time if start_time else datetime.now()
+        self._record(LobbyEventType.LOBBY_STARTED, {"start_time": start_time.isoformat()})
+
+    def delete(self) -> None:
+        """Mark the lobby as deleted; this is the final event in its log."""
+        if not self.deleted:
+            self._record(LobbyEventType.LOBBY_DELETED, {})
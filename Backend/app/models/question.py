@@ -5,13 +5,27 @@ from datetime import datetime
 
 class Question:
     """Question model for storing user questions."""
-    
+
+    PENDING = "pending"
+    ANSWERED = "answered"
+    FAILED = "failed"
+
     def __init__(self, message: str, user_id: str, answer: Optional[str] = None, question_id: Optional[str] = None, timestamp: Optional[datetime] = None):
         self.question_id = question_id or str(uuid.uuid4())
         self.message = message
         self.answer = answer
         self.timestamp = timestamp or datetime.now()
-    
+        self.error: Optional[str] = None
+
+    @property
+    def status(self) -> str:
+        """Processing status: pending until answered, or failed if the agent errored."""
+        if self.answer is not None:
+            return self.ANSWERED
+        if self.error is not None:
+            return self.FAILED
+        return self.PENDING
+
     def set_answer(self, answer: str) -> None:
         """Set the answer for this question."""
         self.answer = answer
@@ -1,4 +1,4 @@
 from .api import router as api_router
+from .admin import router as admin_router
 
-__all__ = ["api_router"]
-
+__all__ = ["api_router", "admin_router"]
@@ -0,0 +1,62 @@
+import secrets
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+from app.core.config import settings
+from app.core.loop_monitor import loop_monitor
+from app.core.profiling import profiles
+from app.services.UsageMeter import usage_meter
+
+router = APIRouter()
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """Allow the request only if it carries the configured admin token."""
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, settings.ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+@router.get("/profiles", dependencies=[Depends(require_admin)])
+async def list_profiles():
+    """List the most recent request profiles, newest first."""
+    return {"profiling_enabled": settings.PROFILING_ENABLED, "profiles": profiles.list()}
+
+
+@router.get("/profiles/{profile_id}", dependencies=[Depends(require_admin)])
+async def get_profile(profile_id: str, format: str = "json"):
+    """
+    Get one request profile.
+
+    format=json returns the summary with the top functions by cumulative time,
+    format=text the pstats report.
+    """
+    profile = profiles.get(profile_id)
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if format == "text":
+        return PlainTextResponse(profile.report)
+    return profile.summary
+
+
+@router.get("/stalls", dependencies=[Depends(require_admin)])
+async def list_stalls():
+    """List the most recent event-loop stalls (steps blocking past the threshold), newest first."""
+    return {
+        "slow_callback_threshold": loop_monitor.slow_threshold,
+        "last_lag_seconds": loop_monitor.last_lag,
+        "stalls": loop_monitor.recent_stalls(),
+    }
+
+
+@router.get("/usage", dependencies=[Depends(require_admin)])
+async def get_usage(top: int = 20):
+    """LLM token usage and estimated cost overall, per route, and for the `top` lobbies by tokens used."""
+    return usage_meter.summary(top)
+
+
+@router.get("/usage/{pin}", dependencies=[Depends(require_admin)])
+async def get_lobby_usage(pin: str):
+    """LLM token usage of one lobby with its per-user breakdown."""
+    return {"pin": pin, **usage_meter.lobby_usage(pin)}
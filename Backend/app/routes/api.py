@@ -1,4 +1,5 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Response
+from fastapi.responses import StreamingResponse
 from app.schemas.lobby import (
     LobbyQuestion,
     LobbyResponse,
@@ -14,20 +15,38 @@ from app.schemas.lobby import (
     LobbyStartResponse,
     LobbyDelete,
     LobbyInfo,
-    QuestionInfo,
-    ParticipantDetail,
     UserReconnect,
     UserReconnectResponse,
     LobbyDeleteResponse,
-    LeaderboardResponse
+    LeaderboardResponse,
+    LobbyEventInfo,
+    LobbyEventsResponse,
+    LobbySyncResponse,
+    LobbyUsageResponse,
+    QuestionSubmitResponse,
+    QuestionStatusResponse,
+    QRBatchRequest
 )
 from app.services.GeminiAgent import GeminiAgent
 from app.services.GameMasterAgent import game_master
+from app.services.QuestionDispatcher import question_dispatcher, QueueFull
+from app.services.LobbySnapshot import lobby_snapshots
+from app.services.OpeningAnswers import opening_answers
+from app.services.UsageMeter import usage_meter, TokenBudgetExceeded
 from app.models.lobby import Lobby
 from app.models.user import User
+from app.models.question import Question
+from app.models.event import LobbyEvent, LobbyEventType, QUESTION_EVENTS
+from app.core.lifecycle import lifecycle, ServiceDraining
+from app.core.rate_limit import RateLimited
+from app.core.config import settings
+from app.core.logs import sampled
+from app.core.responses import PreSerializedJSONResponse
+import json
+import math
 import uuid
 import logging
-from typing import Dict
+from typing import Dict, List, Optional
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -35,6 +54,12 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 MAX_USERS = 6
+EVENTS_MAX_WAIT = 30  # seconds a delta poll may block waiting for new events
+EVENT_STREAM_KEEPALIVE = 15  # seconds between keepalive comments on the event stream
+DRAIN_RETRY_AFTER = "5"  # Retry-After header (seconds) sent while the server is draining
+QR_CACHE_CONTROL = "public, max-age=604800"  # join links never change for a PIN
+# Events that can change leaderboard entries
+LEADERBOARD_EVENTS = QUESTION_EVENTS + (LobbyEventType.PARTICIPANT_JOINED, LobbyEventType.PARTICIPANT_LEFT)
 
 @router.post("/lobby/create", response_model=LobbyCreateResponse)
 async def create_lobby(lobby_data: LobbyCreate):
@@ -44,20 +69,14 @@ async def create_lobby(lobby_data: LobbyCreate):
     The host provides their name, the secret concept, and optional context.
     Returns a 7-digit PIN that participants can use to join.
     """
-    print("Received request to create lobby")
     try:
-        logger.info(f"[CREATE_LOBBY] Request received: host_name={lobby_data.host_name}, secret_concept={lobby_data.secret_concept}, context={lobby_data.context}, topic={lobby_data.topic}, time_limit={lobby_data.time_limit}")
-        
         # Generate unique PIN
         pin = Lobby.generate_pin()
         while pin in game_master.lobbies:
             pin = Lobby.generate_pin()
         
-        logger.info(f"[CREATE_LOBBY] Generated PIN: {pin}")
-        
         # Create host user
         host = User(name=lobby_data.host_name)
-        logger.info(f"[CREATE_LOBBY] Created host user: user_id={host.user_id}, name={host.name}")
         
         # Create lobby instance with unique PIN, host, and concept
         lobby = Lobby(
@@ -68,21 +87,21 @@ async def create_lobby(lobby_data: LobbyCreate):
             topic=lobby_data.topic,
             timelimit=lobby_data.time_limit
         )
-        print("Creating lobby with PIN:", lobby.pin)
         game_master.create_lobby(lobby)
-        print("Lobby created with PIN:", lobby.pin)
-        logger.info(f"Lobby created with PIN {lobby.pin} by host {host.name}")
+        # Answer the usual opening questions while players join
+        opening_answers.schedule(lobby)
+        logger.info(
+            "Lobby %s created by host %s", lobby.pin, host.user_id,
+            extra={"route": "create_lobby", "pin": lobby.pin, "topic": lobby.topic, "time_limit": lobby.timelimit}
+        )
         
-        response = LobbyCreateResponse(
+        return LobbyCreateResponse(
             pin=lobby.pin,
             host_id=host.user_id,
             host_name=host.name
         )
-        logger.info(f"[CREATE_LOBBY] Returning response: {response}")
-        
-        return response
     except Exception as e:
-        logger.error(f"[CREATE_LOBBY] Error creating lobby: {str(e)}", exc_info=True)
+        logger.error("Error creating lobby: %s", e, exc_info=True, extra={"route": "create_lobby"})
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -116,7 +135,10 @@ async def join_lobby(join_data: ParticipantJoin):
         except ValueError as e:
             raise HTTPException(status_code=400, detail=str(e))
         
-        logger.info(f"Participant {participant.name} joined lobby {join_data.pin}")
+        logger.info(
+            "Participant %s joined lobby %s", participant.user_id, join_data.pin,
+            extra={"route": "join_lobby", "pin": join_data.pin}
+        )
         
         return ParticipantJoinResponse(
             pin=lobby.pin,
@@ -128,7 +150,7 @@ async def join_lobby(join_data: ParticipantJoin):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error joining lobby: {str(e)}")
+        logger.error("Error joining lobby: %s", e, extra={"route": "join_lobby"})
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -148,7 +170,10 @@ async def leave_lobby(leave_data: ParticipantLeave):
         # Remove participant using Lobby method
         lobby.remove_participant(leave_data.user_id)
         
-        logger.info(f"Participant {leave_data.user_id} left lobby {leave_data.pin}")
+        logger.info(
+            "Participant %s left lobby %s", leave_data.user_id, leave_data.pin,
+            extra={"route": "leave_lobby", "pin": leave_data.pin}
+        )
         
         return ParticipantLeaveResponse(
             pin=lobby.pin,
@@ -157,7 +182,7 @@ async def leave_lobby(leave_data: ParticipantLeave):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error leaving lobby: {str(e)}")
+        logger.error("Error leaving lobby: %s", e, extra={"route": "leave_lobby"})
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -171,38 +196,26 @@ async def start_lobby(lobby_start: LobbyStart):
     Optionally updates concept, context, topic, and time_limit if provided.
     """
     try:
-        logger.info(f"[START_LOBBY] Request received: pin={lobby_start.pin}, host_id={lobby_start.host_id}")
-        logger.info(f"[START_LOBBY] Available lobbies: {list(game_master.lobbies.keys())}")
-        
         lobby = game_master.get_lobby(lobby_start.pin)
         
         if not lobby:
-            logger.error(f"[START_LOBBY] Lobby not found: {lobby_start.pin}")
             raise HTTPException(status_code=404, detail="Lobby not found with that PIN")
         
-        logger.info(f"[START_LOBBY] Lobby found: pin={lobby.pin}, host_user_id={lobby.host.user_id}")
-        
         # Verify host_id
         if lobby.host.user_id != lobby_start.host_id:
-            logger.error(f"[START_LOBBY] Host ID mismatch: expected={lobby.host.user_id}, received={lobby_start.host_id}")
+            logger.warning("Host ID mismatch starting lobby %s", lobby.pin, extra={"route": "start_lobby", "pin": lobby.pin})
             raise HTTPException(status_code=403, detail="Only the host can start the lobby")
         
         # Update lobby fields if provided
-        if lobby_start.secret_concept is not None:
-            lobby.secret_concept = lobby_start.secret_concept
-            logger.info(f"[START_LOBBY] Updated secret_concept: {lobby_start.secret_concept}")
-        
-        if lobby_start.context is not None:
-            lobby.context = lobby_start.context
-            logger.info(f"[START_LOBBY] Updated context: {lobby_start.context}")
-        
-        if lobby_start.topic is not None:
-            lobby.topic = lobby_start.topic
-            logger.info(f"[START_LOBBY] Updated topic: {lobby_start.topic}")
-        
-        if lobby_start.time_limit is not None:
-            lobby.timelimit = lobby_start.time_limit
-            logger.info(f"[START_LOBBY] Updated time_limit: {lobby_start.time_limit}")
+        answered_for = (lobby.secret_concept, lobby.context)
+        lobby.update(
+            secret_concept=lobby_start.secret_concept,
+            context=lobby_start.context,
+            topic=lobby_start.topic,
+            timelimit=lobby_start.time_limit
+        )
+        if (lobby.secret_concept, lobby.context) != answered_for:
+            opening_answers.schedule(lobby)
         
         # Parse start_time if provided
         start_dt = None
@@ -210,31 +223,29 @@ async def start_lobby(lobby_start: LobbyStart):
             try:
                 # Handle ISO format with Z or offset
                 start_dt = datetime.fromisoformat(lobby_start.start_time.replace('Z', '+00:00'))
-                logger.info(f"[START_LOBBY] Using provided start_time: {start_dt}")
             except ValueError:
-                logger.warning(f"[START_LOBBY] Invalid start_time format: {lobby_start.start_time}, using current time")
+                logger.warning(
+                    "Invalid start_time %r for lobby %s, using current time", lobby_start.start_time, lobby.pin,
+                    extra={"route": "start_lobby", "pin": lobby.pin}
+                )
 
         # Start lobby using Lobby method
         try:
             lobby.start(start_time=start_dt)
-            logger.info(f"[START_LOBBY] Lobby started successfully: {lobby_start.pin}")
         except ValueError as e:
-            logger.error(f"[START_LOBBY] Error starting lobby: {str(e)}")
             raise HTTPException(status_code=400, detail=str(e))
         
-        logger.info(f"[START_LOBBY] Lobby started {lobby_start.pin}")
+        logger.info("Lobby %s started", lobby.pin, extra={"route": "start_lobby", "pin": lobby.pin})
         
-        response = LobbyStartResponse(
+        return LobbyStartResponse(
             pin=lobby.pin,
             start_time=lobby.start_time.isoformat(),
             participants=lobby.get_participant_names()
         )
-        logger.info(f"[START_LOBBY] Returning response: {response}")
-        return response
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error starting lobby: {str(e)}")
+        logger.error("Error starting lobby: %s", e, extra={"route": "start_lobby"})
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -252,13 +263,14 @@ async def delete_lobby(delete_data: LobbyDelete):
         
         # Verify host_id
         if lobby.host.user_id != delete_data.host_id:
-            logger.error(f"[DELETE_LOBBY] Host ID mismatch: expected={lobby.host.user_id}, received={delete_data.host_id}")
+            logger.warning("Host ID mismatch deleting lobby %s", lobby.pin, extra={"route": "delete_lobby", "pin": lobby.pin})
             raise HTTPException(status_code=403, detail="Only the host can delete the lobby")
         
         # Delete the lobby from game_master
-        del game_master.lobbies[delete_data.pin]
+        opening_answers.cancel(delete_data.pin)
+        game_master.delete_lobby(delete_data.pin)
         
-        logger.info(f"Lobby deleted {delete_data.pin}")
+        logger.info("Lobby %s deleted", delete_data.pin, extra={"route": "delete_lobby", "pin": delete_data.pin})
         
         return LobbyDeleteResponse(
             pin=delete_data.pin,
@@ -267,7 +279,7 @@ async def delete_lobby(delete_data: LobbyDelete):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error deleting lobby: {str(e)}")
+        logger.error("Error deleting lobby: %s", e, extra={"route": "delete_lobby"})
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -275,78 +287,120 @@ async def delete_lobby(delete_data: LobbyDelete):
 async def get_lobby_info(pin: str, user_id: str):
     """Get information about a lobby using its PIN. Secret concept and context only visible to host."""
     try:
-        logger.info(f"[GET_LOBBY_INFO] Request received: pin={pin}, user_id={user_id}")
-        logger.info(f"[GET_LOBBY_INFO] Available lobbies: {list(game_master.lobbies.keys())}")
-        
         lobby = game_master.get_lobby(pin)
         
         if not lobby:
-            logger.error(f"[GET_LOBBY_INFO] Lobby not found: {pin}")
             raise HTTPException(status_code=404, detail="Lobby not found")
         
-        logger.info(f"[GET_LOBBY_INFO] Lobby found: pin={lobby.pin}, host={lobby.host.name}, participants={lobby.get_participant_names()}")
-        
         # Check if the requesting user is the host
         is_host = lobby.host.user_id == user_id
-        logger.info(f"[GET_LOBBY_INFO] User is host: {is_host}")
-        
-        logger.info(f"[GET_LOBBY_INFO] Lobby topic: {lobby.topic}")
-        
-        questions = []
-        participants_details = []
-        if is_host:
-            # Collect participants details
-            participants_details = [
-                ParticipantDetail(user_id=p.user_id, name=p.name)
-                for p in lobby.participants.values()
-            ]
-
-            # Collect questions from all participants
-            for participant in lobby.participants.values():
-                for q in participant.get_all_questions():
-                    questions.append(QuestionInfo(
-                        question_id=q.question_id,
-                        user_id=participant.user_id,
-                        user_name=participant.name,
-                        question=q.message,
-                        answer=q.answer,
-                        timestamp=q.timestamp.timestamp() * 1000
-                    ))
-            # Also check host questions if any
-            for q in lobby.host.get_all_questions():
-                 questions.append(QuestionInfo(
-                        question_id=q.question_id,
-                        user_id=lobby.host.user_id,
-                        user_name=lobby.host.name,
-                        question=q.message,
-                        answer=q.answer,
-                        timestamp=q.timestamp.timestamp() * 1000
-                    ))
-            
-            questions.sort(key=lambda x: x.timestamp)
-
-        response = LobbyInfo(
+        # Polled every few seconds by every client, so only a sample of these is logged
+        if sampled("get_lobby_info"):
+            logger.info(
+                "Lobby info for %s served to %s", pin, user_id,
+                extra={"route": "get_lobby_info", "pin": pin, "is_host": is_host, "version": lobby.version}
+            )
+
+        # Serialized once per lobby version and viewer role, then served as raw bytes
+        return PreSerializedJSONResponse(lobby_snapshots.get(lobby, is_host))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Error getting lobby info: %s", e, extra={"route": "get_lobby_info"})
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _visible_events(events: List[LobbyEvent], user_id: str, is_host: bool) -> List[LobbyEventInfo]:
+    """Convert events to their schema form, dropping or redacting what the viewer may not see."""
+    visible = []
+    for event in events:
+        data = event.visible_data(user_id, is_host)
+        if data is not None:
+            visible.append(LobbyEventInfo(
+                seq=event.seq,
+                type=event.type.value,
+                timestamp=event.timestamp.isoformat(),
+                data=data
+            ))
+    return visible
+
+
+@router.get("/lobby/{pin}/events", response_model=LobbyEventsResponse)
+async def get_lobby_events(pin: str, user_id: str, since: int = 0, wait: float = 0):
+    """
+    Get the lobby events recorded after version `since` (delta polling).
+
+    With wait > 0 the request long-polls: it returns as soon as a newer event
+    is recorded, or after `wait` seconds (at most 30) with no events.
+    Secret concept, context and other users' questions are only visible to the host.
+    """
+    try:
+        lobby = game_master.get_lobby(pin)
+
+        if not lobby:
+            raise HTTPException(status_code=404, detail="Lobby not found")
+
+        is_host = lobby.host.user_id == user_id
+        events = await lobby.events.wait_for(since, min(wait, EVENTS_MAX_WAIT))
+
+        return LobbyEventsResponse(
             pin=lobby.pin,
-            host_name=lobby.host.name,
-            participants=lobby.get_participant_names(),
-            topic=lobby.topic,
-            timelimit=lobby.timelimit,
-            start_time=lobby.start_time.isoformat() if lobby.start_time else None,
-            secret_concept=lobby.secret_concept if is_host else None,
-            context=lobby.context if is_host else None,
-            questions=questions if is_host else None,
-            participants_details=participants_details if is_host else None
+            version=lobby.version,
+            events=_visible_events(events, user_id, is_host)
         )
-        logger.info(f"[GET_LOBBY_INFO] Returning response with topic: {response.topic}")
-        logger.info(f"[GET_LOBBY_INFO] Full response: {response}")
-        return response
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error getting lobby info: {str(e)}")
+        logger.error("Error getting lobby events: %s", e, extra={"route": "get_lobby_events"})
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/lobby/{pin}/events/stream")
+async def stream_lobby_events(
+    pin: str,
+    user_id: str,
+    since: int = 0,
+    last_event_id: Optional[int] = Header(None, alias="Last-Event-ID")
+):
+    """
+    Push lobby events to the client as Server-Sent Events.
+
+    Each SSE message carries the event sequence number as its id, so a
+    reconnecting EventSource resumes where it left off via Last-Event-ID.
+    The stream ends after the lobby is deleted or when the server starts draining.
+    """
+    lobby = game_master.get_lobby(pin)
+
+    if not lobby:
+        raise HTTPException(status_code=404, detail="Lobby not found")
+
+    is_host = lobby.host.user_id == user_id
+    cursor = max(since, last_event_id or 0)
+
+    async def event_stream():
+        nonlocal cursor
+        while True:
+            events = await lobby.events.wait_for(cursor, EVENT_STREAM_KEEPALIVE)
+            if not events:
+                if lifecycle.draining:
+                    return
+                yield ": keepalive\n\n"
+                continue
+
+            cursor = events[-1].seq
+            for info in _visible_events(events, user_id, is_host):
+                yield f"id: {info.seq}\nevent: {info.type}\ndata: {info.model_dump_json()}\n\n"
+
+            if lobby.deleted or lifecycle.draining:
+                return
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.post("/lobby/reconnect", response_model=UserReconnectResponse)
 async def reconnect_user(reconnect_data: UserReconnect):
     """
@@ -387,7 +441,7 @@ async def reconnect_user(reconnect_data: UserReconnect):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error reconnecting user: {str(e)}")
+        logger.error("Error reconnecting user: %s", e, extra={"route": "reconnect_user"})
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -414,11 +468,100 @@ async def ask_question(pin: str, question: LobbyQuestion):
         )
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    except RateLimited as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(math.ceil(e.retry_after))})
+    except TokenBudgetExceeded as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except ServiceDraining as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": DRAIN_RETRY_AFTER})
     except Exception as e:
-        logger.error(f"Error processing question: {str(e)}")
+        logger.error("Error processing question: %s", e, extra={"route": "ask_question"})
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/lobby/{pin}/question/async", response_model=QuestionSubmitResponse, status_code=202)
+async def submit_question(
+    pin: str,
+    question: LobbyQuestion,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
+):
+    """
+    Submit a question without waiting for the Lobby Master's answer.
+
+    Returns 202 with the question_id immediately; the answer is recorded as a
+    question_answered event in the lobby's event feed and can also be fetched
+    from GET /lobby/{pin}/question/{question_id}. Retries should send the same
+    Idempotency-Key header: a resubmission returns the original question
+    (with 200) and never asks the Lobby Master twice, unless the original
+    failed, in which case the question is submitted again.
+    """
+    try:
+        submitted, created = question_dispatcher.submit(
+            pin, question.user_id, question.question, idempotency_key=idempotency_key
+        )
+        if not created:
+            response.status_code = 200
+
+        return QuestionSubmitResponse(
+            question_id=submitted.question_id,
+            status=submitted.status,
+            message=submitted.message
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except RateLimited as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(math.ceil(e.retry_after))})
+    except TokenBudgetExceeded as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except (ServiceDraining, QueueFull) as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": DRAIN_RETRY_AFTER})
+    except Exception as e:
+        logger.error("Error submitting question: %s", e, extra={"route": "submit_question"})
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/lobby/{pin}/question/{question_id}", response_model=QuestionStatusResponse)
+async def get_question(pin: str, question_id: str, user_id: str):
+    """
+    Get the status and answer of a question.
+
+    Visible to the user who asked it and to the host.
+    """
+    lobby = game_master.get_lobby(pin)
+
+    if not lobby:
+        raise HTTPException(status_code=404, detail="Lobby not found")
+
+    # The host may look up any question, everyone else only their own
+    if lobby.host.user_id == user_id:
+        candidates = [lobby.host] + list(lobby.participants.values())
+    else:
+        participant = lobby.get_participant(user_id)
+        candidates = [participant] if participant else []
+
+    found = None
+    for user in candidates:
+        found = user.get_question(question_id)
+        if found:
+            break
+
+    if not found:
+        raise HTTPException(status_code=404, detail="Question not found")
+
+    return _question_status(found)
+
+
+def _question_status(question: Question) -> QuestionStatusResponse:
+    return QuestionStatusResponse(
+        question_id=question.question_id,
+        status=question.status,
+        message=question.message,
+        response=question.answer,
+        error=question.error
+    )
+
+
 @router.get("/lobby/{pin}/leaderboard", response_model=LeaderboardResponse)
 async def get_leaderboard(pin: str, limit: int = -1):
     """
@@ -436,6 +579,9 @@ async def get_leaderboard(pin: str, limit: int = -1):
         if limit != -1:
             leaderboard = leaderboard[:limit]
         
+        # Polled every few seconds by every client, so only a sample of these is logged
+        if sampled("get_leaderboard"):
+            logger.info("Leaderboard for %s served", pin, extra={"route": "get_leaderboard", "pin": pin})
         return LeaderboardResponse(
             pin=pin,
             leaderboard=leaderboard
@@ -443,10 +589,99 @@ async def get_leaderboard(pin: str, limit: int = -1):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error getting leaderboard: {str(e)}")
+        logger.error("Error getting leaderboard: %s", e, extra={"route": "get_leaderboard"})
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/lobby/{pin}/usage", response_model=LobbyUsageResponse)
+async def get_lobby_usage(pin: str, user_id: str):
+    """
+    Get the LLM tokens (and their estimated cost) used by a lobby, per user.
+
+    Only the host can see the usage.
+    """
+    try:
+        lobby = game_master.get_lobby(pin)
+
+        if not lobby:
+            raise HTTPException(status_code=404, detail="Lobby not found")
+
+        if lobby.host.user_id != user_id:
+            raise HTTPException(status_code=403, detail="Only the host can see the lobby's usage")
+
+        return LobbyUsageResponse(pin=pin, **usage_meter.lobby_usage(pin))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Error getting lobby usage: %s", e, extra={"route": "get_lobby_usage"})
         raise HTTPException(status_code=500, detail=str(e))
     
 
+@router.get("/lobby/{pin}/sync", response_model=LobbySyncResponse)
+async def sync_lobby(pin: str, user_id: str, since: int = 0):
+    """
+    Get everything a client polls for in one request: lobby info, leaderboard and the user's own questions.
+
+    All sections come from the same lobby version. Pass the returned `version` as
+    `since` on the next sync: `lobby` and `leaderboard` are then null when unchanged,
+    and `questions` only holds the user's questions submitted or updated since.
+    Secret concept, context and other users' questions are only visible to the host.
+    """
+    try:
+        lobby = game_master.get_lobby(pin)
+
+        if not lobby:
+            raise HTTPException(status_code=404, detail="Lobby not found")
+
+        user = lobby.get_user(user_id)
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found in lobby")
+
+        is_host = lobby.host.user_id == user_id
+
+        # Nothing below awaits, so every section reflects the same lobby version
+        version = lobby.version
+        if since <= 0 or since > version:
+            # First sync, or a cursor the lobby never reached: send everything
+            lobby_changed = leaderboard_changed = True
+            questions = user.get_all_questions()
+        else:
+            events = lobby.events.since(since)
+            lobby_changed = any(is_host or e.type not in QUESTION_EVENTS for e in events)
+            leaderboard_changed = any(e.type in LEADERBOARD_EVENTS for e in events)
+            question_ids = dict.fromkeys(
+                e.data["question_id"] for e in events
+                if e.type in QUESTION_EVENTS and e.data.get("user_id") == user_id
+            )
+            questions = [q for q in map(user.get_question, question_ids) if q]
+
+        head = LobbySyncResponse(
+            pin=lobby.pin,
+            version=version,
+            is_host=is_host,
+            user_name=user.name,
+            questions=[_question_status(q) for q in questions]
+        ).model_dump_json(exclude={"lobby", "leaderboard"}).encode("utf-8")
+
+        if sampled("sync_lobby"):
+            logger.info(
+                "Lobby %s synced for %s", pin, user_id,
+                extra={"route": "sync_lobby", "pin": pin, "since": since, "version": version}
+            )
+
+        # Splice in the cached lobby and leaderboard JSON instead of re-encoding them
+        lobby_json = lobby_snapshots.get(lobby, is_host) if lobby_changed else b"null"
+        leaderboard_json = lobby_snapshots.leaderboard(lobby, game_master.rank_users) if leaderboard_changed else b"null"
+        return PreSerializedJSONResponse(
+            head[:-1] + b',"lobby":' + lobby_json + b',"leaderboard":' + leaderboard_json + b"}"
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Error syncing lobby: %s", e, extra={"route": "sync_lobby"})
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/chat", response_model=ChatResponse)
 async def chat_with_gemini(chat_request: ChatRequest):
     """
@@ -455,6 +690,8 @@ async def chat_with_gemini(chat_request: ChatRequest):
     Use this for regular conversations with Gemini.
     """
     try:
+        lifecycle.admit()
+
         agent = GeminiAgent(system_prompt=chat_request.system_prompt)
         response = await agent.simple_chat(chat_request.message)
 
@@ -462,11 +699,48 @@ async def chat_with_gemini(chat_request: ChatRequest):
             response=response,
             model_used="gemini-2.5-flash"
         )
+    except ServiceDraining as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": DRAIN_RETRY_AFTER})
     except Exception as e:
-        logger.error(f"Error in chat: {str(e)}")
+        logger.error("Error in chat: %s", e, extra={"route": "chat_with_gemini"})
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/chat/stream")
+async def stream_chat_with_gemini(chat_request: ChatRequest):
+    """
+    Streaming variant of /chat, as Server-Sent Events.
+
+    Each "chunk" event carries {"text": ...} with the next piece of the reply
+    as Gemini generates it, and a final "done" event carries the model used;
+    a failure after the stream has started is sent as an "error" event.
+    When the client disconnects the upstream call is cancelled, so an
+    abandoned request stops consuming tokens.
+    """
+    try:
+        lifecycle.admit()
+    except ServiceDraining as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": DRAIN_RETRY_AFTER})
+
+    chunks = game_master.agent.stream_chat(chat_request.message, chat_request.system_prompt)
+
+    async def event_stream():
+        try:
+            async for text in chunks:
+                yield f"event: chunk\ndata: {json.dumps({'text': text})}\n\n"
+        except Exception as e:
+            logger.error("Error in streaming chat: %s", e, extra={"route": "stream_chat_with_gemini"})
+            yield f"event: error\ndata: {json.dumps({'detail': str(e)})}\n\n"
+            return
+        yield f"event: done\ndata: {json.dumps({'model_used': settings.GEMINI_MODEL})}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/health")
 async def health_check():
     """Health check endpoint."""
@@ -487,10 +761,10 @@ async def generate_qr_code(link: str):
     try:
         from app.services.QRService import QRService
 
-        logger.info(f"Generating QR code for link: {link}")
+        logger.info("Generating QR code for link %s", link, extra={"route": "generate_qr_code"})
 
-        # Generate QR code as data URL (ready for frontend)
-        data_url = QRService.generate_qr_code_data_url(link)
+        # Generate QR code as data URL (ready for frontend), rendered off the event loop
+        data_url = (await QRService.render_async(link)).data_url
 
         return {
             "success": True,
@@ -500,7 +774,7 @@ async def generate_qr_code(link: str):
         }
 
     except Exception as e:
-        logger.error(f"Error generating QR code: {str(e)}")
+        logger.error("Error generating QR code: %s", e, extra={"route": "generate_qr_code"})
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -518,10 +792,10 @@ async def generate_qr_code_base64(link: str):
     try:
         from app.services.QRService import QRService
 
-        logger.info(f"Generating QR code (base64) for link: {link}")
+        logger.info("Generating QR code (base64) for link %s", link, extra={"route": "generate_qr_code_base64"})
 
-        # Generate QR code as base64
-        base64_image = QRService.generate_qr_code_base64(link)
+        # Generate QR code as base64, rendered off the event loop
+        base64_image = (await QRService.render_async(link)).base64
 
         return {
             "success": True,
@@ -531,6 +805,95 @@ async def generate_qr_code_base64(link: str):
         }
 
     except Exception as e:
-        logger.error(f"Error generating QR code: {str(e)}")
+        logger.error("Error generating QR code: %s", e, extra={"route": "generate_qr_code_base64"})
         raise HTTPException(status_code=500, detail=str(e))
 
+
+
+@router.post("/qr/batch")
+async def generate_qr_code_batch(batch: QRBatchRequest):
+    """
+    Generate QR codes for many links (e.g. printed join cards) as one streamed ZIP.
+
+    Entries are named 0001.png, 0002.png, ... in request order, and
+    manifest.csv maps each file to its link. Rendering runs in parallel on a
+    process pool while the archive streams, so memory use does not grow
+    with the batch size.
+    """
+    from app.services.QRService import QRService
+
+    if len(batch.links) > settings.QR_BATCH_MAX_LINKS:
+        raise HTTPException(status_code=400, detail=f"Too many links (maximum {settings.QR_BATCH_MAX_LINKS})")
+
+    logger.info("Generating QR code batch of %d links", len(batch.links), extra={"route": "generate_qr_code_batch"})
+
+    return StreamingResponse(
+        QRService.render_batch_zip(batch.links, image_format=batch.format, box_size=batch.box_size, border=batch.border),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="qr-codes.zip"'}
+    )
+
+
+@router.get("/qr/cache/stats")
+async def qr_cache_stats():
+    """Hit-rate metrics of the rendered QR code cache."""
+    from app.services.QRService import QRService
+
+    return QRService.cache.stats()
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison, as RFC 9110 requires)."""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+async def _lobby_qr_response(pin: str, image_format: str, box_size: int, border: int, if_none_match: Optional[str]) -> Response:
+    """Serve a lobby's join-link QR code as raw bytes with HTTP caching headers."""
+    from app.services.QRService import QRCache, QRService, qr_etag
+
+    if not game_master.get_lobby(pin):
+        raise HTTPException(status_code=404, detail="Lobby not found")
+
+    link = f"{settings.FRONTEND_URL.rstrip('/')}/?pin={pin}"
+    # The ETag only depends on the render inputs, so revalidation never needs the image
+    etag = qr_etag(QRCache.make_key(link, "black", "white", box_size, border, image_format=image_format))
+    headers = {"ETag": etag, "Cache-Control": QR_CACHE_CONTROL}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    try:
+        rendered = await QRService.render_async(link, box_size=box_size, border=border, image_format=image_format)
+    except Exception as e:
+        logger.error("Error generating QR code: %s", e, extra={"route": "get_lobby_qr"})
+        raise HTTPException(status_code=500, detail=str(e))
+    return Response(content=rendered.content, media_type=rendered.media_type, headers=headers)
+
+
+@router.get("/qr/{pin}.png")
+async def get_lobby_qr_png(
+    pin: str,
+    box_size: int = Query(10, ge=1, le=40),
+    border: int = Query(4, ge=0, le=20),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match")
+):
+    """
+    Get the QR code for a lobby's join link as a PNG image.
+
+    Usable directly as an <img src>; responses carry a strong ETag and a
+    long-lived Cache-Control, and If-None-Match revalidation returns 304.
+    """
+    return await _lobby_qr_response(pin, "png", box_size, border, if_none_match)
+
+
+@router.get("/qr/{pin}.svg")
+async def get_lobby_qr_svg(
+    pin: str,
+    box_size: int = Query(10, ge=1, le=40),
+    border: int = Query(4, ge=0, le=20),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match")
+):
+    """Get the QR code for a lobby's join link as an SVG image (no rasterization)."""
+    return await _lobby_qr_response(pin, "svg", box_size, border, if_none_match)
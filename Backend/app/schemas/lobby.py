@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Literal, Optional, List
+from typing import Dict, Literal, Optional, List
 
 
 class LobbyCreate(BaseModel):
@@ -81,6 +81,22 @@ class LobbyQuestion(BaseModel):
     question: str = Field(..., description="The yes/no question to ask the Lobby Master")
 
 
+class QuestionSubmitResponse(BaseModel):
+    """Schema for an accepted asynchronous question."""
+    question_id: str = Field(..., description="ID to poll for the answer")
+    status: str = Field(..., description="pending, answered or failed")
+    message: str = Field(..., description="The original question message")
+
+
+class QuestionStatusResponse(BaseModel):
+    """Schema for the current state of a question."""
+    question_id: str
+    status: str = Field(..., description="pending, answered or failed")
+    message: str = Field(..., description="The original question message")
+    response: Optional[str] = Field(None, description="The Lobby Master's response, once answered")
+    error: Optional[str] = Field(None, description="Why the question could not be answered, if it failed")
+
+
 class LobbyResponse(BaseModel):
     """Schema for the Lobby Master's response."""
     question_id: str = Field(..., description="ID of the question that was answered")
@@ -148,6 +164,48 @@ class LeaderboardResponse(BaseModel):
     leaderboard: List[LeaderboardEntry] = Field(..., description="Top 10 users sorted by question count")
 
 
+class LobbyEventInfo(BaseModel):
+    """Schema for a single lobby event."""
+    seq: int = Field(..., description="Sequence number of the event within its lobby")
+    type: str = Field(..., description="Event type, e.g. participant_joined")
+    timestamp: str = Field(..., description="ISO datetime when the event was recorded")
+    data: dict = Field(..., description="Event payload, redacted for non-host viewers")
+
+
+class LobbyEventsResponse(BaseModel):
+    """Schema for a delta poll of lobby events."""
+    pin: str
+    version: int = Field(..., description="Latest lobby version; pass it as `since` on the next poll")
+    events: List[LobbyEventInfo] = Field(..., description="Events newer than the requested version")
+
+
+class LobbySyncResponse(BaseModel):
+    """Schema for a combined client sync: lobby info, leaderboard and own questions."""
+    pin: str
+    version: int = Field(..., description="Lobby version of this snapshot; pass it as `since` on the next sync")
+    is_host: bool
+    user_name: str
+    questions: List[QuestionStatusResponse] = Field(..., description="The user's questions submitted or updated after `since`")
+    lobby: Optional[LobbyInfo] = Field(None, description="Lobby info, omitted (null) when unchanged since `since`")
+    leaderboard: Optional[List[LeaderboardEntry]] = Field(None, description="Full leaderboard, omitted (null) when unchanged since `since`")
+
+
+class TokenUsageInfo(BaseModel):
+    """Schema for the LLM token usage of a lobby or user."""
+    calls: int = Field(..., description="Number of LLM calls")
+    input_tokens: int
+    output_tokens: int
+    total_tokens: int
+    cost_usd: float = Field(..., description="Estimated cost at the configured token prices")
+
+
+class LobbyUsageResponse(TokenUsageInfo):
+    """Schema for a lobby's LLM token usage with its per-user breakdown."""
+    pin: str
+    budget_tokens: Optional[int] = Field(None, description="Token budget of the lobby, null if unlimited")
+    users: Dict[str, TokenUsageInfo] = Field(..., description="Usage by user_id")
+
+
 class LobbySession(BaseModel):
     """Schema for lobby session information."""
     session_id: str
@@ -155,6 +213,14 @@ class LobbySession(BaseModel):
     history: list[dict] = []
 
 
+class QRBatchRequest(BaseModel):
+    """Schema for rendering many QR codes at once."""
+    links: List[str] = Field(..., min_length=1, description="Links to encode, one QR code each")
+    format: Literal["png", "svg"] = Field("png", description="Image format of the archive entries")
+    box_size: int = Field(10, ge=1, le=40, description="Size of each box in pixels")
+    border: int = Field(4, ge=0, le=20, description="Border size in boxes")
+
+
 class ChatRequest(BaseModel):
     """General chat request for Gemini API."""
     message: str = Field(..., description="User message to send to Gemini")
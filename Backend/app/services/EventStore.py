@@ -0,0 +1,114 @@
+"""
+Event Store - Persist lobby event logs to local segmented files
+"""
+from pathlib import Path
+from typing import Dict, List, Tuple
+import json
+import logging
+import time
+from app.models.event import LobbyEvent, LobbyEventType
+
+logger = logging.getLogger(__name__)
+
+# Directories of deleted lobbies are moved here, so a new lobby drawing the same PIN starts a fresh log
+ARCHIVE_DIR = "deleted"
+
+
+class SegmentedEventStore:
+    """
+    Append-only on-disk store for lobby events.
+
+    Each lobby gets its own directory of JSON-lines segment files
+    (`<root>/<pin>/00000001.jsonl`, ...). A new segment is started once the
+    current one grows past `segment_bytes`, so old segments are immutable
+    and can be archived or deleted independently. Each event is appended
+    with its own open/write/close, so it is in the OS before the mutation
+    returns (a crash loses nothing) and no file descriptor is held between
+    writes, however many lobbies are live. Once a lobby's deletion is
+    written its directory is moved to `<root>/deleted/<pin>-<time>/`, so a
+    reused PIN never appends to a deleted lobby's log.
+    """
+
+    def __init__(self, root: str, segment_bytes: int = 1_048_576):
+        self.root = Path(root)
+        self.segment_bytes = segment_bytes
+        # pin -> (current segment id, its size in bytes)
+        self._segments: Dict[str, Tuple[int, int]] = {}
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _segment_path(self, pin: str, segment_id: int) -> Path:
+        return self.root / pin / f"{segment_id:08d}.jsonl"
+
+    def _current_segment(self, pin: str) -> Tuple[int, int]:
+        """The lobby's writable segment id and size, rolling over when it is full."""
+        segment = self._segments.get(pin)
+        if segment is None:
+            lobby_dir = self.root / pin
+            lobby_dir.mkdir(parents=True, exist_ok=True)
+            existing = sorted(lobby_dir.glob("*.jsonl"))
+            segment = (int(existing[-1].stem), existing[-1].stat().st_size) if existing else (1, 0)
+        segment_id, size = segment
+        if size >= self.segment_bytes:
+            segment_id, size = segment_id + 1, 0
+        return segment_id, size
+
+    def write(self, event: LobbyEvent) -> None:
+        """Append an event to its lobby's current segment."""
+        segment_id, size = self._current_segment(event.pin)
+        line = (json.dumps(event.to_dict(), default=str) + "\n").encode("utf-8")
+        with open(self._segment_path(event.pin, segment_id), "ab") as handle:
+            handle.write(line)
+        self._segments[event.pin] = (segment_id, size + len(line))
+        if event.type == LobbyEventType.LOBBY_DELETED:
+            self.close_lobby(event.pin)
+            self._archive(event.pin)
+
+    def _archive(self, pin: str) -> None:
+        archive = self.root / ARCHIVE_DIR
+        archive.mkdir(exist_ok=True)
+        try:
+            (self.root / pin).rename(archive / f"{pin}-{time.time_ns()}")
+        except OSError as e:
+            logger.error("Could not archive the event log of lobby %s: %s", pin, e, extra={"pin": pin})
+
+    def close_lobby(self, pin: str) -> None:
+        """Forget a lobby's current segment."""
+        self._segments.pop(pin, None)
+
+    def close(self) -> None:
+        """Forget every lobby's current segment (nothing is held open between writes)."""
+        self._segments.clear()
+
+    def read(self, pin: str) -> List[LobbyEvent]:
+        """
+        Read the stored events of a lobby, in sequence order.
+
+        Only events from the last LOBBY_CREATED on are returned, so a log that
+        somehow holds an earlier lobby with the same PIN replays the current one.
+
+        Args:
+            pin: Lobby PIN
+
+        Returns:
+            List of LobbyEvent objects (empty if nothing is stored)
+        """
+        events = []
+        for segment in sorted((self.root / pin).glob("*.jsonl")):
+            with open(segment, encoding="utf-8") as handle:
+                for line in handle:
+                    if not line.strip():
+                        continue
+                    try:
+                        events.append(LobbyEvent.from_dict(json.loads(line)))
+                    except json.JSONDecodeError:
+                        # A torn write at the tail of the last segment
+                        logger.warning(f"Skipping corrupt event line in {segment}")
+
+        for i in range(len(events) - 1, -1, -1):
+            if events[i].type == LobbyEventType.LOBBY_CREATED:
+                return events[i:]
+        return events
+
+    def pins(self) -> List[str]:
+        """List the PINs of all lobbies that have stored events."""
+        return sorted(p.name for p in self.root.iterdir() if p.is_dir() and p.name != ARCHIVE_DIR)
@@ -1,7 +1,18 @@
 from app.services.GeminiAgent import GeminiAgent
+from app.services.MicroBatcher import MicroBatcher
+from app.services.EventStore import SegmentedEventStore
+from app.services.QuestionReuse import question_reuse
+from app.services.UsageMeter import usage_meter
 from app.models.lobby import Lobby
 from app.models.question import Question
-from typing import Dict, Optional
+from app.core.config import settings
+from app.core.lifecycle import lifecycle
+from app.core.rate_limit import question_limiter
+from app.core.metrics import metrics
+from typing import Callable, Dict, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
 
 class GameMasterAgent:
     """Specialized agent for the Questions game with state management."""
@@ -9,12 +20,66 @@ class GameMasterAgent:
     def __init__(self):
         self.lobbies: Dict[str, Lobby] = {}
         self.agent = GeminiAgent()
+        # Answers game questions; batches them across lobbies when a batch window is configured
+        self.answerer = self.agent
+        if settings.LLM_BATCH_WINDOW > 0:
+            self.answerer = MicroBatcher(self.agent, settings.LLM_BATCH_WINDOW, settings.LLM_BATCH_MAX)
+        self.event_store: Optional[SegmentedEventStore] = None
+        if settings.EVENT_LOG_DIR:
+            self.event_store = SegmentedEventStore(
+                settings.EVENT_LOG_DIR,
+                segment_bytes=settings.EVENT_LOG_SEGMENT_BYTES
+            )
 
     def create_lobby(self, lobby: Lobby) -> Lobby:
         """Create a new lobby and add it to the lobbies dict."""
         self.lobbies[lobby.pin] = lobby
+        if self.event_store:
+            # Persist what was recorded before the lobby was registered, then follow the log
+            for event in lobby.events.events:
+                self.event_store.write(event)
+            lobby.events.add_listener(self.event_store.write)
+        return lobby
+
+    def delete_lobby(self, pin: str) -> Optional[Lobby]:
+        """Delete a lobby, recording the deletion in its event log."""
+        lobby = self.lobbies.pop(pin, None)
+        if lobby:
+            lobby.delete()
+            usage_meter.forget(pin)
         return lobby
 
+    def restore_lobbies(self) -> int:
+        """
+        Rebuild lobbies from the on-disk event store by replaying their logs.
+
+        Returns:
+            Number of lobbies restored
+        """
+        if not self.event_store:
+            return 0
+
+        restored = 0
+        for pin in self.event_store.pins():
+            if pin in self.lobbies:
+                continue
+            events = self.event_store.read(pin)
+            if not events:
+                continue
+            try:
+                lobby = Lobby.from_events(events)
+            except (KeyError, ValueError) as e:
+                logger.error(f"Could not replay event log for lobby {pin}: {str(e)}")
+                continue
+            if lobby.deleted:
+                continue
+            self.lobbies[pin] = lobby
+            lobby.events.add_listener(self.event_store.write)
+            restored += 1
+
+        logger.info(f"Restored {restored} lobbies from the event log")
+        return restored
+
     def get_lobby(self, pin: str) -> Optional[Lobby]:
         """Get an existing lobby by PIN."""
         return self.lobbies.get(pin)
@@ -68,33 +133,47 @@ class GameMasterAgent:
 
         Returns:
             Dict with response and question details
+
+        Raises:
+            ValueError: If the lobby or user does not exist
+            ServiceDraining: If the server is shutting down
+            RateLimited: If the user or the lobby is asking too fast
+            TokenBudgetExceeded: If the lobby has used up its token budget
         """
+        lifecycle.admit()
+
         lobby = self.get_lobby(pin)
         if not lobby:
             raise ValueError("Invalid lobby PIN")
 
         # Get the user (participant or host)
-        user = lobby.get_participant(user_id)
-        if not user and lobby.host.user_id == user_id:
-            user = lobby.host
-        
+        user = lobby.get_user(user_id)
         if not user:
             raise ValueError("User not found in lobby")
 
+        question_limiter.acquire(pin, user_id)
+
         # Create a new question object
         question = Question(
             message=question_text,
             user_id=user_id
         )
 
-        # Get response from agent using the lobby's secret concept
-        response = await self.agent.chat(question_text, lobby.secret_concept)
+        # Reuse the answer of a near-duplicate asked earlier in the lobby, or ask the agent
+        response = question_reuse.lookup(lobby, question_text)
+        if response is None:
+            usage_meter.check_budget(pin)
+            response = await self.answerer.chat(
+                question_text, lobby.secret_concept, pin=pin, user_id=user_id,
+                conflicts=self._conflict_check(lobby, question_text)
+            )
+            question_reuse.remember(lobby, question_text, response)
 
         # Set the answer
         question.set_answer(response)
 
-        # Add question to user's question list
-        user.add_question(question)
+        # Record the question in the lobby's event log and the user's question list
+        lobby.add_question(user_id, question)
 
         return {
             "question_id": question.question_id,
@@ -102,6 +181,94 @@ class GameMasterAgent:
             "message": question_text
         }
 
+    def _conflict_check(self, lobby: Lobby, question_text: str) -> Callable[[str], bool]:
+        """Whether an answer to `question_text` contradicts a similar question answered earlier in the lobby."""
+        return lambda answer: question_reuse.conflicts(
+            lobby, question_text, answer, settings.QUESTION_CONFLICT_THRESHOLD
+        )
+
+    def submit_question(
+        self,
+        pin: str,
+        user_id: str,
+        question_text: str,
+        idempotency_key: Optional[str] = None
+    ) -> Tuple[Question, bool]:
+        """
+        Record a question to be answered later by `answer_question`.
+
+        Args:
+            pin: Lobby PIN
+            user_id: User ID of the person asking the question
+            question_text: The question text
+            idempotency_key: Optional client key; resubmitting with the same key
+                returns the original question instead of creating a new one,
+                unless that question failed, in which case it is asked again
+
+        Returns:
+            Tuple of (question, created) - created is False for a resubmission
+
+        Raises:
+            ValueError: If the lobby or user does not exist
+            ServiceDraining: If the server is shutting down
+            RateLimited: If the user or the lobby is asking too fast
+            TokenBudgetExceeded: If the lobby has used up its token budget
+        """
+        lobby = self.get_lobby(pin)
+        if not lobby:
+            raise ValueError("Invalid lobby PIN")
+
+        if idempotency_key:
+            existing = lobby.find_idempotent_question(user_id, idempotency_key)
+            if existing:
+                return existing, False
+
+        lifecycle.admit()
+        if not lobby.get_user(user_id):
+            raise ValueError("User not found in lobby")
+        question_limiter.acquire(pin, user_id)
+        usage_meter.check_budget(pin)
+
+        question = Question(message=question_text, user_id=user_id)
+        lobby.submit_question(user_id, question, idempotency_key=idempotency_key)
+        return question, True
+
+    async def answer_question(self, pin: str, user_id: str, question_id: str) -> Optional[str]:
+        """
+        Ask the agent for the answer to a submitted question and record it.
+
+        Failures are recorded on the question (status "failed") rather than raised.
+
+        Returns:
+            The answer, or None if the question could not be answered
+        """
+        lobby = self.get_lobby(pin)
+        user = lobby.get_user(user_id) if lobby else None
+        question = user.get_question(question_id) if user else None
+        if not question or question.answer is not None:
+            return question.answer if question else None
+
+        try:
+            response = question_reuse.lookup(lobby, question.message)
+            if response is None:
+                usage_meter.check_budget(pin)
+                response = await self.answerer.chat(
+                    question.message, lobby.secret_concept, pin=pin, user_id=user_id, route="question_async",
+                    conflicts=self._conflict_check(lobby, question.message)
+                )
+                question_reuse.remember(lobby, question.message, response)
+        except Exception as e:
+            logger.error("Error answering question %s in lobby %s: %s", question_id, pin, e, extra={"pin": pin})
+            lobby.fail_question(user_id, question_id, str(e))
+            return None
+
+        try:
+            lobby.answer_question(user_id, question_id, response)
+        except ValueError:
+            # The user left the lobby while the question was being answered
+            return None
+        return response
+
     def get_leaderboard(self, pin: str) -> Optional[list[dict]]:
         """
         Get the leaderboard for a lobby.
@@ -116,7 +283,10 @@ class GameMasterAgent:
         lobby = self.get_lobby(pin)
         if not lobby:
             return None
+        return self.rank_users(lobby)
 
+    def rank_users(self, lobby: Lobby) -> list[dict]:
+        """Rank the host and participants of a lobby in leaderboard order (see `get_leaderboard`)."""
         # Collect all users (host + participants)
         all_users = [lobby.host] + list(lobby.participants.values())
 
@@ -124,9 +294,10 @@ class GameMasterAgent:
         others = []
 
         for user in all_users:
-            questions = user.get_all_questions()
-            has_correct = any(q.answer == "CORRECT" for q in questions)
-            total_questions = len(questions)
+            # Only answered questions count: pending and failed async ones have no answer yet
+            answers = [q.answer for q in user.get_all_questions() if q.answer is not None]
+            has_correct = "CORRECT" in answers
+            total_questions = len(answers)
             
             entry = {
                 "user_id": user.user_id,
@@ -138,7 +309,7 @@ class GameMasterAgent:
             if has_correct:
                 winners.append(entry)
             else:
-                yes_count = sum(1 for q in questions if q.answer == "Yes")
+                yes_count = answers.count("Yes")
                 # Store tuple for sorting: (yes_count, entry)
                 others.append((yes_count, entry))
 
@@ -160,3 +331,21 @@ class GameMasterAgent:
 # Global instance - import this in your routes
 game_master = GameMasterAgent()
 
+
+def _lobby_gauges() -> Dict[tuple, int]:
+    users = sum(1 + len(lobby.participants) for lobby in game_master.lobbies.values())
+    return {("lobbies",): len(game_master.lobbies), ("users",): users}
+
+
+def _question_gauges() -> Dict[tuple, int]:
+    counts = {(Question.PENDING,): 0, (Question.ANSWERED,): 0, (Question.FAILED,): 0}
+    for lobby in game_master.lobbies.values():
+        for user in [lobby.host, *lobby.participants.values()]:
+            for question in user.get_all_questions():
+                counts[(question.status,)] += 1
+    return counts
+
+
+# Read on scrape, so keeping them current costs nothing on the request path
+metrics.gauge("game_active", "Active lobbies and the users in them", _lobby_gauges, ("kind",))
+metrics.gauge("game_questions", "Questions in active lobbies by status", _question_gauges, ("status",))
@@ -1,38 +1,204 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain.schema import HumanMessage, SystemMessage
 from app.core.config import settings
+from app.core.lifecycle import lifecycle
+from app.core.metrics import metrics
+from app.core.profiling import record_wait
 from app.GeminiUtils import PromptsEngineering
-from typing import Dict, Optional
+from app.services.UsageMeter import usage_meter
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+import asyncio
+import json
 import logging
+import re
+import time
 
 logger = logging.getLogger(__name__)
 
+# Answers the game master is allowed to give; anything else is counted as "other"
+ALLOWED_RESPONSES = ["Yes", "No", "I don't know", "Off-topic", "Invalid question", "CORRECT"]
+
+LLM_LATENCY = metrics.histogram(
+    "llm_request_duration_seconds", "Upstream LLM call latency", ("operation",)
+)
+LLM_ERRORS = metrics.counter(
+    "llm_errors_total", "Failed upstream LLM calls by exception class", ("operation", "error")
+)
+ANSWERS = metrics.counter(
+    "game_answers_total", "Game master answers by normalized answer", ("answer",)
+)
+LLM_FIRST_CHUNK = metrics.histogram(
+    "llm_first_chunk_seconds", "Time from a streaming LLM call to its first chunk", ("operation",)
+)
+STREAMS_ABANDONED = metrics.counter(
+    "llm_streams_abandoned_total", "Streaming LLM calls stopped early because the client went away"
+)
+TIER_LATENCY = metrics.histogram(
+    "llm_tier_request_duration_seconds", "Game question LLM call latency by model tier", ("tier",)
+)
+ESCALATIONS = metrics.counter(
+    "llm_escalations_total", "Fast-tier answers re-asked of the strong model, by reason", ("reason",)
+)
+
+# An allowed response as a whole phrase, longest first: "I don't know" contains "no"
+_ANSWER = re.compile(
+    r"(?<![\w-])(" + "|".join(re.escape(a) for a in sorted(ALLOWED_RESPONSES, key=len, reverse=True)) + r")(?![\w-])",
+    re.IGNORECASE
+)
+_CANONICAL = {answer.lower(): answer for answer in ALLOWED_RESPONSES}
+
+
+def parse_answer(text: str) -> Optional[str]:
+    """The first allowed response in a model reply, or None if it contains none."""
+    match = _ANSWER.search(text.replace("\u2019", "'"))
+    return _CANONICAL[match.group(1).lower()] if match else None
+
+
+_CODE_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+
+def parse_batch_answers(text: str, count: int) -> List[Optional[str]]:
+    """
+    Answers from a batched response (a JSON object of question number to answer).
+
+    Returns:
+        `count` answers in question order; None where the answer is missing or not an allowed response
+    """
+    try:
+        data = json.loads(_CODE_FENCE.sub("", text.strip()))
+    except ValueError:
+        data = None
+    if not isinstance(data, dict):
+        logger.warning("Batched answers are not a JSON object: %.200s", text)
+        return [None] * count
+
+    return [_CANONICAL.get(str(data.get(str(i), "")).strip().strip("\".").lower()) for i in range(1, count + 1)]
+
+
+def preload() -> None:
+    """
+    Import the LangChain modules the agent needs (about half a second).
+
+    They are imported lazily so `import app.main` stays cheap; call this
+    off the event loop at startup so the first question doesn't stall every
+    request in flight while they load.
+    """
+    import langchain_core.messages  # noqa: F401
+    import langchain_google_genai  # noqa: F401
+
+
+def _chat_model(model: str):
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+    return ChatGoogleGenerativeAI(
+        model=model,
+        google_api_key=settings.GOOGLE_API_KEY,
+        temperature=0.1,  # Low temperature for consistent responses
+        convert_system_message_to_human=True
+    )
+
 
 class GeminiAgent:
-    """LangChain agent powered by Google Gemini."""
+    """
+    LangChain agent powered by Google Gemini.
 
-    def __init__(self, system_prompt: Optional[str] = None):
-        """Initialize the Gemini agent with LangChain."""
-        self.llm = ChatGoogleGenerativeAI(
-            model=settings.GEMINI_MODEL,
-            google_api_key=settings.GOOGLE_API_KEY,
-            temperature=0.1,  # Low temperature for consistent responses
-            convert_system_message_to_human=True
-        )
+    When GEMINI_FAST_MODEL is set, game questions go to that (cheaper,
+    faster) model first and are re-asked of GEMINI_MODEL when the fast call
+    fails, or its answer is not an allowed response, is "I don't know", or
+    contradicts an earlier answer in the lobby. Everything else always uses GEMINI_MODEL.
+    """
 
+    def __init__(self, system_prompt: Optional[str] = None):
+        """Initialize the Gemini agent; the LangChain clients are created on first use."""
+        self._llm = None
+        self._fast_llm = None
         self.system_prompt = PromptsEngineering.default_system_prompt()
 
-    async def chat(self, user_message: str, secret_word: Optional[str] = None) -> str:
+    @property
+    def llm(self):
+        """The LangChain chat model, built lazily so importing the app stays cheap."""
+        if self._llm is None:
+            self._llm = _chat_model(settings.GEMINI_MODEL)
+        return self._llm
+
+    @property
+    def fast_llm(self):
+        """The fast-tier chat model, or None when tiered routing is off."""
+        if not settings.GEMINI_FAST_MODEL:
+            return None
+        if self._fast_llm is None:
+            self._fast_llm = _chat_model(settings.GEMINI_FAST_MODEL)
+        return self._fast_llm
+
+    async def _invoke(
+        self,
+        messages: list,
+        operation: str,
+        route: str,
+        pin: Optional[str] = None,
+        user_id: Optional[str] = None,
+        shared: Optional[List[Tuple[str, Optional[str], Optional[str]]]] = None,
+        llm=None
+    ):
+        """
+        Call the model (`llm`, default the strong one), counting the call as in-flight
+        and recording its latency, errors and token usage.
+
+        The usage is metered under `route`, `pin` and `user_id`, or split
+        between the (route, pin, user_id) callers in `shared` for a batch.
+        """
+        started = time.perf_counter()
+        try:
+            async with lifecycle.track():
+                response = await (llm or self.llm).ainvoke(messages)
+            usage_metadata = getattr(response, "usage_metadata", None)
+            if shared:
+                usage_meter.record_shared(usage_metadata, shared)
+            else:
+                usage_meter.record(route, usage_metadata, pin, user_id)
+            return response
+        except Exception as e:
+            LLM_ERRORS.inc(operation, type(e).__name__)
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            LLM_LATENCY.observe(elapsed, operation)
+            record_wait("llm", elapsed)
+
+    async def _ask(self, messages: list, tier: str, llm, route: str, pin: Optional[str], user_id: Optional[str]):
+        """Ask one tier a game question; returns (allowed answer or None, raw reply text)."""
+        started = time.perf_counter()
+        try:
+            response = await self._invoke(messages, "chat", route, pin, user_id, llm=llm)
+        finally:
+            TIER_LATENCY.observe(time.perf_counter() - started, tier)
+        text = response.content.strip()
+        return parse_answer(text), text
+
+    async def chat(
+        self,
+        user_message: str,
+        secret_word: Optional[str] = None,
+        pin: Optional[str] = None,
+        user_id: Optional[str] = None,
+        route: str = "question",
+        conflicts: Optional[Callable[[str], bool]] = None
+    ) -> str:
         """
         Send a message to the Gemini agent and get a response.
 
         Args:
             user_message: The user's question
             secret_word: The secret word for the game (optional)
+            pin: Lobby the question is asked in, for token metering (optional)
+            user_id: User asking the question, for token metering (optional)
+            route: What the call is metered under, e.g. "question" or "question_async"
+            conflicts: Whether an answer contradicts earlier ones in the lobby;
+                a fast-tier answer that does is re-asked of the strong model (optional)
 
         Returns:
             The agent's response (one of the allowed responses)
         """
+        from langchain_core.messages import HumanMessage, SystemMessage
+
         try:
             # Build the full prompt with secret word context
             system_context = self.system_prompt
@@ -44,53 +210,185 @@ class GeminiAgent:
                 HumanMessage(content=user_message)
             ]
 
-            response = await self.llm.ainvoke(messages)
-
-            # Extract and clean the response
-            response_text = response.content.strip()
+            fast_llm = self.fast_llm
+            if fast_llm is not None:
+                try:
+                    answer, response_text = await self._ask(messages, "fast", fast_llm, route, pin, user_id)
+                except Exception as e:
+                    # A failing fast tier (timeout, quota, 5xx) must not fail a question the strong one can answer
+                    logger.warning("Fast model failed in lobby %s: %s", pin, e, extra={"pin": pin})
+                    answer, response_text = None, None
+                if response_text is None:
+                    reason = "error"
+                elif answer is None:
+                    reason = "unparseable"
+                elif answer == "I don't know":
+                    reason = "unsure"
+                elif conflicts is not None and conflicts(answer):
+                    reason = "conflict"
+                else:
+                    ANSWERS.inc(answer)
+                    return answer
+                ESCALATIONS.inc(reason)
+                logger.info("Escalating question in lobby %s to the strong model (%s)", pin, reason, extra={"pin": pin})
 
-            # Validate response is one of the allowed responses
-            allowed_responses = ["Yes", "No", "I don't know", "Off-topic", "Invalid question", "CORRECT"]
+            answer, response_text = await self._ask(messages, "strong", self.llm, route, pin, user_id)
+            if answer is not None:
+                ANSWERS.inc(answer)
+                return answer
 
-            # Clean up response (remove any extra punctuation or text)
-            for allowed in allowed_responses:
-                if allowed.lower() in response_text.lower():
-                    return allowed
-
-            # If no exact match, return the raw response (fallback)
-            logger.warning(f"Agent returned non-standard response: {response_text}")
+            # If no allowed response, return the raw response (fallback)
+            ANSWERS.inc("other")
+            logger.warning("Agent returned non-standard response: %s", response_text)
             return response_text
 
         except Exception as e:
             logger.error(f"Error in Gemini agent chat: {str(e)}")
             raise
 
-    async def simple_chat(self, user_message: str, system_prompt: Optional[str] = None) -> str:
+    async def answer_batch(
+        self,
+        questions: List[str],
+        secret_word: str,
+        pin: Optional[str] = None,
+        route: str = "precompute"
+    ) -> List[Optional[str]]:
+        """
+        Answer several questions about the secret word in one structured call.
+
+        Args:
+            questions: The questions, answered independently of each other
+            secret_word: The secret word for the game
+            pin: Lobby the questions are asked for, for token metering (optional)
+            route: What the call is metered under
+
+        Returns:
+            Answers in question order; None where the model gave no allowed response
+        """
+        from langchain_core.messages import HumanMessage, SystemMessage
+
+        messages = [
+            SystemMessage(content=self.system_prompt.replace("{{SECRET_WORD}}", secret_word)),
+            HumanMessage(content=PromptsEngineering.batch_questions_prompt(questions))
+        ]
+        response = await self._invoke(messages, "answer_batch", route, pin)
+        return parse_batch_answers(response.content, len(questions))
+
+    async def answer_games(
+        self,
+        items: List[Tuple[str, str]],
+        parties: List[Tuple[str, Optional[str], Optional[str]]]
+    ) -> List[Optional[str]]:
+        """
+        Answer questions from several games, each about its own secret word, in one structured call.
+
+        Args:
+            items: (question, secret word) pairs
+            parties: (route, pin, user_id) of each question, for token metering
+
+        Returns:
+            Answers in item order; None where the model gave no allowed response
+        """
+        from langchain_core.messages import HumanMessage, SystemMessage
+
+        messages = [
+            SystemMessage(content=self.system_prompt.replace("{{SECRET_WORD}}", "given with each question below")),
+            HumanMessage(content=PromptsEngineering.multi_game_batch_prompt(
+                [(secret_word, question) for question, secret_word in items]
+            ))
+        ]
+        response = await self._invoke(messages, "chat_batch", "batch", shared=parties)
+        answers = parse_batch_answers(response.content, len(items))
+        for answer in answers:
+            if answer is not None:
+                ANSWERS.inc(answer)
+        return answers
+
+    async def simple_chat(
+        self,
+        user_message: str,
+        system_prompt: Optional[str] = None,
+        route: str = "chat"
+    ) -> str:
         """
         Simple chat without game rules - for general Gemini API usage.
 
         Args:
             user_message: The user's message
             system_prompt: Optional system prompt override
+            route: What the call is metered under
 
         Returns:
             The model's response
         """
+        from langchain_core.messages import HumanMessage, SystemMessage
+
         try:
             messages = [
                 SystemMessage(content=system_prompt or "You are a helpful AI assistant."),
                 HumanMessage(content=user_message)
             ]
 
-            response = await self.llm.ainvoke(messages)
+            response = await self._invoke(messages, "simple_chat", route)
             return response.content.strip()
 
         except Exception as e:
             logger.error(f"Error in simple chat: {str(e)}")
             raise
 
+    async def stream_chat(
+        self,
+        user_message: str,
+        system_prompt: Optional[str] = None,
+        route: str = "chat_stream"
+    ) -> AsyncIterator[str]:
+        """
+        Simple chat like `simple_chat`, yielding the reply in chunks as the model generates it.
 
+        Closing the iterator early, or cancelling the task consuming it,
+        closes the upstream stream, so no more tokens are generated for a
+        client that has gone away. Tokens streamed until then are metered.
 
+        Args:
+            user_message: The user's message
+            system_prompt: Optional system prompt override
+            route: What the call is metered under
 
+        Yields:
+            Text chunks of the model's response
+        """
+        from langchain_core.messages import HumanMessage, SystemMessage
 
-
+        messages = [
+            SystemMessage(content=system_prompt or "You are a helpful AI assistant."),
+            HumanMessage(content=user_message)
+        ]
+        usage = {"input_tokens": 0, "output_tokens": 0}
+        started = time.perf_counter()
+        first_chunk = True
+        stream = self.llm.astream(messages)
+        try:
+            async with lifecycle.track():
+                async for chunk in stream:
+                    if first_chunk:
+                        LLM_FIRST_CHUNK.observe(time.perf_counter() - started, "stream_chat")
+                        first_chunk = False
+                    # Gemini reports usage as per-chunk increments
+                    chunk_usage = getattr(chunk, "usage_metadata", None) or {}
+                    for kind in usage:
+                        usage[kind] += int(chunk_usage.get(kind) or 0)
+                    if isinstance(chunk.content, str) and chunk.content:
+                        yield chunk.content
+        except (asyncio.CancelledError, GeneratorExit):
+            STREAMS_ABANDONED.inc()
+            raise
+        except Exception as e:
+            LLM_ERRORS.inc("stream_chat", type(e).__name__)
+            logger.error(f"Error in streaming chat: {str(e)}")
+            raise
+        finally:
+            await stream.aclose()
+            usage_meter.record(route, usage)
+            elapsed = time.perf_counter() - started
+            LLM_LATENCY.observe(elapsed, "stream_chat")
+            record_wait("llm", elapsed)
@@ -0,0 +1,142 @@
+"""
+Lobby Snapshots - Pre-serialized lobby info for the polling hot path
+"""
+from typing import Callable, Dict, List, Tuple
+import json
+import logging
+from app.models.event import LobbyEvent, LobbyEventLog, LobbyEventType
+from app.models.lobby import Lobby
+from app.schemas.lobby import LobbyInfo, ParticipantDetail, QuestionInfo
+
+logger = logging.getLogger(__name__)
+
+HOST = "host"
+PARTICIPANT = "participant"
+LEADERBOARD = "leaderboard"
+
+
+def build_lobby_info(lobby: Lobby, is_host: bool) -> LobbyInfo:
+    """
+    Build the LobbyInfo a viewer is allowed to see.
+
+    Secret concept, context, questions and participant details are only included for the host.
+    """
+    questions = []
+    participants_details = []
+    if is_host:
+        # Collect participants details
+        participants_details = [
+            ParticipantDetail(user_id=p.user_id, name=p.name)
+            for p in lobby.participants.values()
+        ]
+
+        # Collect questions from all participants, and the host's own if any
+        for user in list(lobby.participants.values()) + [lobby.host]:
+            for q in user.get_all_questions():
+                questions.append(QuestionInfo(
+                    question_id=q.question_id,
+                    user_id=user.user_id,
+                    user_name=user.name,
+                    question=q.message,
+                    answer=q.answer,
+                    timestamp=q.timestamp.timestamp() * 1000
+                ))
+
+        questions.sort(key=lambda x: x.timestamp)
+
+    return LobbyInfo(
+        pin=lobby.pin,
+        host_name=lobby.host.name,
+        participants=lobby.get_participant_names(),
+        topic=lobby.topic,
+        timelimit=lobby.timelimit,
+        start_time=lobby.start_time.isoformat() if lobby.start_time else None,
+        secret_concept=lobby.secret_concept if is_host else None,
+        context=lobby.context if is_host else None,
+        questions=questions if is_host else None,
+        participants_details=participants_details if is_host else None
+    )
+
+
+class LobbySnapshotCache:
+    """
+    Serialized lobby views per lobby, valid for one lobby version.
+
+    Every participant sees the same lobby info, so two entries per lobby
+    (host and participant) serve all polls; the leaderboard is shared by
+    everyone and cached alongside them. Entries are dropped as soon as the
+    lobby's event log records a mutation, and are also checked against the
+    log and its version on read.
+    """
+
+    def __init__(self):
+        # key: pin, value: {view: (event log, version, JSON bytes)}
+        self._entries: Dict[str, Dict[str, Tuple[LobbyEventLog, int, bytes]]] = {}
+        self._watched: Dict[str, LobbyEventLog] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _watch(self, lobby: Lobby) -> None:
+        """Invalidate a lobby's entries whenever its event log grows."""
+        if self._watched.get(lobby.pin) is lobby.events:
+            return
+
+        pin = lobby.pin
+
+        def invalidate(event: LobbyEvent) -> None:
+            self._entries.pop(pin, None)
+            if event.type == LobbyEventType.LOBBY_DELETED:
+                self._watched.pop(pin, None)
+
+        lobby.events.add_listener(invalidate)
+        self._watched[pin] = lobby.events
+
+    def _cached(self, lobby: Lobby, view: str, build: Callable[[], bytes]) -> bytes:
+        cached = self._entries.get(lobby.pin, {}).get(view)
+        if cached is not None and cached[0] is lobby.events and cached[1] == lobby.version:
+            self.hits += 1
+            return cached[2]
+
+        self.misses += 1
+        body = build()
+        self._watch(lobby)
+        self._entries.setdefault(lobby.pin, {})[view] = (lobby.events, lobby.version, body)
+        return body
+
+    def get(self, lobby: Lobby, is_host: bool) -> bytes:
+        """
+        Get the serialized LobbyInfo for a viewer, building it on a miss.
+
+        Args:
+            lobby: The lobby
+            is_host: Whether the viewer is the host
+
+        Returns:
+            UTF-8 JSON bytes of LobbyInfo
+        """
+        return self._cached(
+            lobby,
+            HOST if is_host else PARTICIPANT,
+            lambda: build_lobby_info(lobby, is_host).model_dump_json().encode("utf-8")
+        )
+
+    def leaderboard(self, lobby: Lobby, rank: Callable[[Lobby], List[dict]]) -> bytes:
+        """
+        Get the serialized leaderboard entries of a lobby, building them on a miss.
+
+        Args:
+            lobby: The lobby
+            rank: Function returning the ranked leaderboard entries of a lobby
+
+        Returns:
+            UTF-8 JSON bytes of the list of leaderboard entries
+        """
+        return self._cached(
+            lobby,
+            LEADERBOARD,
+            lambda: json.dumps(rank(lobby), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        )
+
+
+# Global instance - import this in your routes
+lobby_snapshots = LobbySnapshotCache()
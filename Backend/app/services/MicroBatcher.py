@@ -0,0 +1,144 @@
+"""
+Micro Batcher - Answer questions from many lobbies in one LLM call
+"""
+import asyncio
+import logging
+from typing import Callable, List, Optional
+from app.core.metrics import metrics
+from app.services.GeminiAgent import GeminiAgent
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = metrics.histogram(
+    "llm_batch_size", "Questions answered per micro-batch call",
+    buckets=(1, 2, 4, 8, 16, 32, 64)
+)
+BATCH_FALLBACKS = metrics.counter(
+    "llm_batch_fallbacks_total", "Batched questions re-asked on their own, by reason", ("reason",)
+)
+
+
+class _Pending:
+    """A question waiting for its batch, and the future its caller awaits."""
+
+    __slots__ = ("question", "secret_word", "pin", "user_id", "route", "conflicts", "future")
+
+    def __init__(
+        self,
+        question: str,
+        secret_word: str,
+        pin: Optional[str],
+        user_id: Optional[str],
+        route: str,
+        conflicts: Optional[Callable[[str], bool]]
+    ):
+        self.question = question
+        self.secret_word = secret_word
+        self.pin = pin
+        self.user_id = user_id
+        self.route = route
+        self.conflicts = conflicts
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+
+
+class MicroBatcher:
+    """
+    Collects questions for up to `window` seconds (or `max_batch` questions) and asks them together.
+
+    Drop-in for GeminiAgent.chat. The first question of a batch starts the
+    window; the batch is sent when the window closes or it reaches
+    `max_batch`, whichever is first. Questions from different lobbies, each
+    with its own secret concept, share one structured request (see
+    GeminiAgent.answer_games) and its tokens are split evenly between them.
+    A batch of one, any question the batched answer did not cover, and every
+    question of a batch whose call failed, is asked on its own, so callers
+    always get a normal chat answer.
+
+    Every question in a batch waits for the window and for the slowest part
+    of the batched response: this trades per-question latency for fewer
+    upstream calls and a shared system prompt. It also puts several lobbies'
+    secret concepts into one prompt, which is why it is off by default. See
+    benchmarks/bench_batching.py for the trade-off with the fake backend.
+    """
+
+    def __init__(self, agent: GeminiAgent, window: float, max_batch: int):
+        self.agent = agent
+        self.window = window
+        self.max_batch = max(max_batch, 1)
+        self._pending: List[_Pending] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+
+    async def chat(
+        self,
+        user_message: str,
+        secret_word: Optional[str] = None,
+        pin: Optional[str] = None,
+        user_id: Optional[str] = None,
+        route: str = "question",
+        conflicts: Optional[Callable[[str], bool]] = None
+    ) -> str:
+        """
+        Answer a question, batched with any others asked within the window.
+
+        Args and return value are those of GeminiAgent.chat. Batched answers
+        come from the strong model, so `conflicts` only applies to questions
+        asked on their own.
+        """
+        if not secret_word:
+            return await self.agent.chat(user_message, secret_word, pin, user_id, route, conflicts)
+
+        item = _Pending(user_message, secret_word, pin, user_id, route, conflicts)
+        self._pending.append(item)
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.window, self._flush)
+        return await item.future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.create_task(self._send(batch), name="llm-micro-batch")
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch: List[_Pending]) -> None:
+        BATCH_SIZE.observe(len(batch))
+        answers: List[Optional[str]] = [None] * len(batch)
+        if len(batch) > 1:
+            try:
+                answers = await self.agent.answer_games(
+                    [(item.question, item.secret_word) for item in batch],
+                    [(item.route, item.pin, item.user_id) for item in batch]
+                )
+            except Exception as e:
+                # One bad batch must not fail questions from unrelated lobbies: ask each on its own
+                logger.warning("Micro-batch of %d questions failed, asking them one by one: %s", len(batch), e)
+                BATCH_FALLBACKS.inc("batch_failed", amount=len(batch))
+                await asyncio.gather(*(self._ask_alone(item) for item in batch))
+                return
+
+        missing = [item for item, answer in zip(batch, answers) if answer is None]
+        if missing and len(batch) > 1:
+            BATCH_FALLBACKS.inc("unanswered", amount=len(missing))
+        for item, answer in zip(batch, answers):
+            if answer is not None and not item.future.done():
+                item.future.set_result(answer)
+        await asyncio.gather(*(self._ask_alone(item) for item in missing))
+
+    async def _ask_alone(self, item: _Pending) -> None:
+        try:
+            answer = await self.agent.chat(
+                item.question, item.secret_word, item.pin, item.user_id, item.route, item.conflicts
+            )
+        except Exception as e:
+            if not item.future.done():
+                item.future.set_exception(e)
+            return
+        if not item.future.done():
+            item.future.set_result(answer)
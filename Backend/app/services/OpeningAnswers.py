@@ -0,0 +1,141 @@
+"""
+Opening Answers - Precompute the answers to common opening questions while a lobby fills up
+"""
+import asyncio
+import logging
+from typing import Dict, List
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.models.lobby import Lobby
+from app.services.GameMasterAgent import GameMasterAgent, game_master
+from app.services.QuestionReuse import QuestionReuseCache, question_reuse
+from app.services.UsageMeter import TokenBudgetExceeded, usage_meter
+
+logger = logging.getLogger(__name__)
+
+# The questions players most often open with, whatever the concept
+OPENING_QUESTIONS = [
+    "Is it alive?",
+    "Is it a living thing?",
+    "Is it an animal?",
+    "Is it a mammal?",
+    "Is it a plant?",
+    "Is it a person?",
+    "Is it a real person?",
+    "Is it a fictional character?",
+    "Are you human?",
+    "Is it a place?",
+    "Is it a country?",
+    "Is it an object?",
+    "Is it man-made?",
+    "Is it food?",
+    "Can you eat it?",
+    "Is it bigger than a breadbox?",
+    "Is it bigger than a person?",
+    "Can you hold it in your hand?",
+    "Is it found indoors?",
+    "Is it found outdoors?",
+    "Does it use electricity?",
+    "Is it a machine?",
+    "Is it a vehicle?",
+    "Is it a tool?",
+    "Is it made of metal?",
+    "Is it made of wood?",
+    "Does it live in water?",
+    "Can it fly?",
+    "Is it famous?",
+    "Is it an idea or concept?",
+    "Is it a sport or activity?",
+    "Is it used every day?",
+]
+
+OPENING_RUNS = metrics.counter(
+    "opening_answers_runs_total", "Opening-question precomputations by outcome", ("result",)
+)
+
+
+class OpeningAnswers:
+    """
+    Background precomputation of the answers to OPENING_QUESTIONS for each lobby.
+
+    Started when a lobby is created, and again when the host changes the
+    secret concept or context at start. One batched LLM call answers the
+    whole list; the answers are added to the lobby's near-duplicate index,
+    so a matching question asked during the game is answered from it
+    without an upstream call. Answers computed for a concept the lobby no
+    longer has are discarded.
+    """
+
+    def __init__(self, master: GameMasterAgent, reuse: QuestionReuseCache, questions: List[str]):
+        self.master = master
+        self.reuse = reuse
+        self.questions = questions
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def schedule(self, lobby: Lobby) -> None:
+        """Start (or restart, for a changed concept) the precomputation for a lobby."""
+        if not self.reuse.threshold or not self.questions:
+            return
+        pin = lobby.pin
+        self.cancel(pin)
+        task = asyncio.create_task(self._run(lobby), name=f"opening-answers-{pin}")
+        self._tasks[pin] = task
+
+        def forget(done: asyncio.Task) -> None:
+            if self._tasks.get(pin) is done:
+                del self._tasks[pin]
+
+        task.add_done_callback(forget)
+
+    def cancel(self, pin: str) -> None:
+        """Stop a lobby's precomputation, if one is running."""
+        task = self._tasks.pop(pin, None)
+        if task is not None:
+            task.cancel()
+
+    async def _run(self, lobby: Lobby) -> None:
+        key = (lobby.secret_concept, lobby.context)
+        try:
+            usage_meter.check_budget(lobby.pin)
+            answers = await self.master.agent.answer_batch(self.questions, lobby.secret_concept, pin=lobby.pin)
+        except asyncio.CancelledError:
+            OPENING_RUNS.inc("cancelled")
+            raise
+        except TokenBudgetExceeded:
+            OPENING_RUNS.inc("over_budget")
+            return
+        except Exception as e:
+            OPENING_RUNS.inc("failed")
+            logger.warning("Could not precompute opening answers for lobby %s: %s", lobby.pin, e, extra={"pin": lobby.pin})
+            return
+
+        if lobby.deleted or (lobby.secret_concept, lobby.context) != key:
+            OPENING_RUNS.inc("stale")
+            return
+
+        stored = 0
+        for question, answer in zip(self.questions, answers):
+            if answer is not None:
+                self.reuse.remember(lobby, question, answer)
+                stored += 1
+        OPENING_RUNS.inc("ok")
+        logger.info(
+            "Precomputed %d of %d opening answers for lobby %s", stored, len(self.questions), lobby.pin,
+            extra={"pin": lobby.pin, "stored": stored}
+        )
+
+    async def stop(self) -> None:
+        """Cancel every running precomputation (on shutdown)."""
+        tasks = list(self._tasks.values())
+        self._tasks.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+# Global instance - import this in your routes
+opening_answers = OpeningAnswers(
+    game_master,
+    question_reuse,
+    OPENING_QUESTIONS if settings.OPENING_ANSWERS_ENABLED else []
+)
@@ -2,26 +2,380 @@
 QR Code Service - Generate QR codes from URLs/links
 """
 import qrcode
+from collections import OrderedDict, deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from io import BytesIO
+from typing import AsyncIterator, Deque, Dict, List, Optional, Tuple
+import asyncio
 import base64
+import csv
+import functools
+import io
+import hashlib
+import html
 import logging
+import struct
+import threading
+import time
+import zipfile
+import zlib
+from app.core.config import settings
+from app.core.logs import setup_worker_logging
+from app.core.metrics import metrics
 
 logger = logging.getLogger(__name__)
 
+QR_RENDER_TIME = metrics.histogram(
+    "qr_render_duration_seconds", "Time to render an uncached QR code", ("format",)
+)
+
+
+def qr_etag(key: str) -> str:
+    """Strong ETag for a cache key - the key is a hash of every render input, so it identifies the bytes."""
+    return f'"{key}"'
+
+
+class RenderedQR:
+    """A rendered QR code (PNG or SVG) in every form the API serves."""
+
+    __slots__ = ("key", "content", "media_type", "base64", "data_url")
+
+    def __init__(self, key: str, content: bytes, media_type: str = "image/png"):
+        self.key = key
+        self.content = content
+        self.media_type = media_type
+        self.base64 = base64.b64encode(content).decode('utf-8')
+        self.data_url = f"data:{media_type};base64,{self.base64}"
+
+    @property
+    def etag(self) -> str:
+        return qr_etag(self.key)
+
+
+class QRCache:
+    """
+    Bounded LRU cache of rendered QR codes, keyed by a content hash of the render inputs.
+
+    Thread-safe, so renders may happen off the event loop.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, RenderedQR]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(link: str, fill_color: str, back_color: str, box_size: int, border: int, image_format: str = "png") -> str:
+        """Content-addressed key: SHA-256 of every input that affects the image, the PNG rasterizer included."""
+        rasterizer = settings.QR_RASTERIZER if image_format == "png" else ""
+        raw = "\x00".join((image_format, rasterizer, link, fill_color, back_color, str(box_size), str(border)))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[RenderedQR]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def peek(self, key: str) -> Optional[RenderedQR]:
+        """Look up an entry without counting a hit or miss or refreshing its recency."""
+        with self._lock:
+            return self._entries.get(key)
+
+    def put(self, entry: RenderedQR) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[entry.key] = entry
+            self._entries.move_to_end(entry.key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters and the hit rate since the last clear."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+PNG_COMPRESS_LEVEL = 6  # Pillow's default; level 9 is ~6x slower for a few bytes less
+
+
+def _png_chunk(chunk_type: bytes, data: bytes) -> bytes:
+    """Encode one PNG chunk: length, type, data and CRC of type + data."""
+    return struct.pack(">I", len(data)) + chunk_type + data + struct.pack(">I", zlib.crc32(chunk_type + data))
+
+
+class _ZipStream(io.RawIOBase):
+    """
+    Write-only, non-seekable sink for zipfile that hands out what was written so far.
+
+    zipfile falls back to data descriptors when the output cannot seek,
+    which is what makes the archive streamable.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
 
 class QRService:
     """Service for generating QR codes from links."""
 
+    cache = QRCache(max_entries=settings.QR_CACHE_SIZE)
+
+    # Off-loop rendering state, created on first use by `render_async`
+    _executor: Optional[Executor] = None
+    _batch_executor: Optional[Executor] = None
+    _semaphore: Optional[asyncio.Semaphore] = None
+    _semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+    _inflight: Dict[str, asyncio.Future] = {}
+
     @staticmethod
-    def generate_qr_code(
+    def _get_executor() -> Executor:
+        if QRService._executor is None:
+            if settings.QR_RENDER_EXECUTOR == "process":
+                QRService._executor = ProcessPoolExecutor(
+                    max_workers=settings.QR_RENDER_WORKERS,
+                    initializer=setup_worker_logging
+                )
+            else:
+                QRService._executor = ThreadPoolExecutor(
+                    max_workers=settings.QR_RENDER_WORKERS,
+                    thread_name_prefix="qr-render"
+                )
+        return QRService._executor
+
+    @staticmethod
+    def _get_semaphore() -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if QRService._semaphore is None or QRService._semaphore_loop is not loop:
+            QRService._semaphore = asyncio.Semaphore(settings.QR_RENDER_CONCURRENCY)
+            QRService._semaphore_loop = loop
+            QRService._inflight = {}
+        return QRService._semaphore
+
+    @staticmethod
+    async def render_async(
         link: str,
         fill_color: str = "black",
         back_color: str = "white",
         box_size: int = 10,
+        border: int = 4,
+        image_format: str = "png"
+    ) -> RenderedQR:
+        """
+        Render a QR code without blocking the event loop.
+
+        Cache hits are served inline. Misses are rendered on the QR executor
+        (a thread or process pool, see QR_RENDER_EXECUTOR), with at most
+        QR_RENDER_CONCURRENCY renders queued or running at once; concurrent
+        requests for the same image share a single render, which finishes
+        (and is cached) even if the request that started it goes away.
+
+        Args:
+            image_format: "png" or "svg"; the other args are as for `render`
+
+        Returns:
+            RenderedQR for the requested image
+        """
+        key = QRCache.make_key(link, fill_color, back_color, box_size, border, image_format=image_format)
+        entry = QRService.cache.get(key)
+        if entry is not None:
+            return entry
+
+        QRService._get_semaphore()
+        pending = QRService._inflight.get(key)
+        if pending is None:
+            # The render is its own task, so a caller that goes away only stops its own wait
+            pending = asyncio.create_task(
+                QRService._render_shared(key, link, fill_color, back_color, box_size, border, image_format),
+                name=f"qr-render-{key[:12]}"
+            )
+            QRService._inflight[key] = pending
+            pending.add_done_callback(functools.partial(QRService._render_done, key))
+        return await asyncio.shield(pending)
+
+    @staticmethod
+    async def _render_shared(
+        key: str,
+        link: str,
+        fill_color: str,
+        back_color: str,
+        box_size: int,
+        border: int,
+        image_format: str
+    ) -> RenderedQR:
+        """Render one image on the QR executor for every request waiting on it, and cache it."""
+        loop = asyncio.get_running_loop()
+        async with QRService._get_semaphore():
+            renderer = QRService.render_svg if image_format == "svg" else QRService.render_png
+            started = time.perf_counter()
+            content = await loop.run_in_executor(
+                QRService._get_executor(), renderer, link, fill_color, back_color, box_size, border
+            )
+            QR_RENDER_TIME.observe(time.perf_counter() - started, image_format)
+        media_type = "image/svg+xml" if image_format == "svg" else "image/png"
+        entry = RenderedQR(key, content, media_type=media_type)
+        QRService.cache.put(entry)
+        return entry
+
+    @staticmethod
+    def _render_done(key: str, task: asyncio.Task) -> None:
+        if QRService._inflight.get(key) is task:
+            del QRService._inflight[key]
+        # Mark the exception as retrieved when every waiter had already gone away
+        if not task.cancelled():
+            task.exception()
+
+    @staticmethod
+    def _get_batch_executor() -> Executor:
+        if QRService._batch_executor is None:
+            QRService._batch_executor = ProcessPoolExecutor(
+                max_workers=settings.QR_BATCH_WORKERS,
+                initializer=setup_worker_logging
+            )
+        return QRService._batch_executor
+
+    @staticmethod
+    async def render_batch_zip(
+        links: List[str],
+        image_format: str = "png",
+        box_size: int = 10,
         border: int = 4
-    ) -> BytesIO:
+    ) -> AsyncIterator[bytes]:
         """
-        Generate a QR code from a link and return as BytesIO.
+        Render many QR codes in parallel and stream them out as a ZIP archive.
+
+        Renders run on a process pool (QR_BATCH_WORKERS) with at most
+        QR_BATCH_WINDOW images in flight; each finished image is written to
+        the archive and its bytes yielded immediately, so memory stays bounded
+        regardless of the batch size. Entries are named 0001.png, 0002.png, ...
+        in request order, with a manifest.csv mapping file names to links.
+
+        Args:
+            links: The URLs/links to encode
+            image_format: "png" or "svg"
+            box_size: Size of each box in pixels
+            border: Border size in boxes
+
+        Yields:
+            Consecutive chunks of the ZIP file
+        """
+        loop = asyncio.get_running_loop()
+        executor = QRService._get_batch_executor()
+        renderer = QRService.render_svg if image_format == "svg" else QRService.render_png
+        # PNG data is already deflated, so storing it avoids a second useless compression pass
+        compression = zipfile.ZIP_DEFLATED if image_format == "svg" else zipfile.ZIP_STORED
+
+        sink = _ZipStream()
+        archive = zipfile.ZipFile(sink, mode="w")
+        manifest = io.StringIO()
+        manifest_writer = csv.writer(manifest)
+        manifest_writer.writerow(["file", "link", "status"])
+
+        pending: Deque[Tuple[int, str, asyncio.Future]] = deque()
+        queued = iter(enumerate(links, start=1))
+
+        def submit_next() -> None:
+            for index, link in queued:
+                key = QRCache.make_key(link, "black", "white", box_size, border, image_format=image_format)
+                # Batches are never cached, so their lookups must not count against the hit rate
+                cached = QRService.cache.peek(key)
+                if cached is not None:
+                    future = loop.create_future()
+                    future.set_result(cached.content)
+                else:
+                    # Print batches deliberately bypass the LRU so they don't evict hot join links
+                    future = loop.run_in_executor(executor, renderer, link, "black", "white", box_size, border)
+                pending.append((index, link, future))
+                return
+
+        try:
+            for _ in range(settings.QR_BATCH_WINDOW):
+                submit_next()
+
+            while pending:
+                index, link, future = pending.popleft()
+                name = f"{index:04d}.{image_format}"
+                try:
+                    content = await future
+                    archive.writestr(name, content, compress_type=compression)
+                    manifest_writer.writerow([name, link, "ok"])
+                except Exception as e:
+                    logger.error(f"Error generating QR code in batch: {str(e)}")
+                    manifest_writer.writerow(["", link, f"error: {e}"])
+                submit_next()
+                yield sink.drain()
+
+            archive.writestr("manifest.csv", manifest.getvalue(), compress_type=zipfile.ZIP_DEFLATED)
+            archive.close()
+            yield sink.drain()
+
+            logger.info("QR batch of %d links streamed", len(links))
+        finally:
+            # Client went away mid-stream: drop renders that have not started yet
+            for _, _, future in pending:
+                future.cancel()
+
+    @staticmethod
+    def shutdown() -> None:
+        """Stop the render executors, waiting for renders already running."""
+        if QRService._executor is not None:
+            QRService._executor.shutdown(wait=True, cancel_futures=True)
+            QRService._executor = None
+        if QRService._batch_executor is not None:
+            QRService._batch_executor.shutdown(wait=True, cancel_futures=True)
+            QRService._batch_executor = None
+
+    @staticmethod
+    def render(
+        link: str,
+        fill_color: str = "black",
+        back_color: str = "white",
+        box_size: int = 10,
+        border: int = 4
+    ) -> RenderedQR:
+        """
+        Render a QR code, serving it from the LRU cache when the same inputs were rendered before.
 
         Args:
             link: The URL/link to encode in the QR code
@@ -31,20 +385,120 @@ class QRService:
             border: Border size in boxes (default: 4)
 
         Returns:
-            BytesIO object containing the PNG image
+            RenderedQR holding the PNG bytes, base64 and data URL forms
+        """
+        key = QRCache.make_key(link, fill_color, back_color, box_size, border)
+        entry = QRService.cache.get(key)
+        if entry is None:
+            started = time.perf_counter()
+            png = QRService.render_png(link, fill_color, back_color, box_size, border)
+            QR_RENDER_TIME.observe(time.perf_counter() - started, "png")
+            entry = RenderedQR(key, png)
+            QRService.cache.put(entry)
+        return entry
+
+    @staticmethod
+    def _make_qr(link: str, box_size: int, border: int) -> qrcode.QRCode:
+        """Build the QR code module matrix for a link."""
+        qr = qrcode.QRCode(
+            version=1,  # Controls size (1 is smallest, auto-adjusts if needed)
+            error_correction=qrcode.constants.ERROR_CORRECT_L,
+            box_size=box_size,
+            border=border,
+        )
+        qr.add_data(link)
+        qr.make(fit=True)
+        return qr
+
+    @staticmethod
+    def _rasterize_numpy(modules: List[List[bool]], fill_color: str, back_color: str, box_size: int, border: int) -> bytes:
+        """Scale a module matrix to pixels and encode it as a 1-bit palette PNG."""
+        import numpy as np
+        from PIL import ImageColor
+
+        # 1 = dark module; pad with the quiet-zone border, then blow each module up to a box
+        grid = np.pad(np.asarray(modules, dtype=np.uint8), border)
+        pixels = grid.repeat(box_size, axis=0).repeat(box_size, axis=1)
+        height, width = pixels.shape
+
+        # One filter byte (0 = none) per scanline, followed by the row packed 8 pixels per byte
+        rows = np.packbits(pixels, axis=1)
+        scanlines = np.hstack((np.zeros((height, 1), dtype=np.uint8), rows))
+
+        palette = bytes(ImageColor.getrgb(back_color)[:3]) + bytes(ImageColor.getrgb(fill_color)[:3])
+        header = struct.pack(">IIBBBBB", width, height, 1, 3, 0, 0, 0)  # 1-bit, palette colour type
+        return b"".join((
+            PNG_SIGNATURE,
+            _png_chunk(b"IHDR", header),
+            _png_chunk(b"PLTE", palette),
+            _png_chunk(b"IDAT", zlib.compress(scanlines.tobytes(), PNG_COMPRESS_LEVEL)),
+            _png_chunk(b"IEND", b""),
+        ))
+
+    @staticmethod
+    def render_svg(
+        link: str,
+        fill_color: str = "black",
+        back_color: str = "white",
+        box_size: int = 10,
+        border: int = 4
+    ) -> bytes:
+        """
+        Render a QR code to SVG bytes, bypassing the cache.
+
+        No rasterization happens: each horizontal run of dark modules becomes
+        one rectangle in a single path, drawn over a background rect.
         """
         try:
-            # Create QR code instance
-            qr = qrcode.QRCode(
-                version=1,  # Controls size (1 is smallest, auto-adjusts if needed)
-                error_correction=qrcode.constants.ERROR_CORRECT_L,
-                box_size=box_size,
-                border=border,
+            matrix = QRService._make_qr(link, box_size, border).get_matrix()  # includes the border
+            size = len(matrix)
+
+            runs = []
+            for y, row in enumerate(matrix):
+                x = 0
+                while x < size:
+                    if not row[x]:
+                        x += 1
+                        continue
+                    start = x
+                    while x < size and row[x]:
+                        x += 1
+                    runs.append(f"M{start},{y}h{x - start}v1h-{x - start}z")
+
+            pixels = size * box_size
+            svg = (
+                f'<svg xmlns="http://www.w3.org/2000/svg" width="{pixels}" height="{pixels}" '
+                f'viewBox="0 0 {size} {size}" shape-rendering="crispEdges">'
+                f'<rect width="{size}" height="{size}" fill="{html.escape(back_color)}"/>'
+                f'<path fill="{html.escape(fill_color)}" d="{"".join(runs)}"/>'
+                f'</svg>'
             )
+            return svg.encode("utf-8")
+
+        except Exception as e:
+            logger.error(f"Error generating SVG QR code: {str(e)}")
+            raise
+
+    @staticmethod
+    def render_png(
+        link: str,
+        fill_color: str = "black",
+        back_color: str = "white",
+        box_size: int = 10,
+        border: int = 4
+    ) -> bytes:
+        """
+        Render a QR code to PNG bytes, bypassing the cache.
+
+        Uses the rasterizer selected by QR_RASTERIZER: "pil" draws through
+        qrcode's Pillow image factory, "numpy" scales the module matrix with
+        NumPy and encodes a 1-bit palette PNG directly.
+        """
+        try:
+            qr = QRService._make_qr(link, box_size, border)
 
-            # Add data
-            qr.add_data(link)
-            qr.make(fit=True)
+            if settings.QR_RASTERIZER == "numpy":
+                return QRService._rasterize_numpy(qr.modules, fill_color, back_color, box_size, border)
 
             # Create image
             img = qr.make_image(fill_color=fill_color, back_color=back_color)
@@ -52,15 +506,35 @@ class QRService:
             # Save to BytesIO
             buffer = BytesIO()
             img.save(buffer, format='PNG')
-            buffer.seek(0)
-
-            logger.info(f"QR code generated successfully for link: {link[:50]}...")
-            return buffer
+            return buffer.getvalue()
 
         except Exception as e:
             logger.error(f"Error generating QR code: {str(e)}")
             raise
 
+    @staticmethod
+    def generate_qr_code(
+        link: str,
+        fill_color: str = "black",
+        back_color: str = "white",
+        box_size: int = 10,
+        border: int = 4
+    ) -> BytesIO:
+        """
+        Generate a QR code from a link and return as BytesIO.
+
+        Args:
+            link: The URL/link to encode in the QR code
+            fill_color: Color of the QR code (default: black)
+            back_color: Background color (default: white)
+            box_size: Size of each box in pixels (default: 10)
+            border: Border size in boxes (default: 4)
+
+        Returns:
+            BytesIO object containing the PNG image
+        """
+        return BytesIO(QRService.render(link, fill_color, back_color, box_size, border).content)
+
     @staticmethod
     def generate_qr_code_base64(
         link: str,
@@ -83,18 +557,9 @@ class QRService:
             Base64 encoded string of the PNG image
         """
         try:
-            buffer = QRService.generate_qr_code(
-                link=link,
-                fill_color=fill_color,
-                back_color=back_color,
-                box_size=box_size,
-                border=border
-            )
-
-            # Encode to base64
-            base64_image = base64.b64encode(buffer.getvalue()).decode('utf-8')
+            base64_image = QRService.render(link, fill_color, back_color, box_size, border).base64
 
-            logger.info(f"QR code base64 generated for link: {link[:50]}...")
+            logger.info("QR code base64 generated for link %.50s...", link)
             return base64_image
 
         except Exception as e:
@@ -123,18 +588,9 @@ class QRService:
             Data URL string (data:image/png;base64,...)
         """
         try:
-            base64_image = QRService.generate_qr_code_base64(
-                link=link,
-                fill_color=fill_color,
-                back_color=back_color,
-                box_size=box_size,
-                border=border
-            )
-
-            # Create data URL
-            data_url = f"data:image/png;base64,{base64_image}"
+            data_url = QRService.render(link, fill_color, back_color, box_size, border).data_url
 
-            logger.info(f"QR code data URL generated for link: {link[:50]}...")
+            logger.info("QR code data URL generated for link %.50s...", link)
             return data_url
 
         except Exception as e:
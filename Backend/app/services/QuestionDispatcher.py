@@ -0,0 +1,135 @@
+"""
+Question Dispatcher - Answer submitted questions on a background worker pool
+"""
+import asyncio
+import logging
+from typing import List, Optional, Tuple
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.models.question import Question
+from app.services.GameMasterAgent import GameMasterAgent, game_master
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFull(Exception):
+    """Raised when the question queue has no room for another question."""
+
+
+class QuestionDispatcher:
+    """
+    Queue of submitted questions drained by a fixed pool of worker tasks.
+
+    Answers are recorded in the lobby's event log by the game master, so
+    clients pick them up from the lobby's update feed or by polling the
+    question itself. Workers are started on the first submission.
+    """
+
+    def __init__(self, master: GameMasterAgent, workers: int = 8, max_queue: int = 1000):
+        self.master = master
+        self.workers = workers
+        self.max_queue = max_queue
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: List[asyncio.Task] = []
+        self.pending = 0  # questions queued or being answered
+
+    def _ensure_started(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._queue is None or self._loop is not loop:
+            self._loop = loop
+            self.pending = 0
+            self._queue = asyncio.Queue()
+            self._tasks = [
+                asyncio.create_task(self._worker(), name=f"question-worker-{i}")
+                for i in range(self.workers)
+            ]
+        return self._queue
+
+    async def _worker(self) -> None:
+        while True:
+            pin, user_id, question_id = await self._queue.get()
+            try:
+                await self.master.answer_question(pin, user_id, question_id)
+            except Exception as e:
+                logger.error(f"Question worker failed on {question_id}: {str(e)}")
+            finally:
+                self.pending -= 1
+                self._queue.task_done()
+
+    def submit(
+        self,
+        pin: str,
+        user_id: str,
+        question_text: str,
+        idempotency_key: Optional[str] = None
+    ) -> Tuple[Question, bool]:
+        """
+        Record a question and queue it for answering.
+
+        Returns:
+            Tuple of (question, created) - a resubmission with a known idempotency
+            key returns the original question and is not queued again
+
+        Raises:
+            ValueError: If the lobby or user does not exist
+            ServiceDraining: If the server is shutting down
+            QueueFull: If too many questions are already waiting
+            RateLimited: If the user or the lobby is asking too fast
+            TokenBudgetExceeded: If the lobby has used up its token budget
+        """
+        queue = self._ensure_started()
+
+        # A resubmission never needs queue room, so check for it before refusing
+        lobby = self.master.get_lobby(pin)
+        if lobby and idempotency_key:
+            existing = lobby.find_idempotent_question(user_id, idempotency_key)
+            if existing:
+                return existing, False
+
+        if self.pending >= self.max_queue:
+            raise QueueFull("Too many questions waiting, please retry shortly")
+
+        question, created = self.master.submit_question(pin, user_id, question_text, idempotency_key)
+        if created:
+            self.pending += 1
+            queue.put_nowait((pin, user_id, question.question_id))
+        return question, created
+
+    async def stop(self, timeout: float) -> bool:
+        """
+        Wait up to `timeout` seconds for queued questions to be answered, then stop the workers.
+
+        Returns:
+            True if the queue was fully drained
+        """
+        if self._queue is None:
+            return True
+
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+            drained = True
+        except asyncio.TimeoutError:
+            drained = False
+            logger.warning(f"Stopping question workers with {self.pending} questions unanswered")
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._queue = None
+        self._tasks = []
+        self.pending = 0
+        return drained
+
+
+# Global instance - import this in your routes
+question_dispatcher = QuestionDispatcher(
+    game_master,
+    workers=settings.QUESTION_WORKERS,
+    max_queue=settings.QUESTION_QUEUE_SIZE
+)
+metrics.gauge(
+    "question_queue_pending",
+    "Questions queued or being answered by the background workers",
+    lambda: question_dispatcher.pending
+)
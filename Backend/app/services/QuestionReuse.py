@@ -0,0 +1,236 @@
+"""
+Question Reuse - Answer near-duplicate questions in a lobby from earlier answers
+"""
+import hashlib
+import logging
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Tuple
+import numpy as np
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.models.event import LobbyEvent, LobbyEventLog, LobbyEventType
+from app.models.lobby import Lobby
+from app.services.GeminiAgent import ALLOWED_RESPONSES
+
+logger = logging.getLogger(__name__)
+
+FEATURE_DIMS = 1024
+# Answered questions indexed per lobby (4 KB each); later ones are still answered, just not indexed
+MAX_INDEXED = 256
+CHAR_GRAM_WEIGHT = 0.5
+# Words that flip or pin down the meaning of an otherwise identical question
+NEGATIONS = frozenset({"not", "no", "never", "nor", "neither", "none", "nothing", "without"})
+# Words that never change what a yes/no question asks
+ARTICLES = frozenset({"a", "an", "the"})
+# Answers two similar questions cannot disagree on
+DEFINITE_ANSWERS = frozenset({"Yes", "No"})
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+REUSE = metrics.counter(
+    "question_reuse_total", "Questions looked up in their lobby's answered questions, by result", ("result",)
+)
+
+
+def _stem(token: str) -> str:
+    # Plural "s" only; anything smarter starts merging words that mean different things
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens without articles or plural "s", with "n't" expanded to "not"."""
+    return [
+        _stem(token)
+        for token in _TOKEN.findall(text.lower().replace("n't", " not"))
+        if token not in ARTICLES
+    ]
+
+
+@lru_cache(maxsize=65536)
+def _bucket(feature: str) -> int:
+    # Not crc32: it is linear, so same-length features differing the same way collide systematically
+    digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") % FEATURE_DIMS
+
+
+@lru_cache(maxsize=16384)
+def _word_buckets(token: str) -> Tuple[int, ...]:
+    """Buckets of a word's unigram (first) and its character trigrams."""
+    padded = f"#{token}#"
+    return (_bucket("w:" + token),) + tuple(_bucket("c:" + padded[j:j + 3]) for j in range(len(padded) - 2))
+
+
+@lru_cache(maxsize=256)
+def vectorize(text: str) -> Tuple[np.ndarray, FrozenSet[str]]:
+    """
+    Hashed n-gram vector of a question, and its guard words.
+
+    The vector combines word unigrams, word bigrams and character trigrams,
+    hashed into FEATURE_DIMS buckets and L2-normalized, so a dot product is
+    the cosine similarity. The guard words (negations and numbers) must be
+    identical for two questions to be considered the same: "Is it bigger
+    than 10?" and "Is it bigger than 100?" are close as vectors but not
+    interchangeable. Results are cached (and read-only), since a question
+    is vectorized once to look it up and again to index its answer.
+    """
+    tokens = tokenize(text)
+    vector = np.zeros(FEATURE_DIMS, dtype=np.float32)
+    if tokens:
+        indices: List[int] = []
+        weights: List[float] = []
+        for i, token in enumerate(tokens):
+            buckets = _word_buckets(token)
+            indices.extend(buckets)
+            weights.append(1.0)
+            weights.extend([CHAR_GRAM_WEIGHT] * (len(buckets) - 1))
+            if i:
+                indices.append(_bucket(f"b:{tokens[i - 1]} {token}"))
+                weights.append(1.0)
+        vector = np.bincount(indices, weights, minlength=FEATURE_DIMS).astype(np.float32)
+        vector /= np.linalg.norm(vector)
+    vector.flags.writeable = False
+    guards = frozenset(t for t in tokens if t in NEGATIONS or t.isdigit())
+    return vector, guards
+
+
+class QuestionIndex:
+    """Answered questions of one lobby, searchable by cosine similarity."""
+
+    def __init__(self, key: Tuple[str, Optional[str]]):
+        self.key = key  # (secret concept, context) the answers were given for
+        self._vectors = np.zeros((8, FEATURE_DIMS), dtype=np.float32)
+        self._guards: List[FrozenSet[str]] = []
+        self._answers: List[str] = []
+        self._texts: List[str] = []
+        self.reused = 0
+
+    def __len__(self) -> int:
+        return len(self._answers)
+
+    def add(self, text: str, answer: str) -> None:
+        size = len(self._answers)
+        if size >= MAX_INDEXED:
+            return
+        vector, guards = vectorize(text)
+        if not vector.any():
+            return
+        if size == len(self._vectors):
+            self._vectors = np.concatenate([self._vectors, np.zeros_like(self._vectors)])
+        self._vectors[size] = vector
+        self._guards.append(guards)
+        self._answers.append(answer)
+        self._texts.append(text)
+
+    def search(self, text: str, threshold: float) -> Optional[Tuple[str, float, str]]:
+        """
+        Find the most similar answered question at or above `threshold`.
+
+        Returns:
+            Tuple of (answer, similarity, matched question), or None
+        """
+        if not self._answers:
+            return None
+        vector, guards = vectorize(text)
+        similarities = self._vectors[:len(self._answers)] @ vector
+        candidates = np.flatnonzero(similarities >= threshold)
+        for i in candidates[np.argsort(similarities[candidates])[::-1]]:
+            if self._guards[i] == guards:
+                return self._answers[i], float(similarities[i]), self._texts[i]
+        return None
+
+
+class QuestionReuseCache:
+    """
+    Per-lobby indexes of answered questions, for answering paraphrases without the LLM.
+
+    A question whose hashed n-gram vector is at least `threshold` cosine-similar
+    to one already answered in the same lobby (with the same negations and
+    numbers) gets that answer. Only the game's standard answers are reused,
+    and an index is reset when the lobby's secret concept or context changes.
+    A threshold of 0 disables reuse. See benchmarks/eval_question_reuse.py for
+    the false-reuse rate of a threshold on a labeled question set.
+    """
+
+    def __init__(self, threshold: float = 0.9):
+        self.threshold = threshold
+        self._indexes: Dict[str, QuestionIndex] = {}
+        self._watched: Dict[str, LobbyEventLog] = {}
+
+    def _watch(self, lobby: Lobby) -> None:
+        """Drop a lobby's index when it is deleted."""
+        if self._watched.get(lobby.pin) is lobby.events:
+            return
+
+        pin = lobby.pin
+
+        def forget(event: LobbyEvent) -> None:
+            if event.type != LobbyEventType.LOBBY_DELETED:
+                return
+            self._watched.pop(pin, None)
+            index = self._indexes.pop(pin, None)
+            if index is not None and index.reused:
+                logger.info(
+                    "Lobby %s reused %d of %d answers", pin, index.reused, len(index),
+                    extra={"pin": pin, "reused": index.reused}
+                )
+
+        lobby.events.add_listener(forget)
+        self._watched[pin] = lobby.events
+
+    def _index(self, lobby: Lobby) -> QuestionIndex:
+        key = (lobby.secret_concept, lobby.context)
+        index = self._indexes.get(lobby.pin)
+        if index is None or index.key != key:
+            index = self._indexes[lobby.pin] = QuestionIndex(key)
+            self._watch(lobby)
+        return index
+
+    def lookup(self, lobby: Lobby, question_text: str) -> Optional[str]:
+        """
+        Answer a question from a near-duplicate already answered in the lobby.
+
+        Returns:
+            The earlier answer, or None if no answered question is similar enough
+        """
+        if not self.threshold:
+            return None
+        index = self._index(lobby)
+        match = index.search(question_text, self.threshold)
+        if match is None:
+            REUSE.inc("miss")
+            return None
+
+        answer, similarity, _ = match
+        index.reused += 1
+        REUSE.inc("hit")
+        logger.info(
+            "Reused answer in lobby %s (similarity %.3f, %d reused so far)", lobby.pin, similarity, index.reused,
+            extra={"pin": lobby.pin, "similarity": similarity, "reused": index.reused}
+        )
+        return answer
+
+    def conflicts(self, lobby: Lobby, question_text: str, answer: str, threshold: float) -> bool:
+        """
+        Whether a Yes/No answer contradicts the answer to a similar question asked earlier in the lobby.
+
+        Uses the same index as `lookup`, at a looser `threshold`, so it only
+        sees earlier answers while reuse is enabled.
+        """
+        if not self.threshold or answer not in DEFINITE_ANSWERS:
+            return False
+        index = self._indexes.get(lobby.pin)
+        if index is None or index.key != (lobby.secret_concept, lobby.context):
+            return False
+        match = index.search(question_text, threshold)
+        return match is not None and match[0] in DEFINITE_ANSWERS and match[0] != answer
+
+    def remember(self, lobby: Lobby, question_text: str, answer: str) -> None:
+        """Add an answered question to the lobby's index, if its answer is reusable."""
+        if self.threshold and answer in ALLOWED_RESPONSES:
+            self._index(lobby).add(question_text, answer)
+
+
+# Global instance - import this in your routes and services
+question_reuse = QuestionReuseCache(threshold=settings.QUESTION_REUSE_THRESHOLD)
@@ -0,0 +1,183 @@
+"""
+Usage Meter - Count LLM tokens and their cost per lobby, per user and per route
+"""
+import logging
+from typing import Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+LLM_TOKENS = metrics.counter(
+    "llm_tokens_total", "Tokens used by upstream LLM calls by route and kind", ("route", "kind")
+)
+LLM_COST = metrics.counter(
+    "llm_cost_usd_total", "Estimated cost in USD of upstream LLM calls by route", ("route",)
+)
+BUDGET_REFUSALS = metrics.counter(
+    "llm_budget_refusals_total", "Questions refused because their lobby's token budget was used up"
+)
+
+
+class TokenBudgetExceeded(Exception):
+    """Raised when a lobby has used up its token budget."""
+
+
+class TokenUsage:
+    """Running token totals of one lobby, user or route."""
+
+    __slots__ = ("calls", "input_tokens", "output_tokens")
+
+    def __init__(self):
+        self.calls = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens
+
+    def add(self, input_tokens: int, output_tokens: int) -> None:
+        self.calls += 1
+        self.input_tokens += input_tokens
+        self.output_tokens += output_tokens
+
+    def to_dict(self) -> Dict:
+        return {
+            "calls": self.calls,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "total_tokens": self.total_tokens,
+            "cost_usd": round(usage_cost(self.input_tokens, self.output_tokens), 6),
+        }
+
+
+def usage_cost(input_tokens: int, output_tokens: int) -> float:
+    """Estimated cost in USD of the given token counts at the configured prices."""
+    return (
+        input_tokens * settings.LLM_INPUT_COST_PER_MTOK
+        + output_tokens * settings.LLM_OUTPUT_COST_PER_MTOK
+    ) / 1_000_000
+
+
+class UsageMeter:
+    """
+    Token usage of the upstream LLM, aggregated per lobby, per user and per route.
+
+    Totals are taken from the usage metadata the model returns with each
+    response. Lobby and user totals are dropped when the lobby is deleted
+    (after being logged); route totals and the metrics are kept for the
+    lifetime of the process.
+    """
+
+    def __init__(self, lobby_budget: int = 0):
+        self.lobby_budget = lobby_budget
+        self.total = TokenUsage()
+        self._routes: Dict[str, TokenUsage] = {}
+        self._lobbies: Dict[str, TokenUsage] = {}
+        self._users: Dict[str, Dict[str, TokenUsage]] = {}
+
+    def record(
+        self,
+        route: str,
+        usage_metadata: Optional[dict],
+        pin: Optional[str] = None,
+        user_id: Optional[str] = None
+    ) -> None:
+        """
+        Add the usage of one LLM call.
+
+        Args:
+            route: What the call was made for, e.g. "question" or "chat"
+            usage_metadata: The response's usage metadata (input_tokens/output_tokens);
+                calls without it count as a call with no tokens
+            pin: Lobby the call was made for, if any
+            user_id: User the call was made for, if any
+        """
+        usage_metadata = usage_metadata or {}
+        input_tokens = int(usage_metadata.get("input_tokens") or 0)
+        output_tokens = int(usage_metadata.get("output_tokens") or 0)
+
+        self.total.add(input_tokens, output_tokens)
+        self._routes.setdefault(route, TokenUsage()).add(input_tokens, output_tokens)
+        if pin:
+            self._lobbies.setdefault(pin, TokenUsage()).add(input_tokens, output_tokens)
+            if user_id:
+                self._users.setdefault(pin, {}).setdefault(user_id, TokenUsage()).add(input_tokens, output_tokens)
+
+        LLM_TOKENS.inc(route, "input", amount=input_tokens)
+        LLM_TOKENS.inc(route, "output", amount=output_tokens)
+        LLM_COST.inc(route, amount=usage_cost(input_tokens, output_tokens))
+
+    def record_shared(
+        self,
+        usage_metadata: Optional[dict],
+        parties: List[Tuple[str, Optional[str], Optional[str]]]
+    ) -> None:
+        """
+        Split the usage of one LLM call made for several callers (a batch) evenly between them.
+
+        Args:
+            usage_metadata: The response's usage metadata
+            parties: (route, pin, user_id) of each caller; each is counted as one call
+        """
+        usage_metadata = usage_metadata or {}
+        input_tokens = int(usage_metadata.get("input_tokens") or 0)
+        output_tokens = int(usage_metadata.get("output_tokens") or 0)
+        count = len(parties)
+        for i, (route, pin, user_id) in enumerate(parties):
+            share = {
+                "input_tokens": input_tokens // count + (i < input_tokens % count),
+                "output_tokens": output_tokens // count + (i < output_tokens % count),
+            }
+            self.record(route, share, pin, user_id)
+
+    def check_budget(self, pin: str) -> None:
+        """
+        Refuse another LLM call for a lobby that has used up its token budget.
+
+        Calls already in flight are not counted, so a lobby can overshoot its
+        budget by the usage of its concurrent questions.
+
+        Raises:
+            TokenBudgetExceeded: If the lobby's budget is set and used up
+        """
+        if not self.lobby_budget:
+            return
+        usage = self._lobbies.get(pin)
+        if usage is not None and usage.total_tokens >= self.lobby_budget:
+            BUDGET_REFUSALS.inc()
+            raise TokenBudgetExceeded("This lobby has used up its question budget")
+
+    def lobby_usage(self, pin: str) -> Dict:
+        """Usage of one lobby with its per-user breakdown."""
+        usage = self._lobbies.get(pin) or TokenUsage()
+        return {
+            **usage.to_dict(),
+            "budget_tokens": self.lobby_budget or None,
+            "users": {user_id: user_usage.to_dict() for user_id, user_usage in self._users.get(pin, {}).items()},
+        }
+
+    def summary(self, top: int = 20) -> Dict:
+        """Overall and per-route totals, and the `top` lobbies by tokens used."""
+        lobbies = sorted(self._lobbies.items(), key=lambda item: item[1].total_tokens, reverse=True)
+        return {
+            "total": self.total.to_dict(),
+            "budget_tokens": self.lobby_budget or None,
+            "routes": {route: usage.to_dict() for route, usage in self._routes.items()},
+            "lobbies": {pin: usage.to_dict() for pin, usage in lobbies[:top]},
+        }
+
+    def forget(self, pin: str) -> None:
+        """Drop a deleted lobby's totals, logging what it used."""
+        usage = self._lobbies.pop(pin, None)
+        self._users.pop(pin, None)
+        if usage is not None:
+            logger.info(
+                "Lobby %s used %d tokens in %d LLM calls", pin, usage.total_tokens, usage.calls,
+                extra={"pin": pin, **usage.to_dict()}
+            )
+
+
+# Global instance - import this in your routes and services
+usage_meter = UsageMeter(lobby_budget=settings.LOBBY_TOKEN_BUDGET)
@@ -0,0 +1 @@
+# Performance benchmarks - run from the Backend folder with `python -m benchmarks.<name>`
@@ -0,0 +1,125 @@
+"""
+Latency, throughput and upstream cost of cross-lobby micro-batching by batch window.
+
+Usage (from the Backend folder):
+    python -m benchmarks.bench_batching
+    python -m benchmarks.bench_batching --rate 400 --concurrency 16 --windows 0 0.005 0.02
+    python -m benchmarks.bench_batching --max-batch 32 --json
+
+Questions about `--concepts` different secret concepts (one per simulated
+lobby) arrive as a Poisson stream of `--rate` questions per second and are
+answered through MicroBatcher in front of a GeminiAgent on the fake backend.
+A window of 0 is the agent on its own (one upstream call per question).
+
+The fake backend models the two things batching trades: each call costs
+`--latency` (plus jitter) and `--per-answer` more for each extra batched
+answer, and at most `--concurrency` calls run at once (a provider quota),
+so unbatched traffic above concurrency / latency questions per second
+queues. Reports per window: answer latency p50/p95/max, achieved
+throughput, upstream calls, mean batch size and input tokens per question.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from typing import List
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+
+from benchmarks.fake_llm import FakeChatModel
+from benchmarks.load_launcher import percentile
+from app.services.GeminiAgent import GeminiAgent
+from app.services.MicroBatcher import MicroBatcher
+from app.services.UsageMeter import usage_meter
+
+CONCEPTS = [
+    "Elephant", "Eiffel Tower", "Pizza", "Bicycle", "Albert Einstein", "Volcano", "Guitar", "Penguin",
+    "Smartphone", "Amazon River", "Chess", "Sunflower", "Submarine", "Harry Potter", "Coffee", "Tornado",
+]
+QUESTIONS = [
+    "Is it alive?", "Is it bigger than a car?", "Can you eat it?", "Is it man-made?", "Is it found in Europe?",
+    "Does it use electricity?", "Is it a person?", "Can it fly?", "Is it made of metal?", "Is it famous?",
+]
+
+
+async def scenario(window: float, args) -> dict:
+    agent = GeminiAgent()
+    model = FakeChatModel(args.latency, args.jitter, args.seed, args.per_answer, args.concurrency)
+    agent._llm = model
+    answerer = MicroBatcher(agent, window, args.max_batch) if window > 0 else agent
+    arrivals = random.Random(args.seed)
+    concepts = CONCEPTS[:args.concepts]
+    input_before = usage_meter.total.input_tokens
+    latencies: List[float] = []
+
+    async def ask(i: int) -> None:
+        started = time.perf_counter()
+        await answerer.chat(
+            f"{QUESTIONS[i % len(QUESTIONS)]} (#{i})", concepts[i % len(concepts)],
+            pin=f"{100000 + i % len(concepts)}", user_id=f"user-{i}"
+        )
+        latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    tasks = []
+    for i in range(args.questions):
+        tasks.append(asyncio.create_task(ask(i)))
+        await asyncio.sleep(arrivals.expovariate(args.rate))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "window_ms": window * 1000,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "max_ms": max(latencies) * 1000,
+        "questions_per_sec": args.questions / elapsed,
+        "upstream_calls": model.calls,
+        "mean_batch": args.questions / model.calls,
+        "input_tokens_per_question": (usage_meter.total.input_tokens - input_before) / args.questions,
+    }
+
+
+async def run(args) -> List[dict]:
+    return [await scenario(window, args) for window in args.windows]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--windows", type=float, nargs="+", default=[0, 0.002, 0.005, 0.01, 0.02],
+                        help="Batch windows in seconds (0 = no batching)")
+    parser.add_argument("--max-batch", type=int, default=16, help="Most questions per batch")
+    parser.add_argument("--questions", type=int, default=600, help="Questions per window")
+    parser.add_argument("--rate", type=float, default=200, help="Mean arrival rate, questions per second")
+    parser.add_argument("--concepts", type=int, default=len(CONCEPTS), help="Distinct secret concepts (lobbies)")
+    parser.add_argument("--latency", type=float, default=0.3, help="Fake upstream latency per call, seconds")
+    parser.add_argument("--jitter", type=float, default=0.1, help="Extra uniform random latency, seconds")
+    parser.add_argument("--per-answer", type=float, default=0.01, help="Extra latency per batched answer, seconds")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent upstream calls (0 = unlimited)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{args.questions} questions at {args.rate:g}/s over {args.concepts} concepts; "
+          f"upstream {args.latency * 1000:g}+{args.per_answer * 1000:g}/answer ms, concurrency {args.concurrency}")
+    print(f"{'window':>7} {'p50':>8} {'p95':>8} {'max':>8} {'q/s':>8} {'calls':>6} {'batch':>6} {'in tok/q':>9}")
+    for r in results:
+        print(
+            f"{r['window_ms']:>5.0f}ms {r['p50_ms']:>6.0f}ms {r['p95_ms']:>6.0f}ms {r['max_ms']:>6.0f}ms "
+            f"{r['questions_per_sec']:>8.1f} {r['upstream_calls']:>6} {r['mean_batch']:>6.1f} "
+            f"{r['input_tokens_per_question']:>9.0f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
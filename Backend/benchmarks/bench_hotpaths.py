@@ -0,0 +1,247 @@
+"""
+Micro-benchmarks of the game's hot paths, with a stored baseline and a regression check.
+
+Usage (from the Backend folder):
+    python -m benchmarks.bench_hotpaths                     # run and print
+    python -m benchmarks.bench_hotpaths --check             # fail if slower than the baseline
+    python -m benchmarks.bench_hotpaths --save-baseline     # record the current numbers
+    python -m benchmarks.bench_hotpaths --users 6 50 --questions 10 100 --lobbies 1000 100000
+
+Cases, each parameterized by the sizes given on the command line:
+  - leaderboard: GameMasterAgent.get_leaderboard (users per lobby x questions per user)
+  - lobby_info_host: the host's GET /lobby/{pin} body, rebuilt and served from the snapshot cache
+  - add_participant: Lobby.add_participant into a lobby of the given size
+  - generate_pin: the create route's unique-PIN loop with that many lobbies open
+  - process_question: GameMasterAgent.process_question with a zero-latency stub model
+  - question_reuse: a near-duplicate lookup (miss) in a lobby's index of answered questions
+  - qr_render: an uncached QRService PNG render
+
+Every case reports microseconds per operation (best of several rounds).
+Timings are divided by a fixed pure-Python calibration loop before they are
+compared, so a baseline recorded on one machine is usable on another of a
+different speed. --check exits 1 when any case is more than --threshold
+times slower than benchmarks/baseline.json.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+os.environ["EVENT_LOG_DIR"] = ""
+# Limits high enough never to refuse the benchmark's questions, while still doing the bucket work
+os.environ["QUESTION_RATE_PER_USER"] = os.environ["QUESTION_RATE_PER_LOBBY"] = "1e9"
+
+from app.models.lobby import Lobby
+from app.models.question import Question
+from app.models.user import User
+from app.services.GameMasterAgent import GameMasterAgent
+from app.services.LobbySnapshot import LobbySnapshotCache, build_lobby_info
+from app.services.QRService import QRService
+from app.services.QuestionReuse import QuestionIndex, vectorize
+from benchmarks.fake_llm import FakeChatModel
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+ROUNDS = 5
+
+
+def calibrate() -> float:
+    """Microseconds for a fixed mix of dict, list and string work, the machine-speed yardstick."""
+    def workload():
+        data = {}
+        for i in range(2000):
+            data[str(i)] = [i, i * 2, f"user-{i}"]
+        return sorted(data.values(), key=lambda v: v[1], reverse=True)
+    return measure(workload, 50)
+
+
+def measure(fn: Callable[[], object], iterations: int) -> float:
+    """Best-of-ROUNDS mean time of `fn` in microseconds."""
+    fn()
+    best = float("inf")
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        best = min(best, (time.perf_counter() - started) / iterations * 1e6)
+    return best
+
+
+def make_lobby(users: int, questions: int) -> Lobby:
+    lobby = Lobby(pin="1234567", host=User(name="Host"), timelimit=600, secret_concept="Narwhal", topic="Animals")
+    for u in range(users - 1):
+        player = User(name=f"Player {u}")
+        lobby.add_participant(player)
+        for q in range(questions):
+            question = Question(message=f"Is it thing number {q}?", user_id=player.user_id)
+            question.set_answer("Yes" if (u + q) % 3 else "No")
+            lobby.add_question(player.user_id, question)
+    return lobby
+
+
+def iterations_for(work: int, target: int = 200_000) -> int:
+    return max(10, min(5000, target // max(work, 1)))
+
+
+def bench_leaderboard(users: int, questions: int) -> float:
+    master = GameMasterAgent()
+    lobby = master.create_lobby(make_lobby(users, questions))
+    return measure(lambda: master.get_leaderboard(lobby.pin), iterations_for(users * questions))
+
+
+def bench_lobby_info_rebuild(users: int, questions: int) -> float:
+    lobby = make_lobby(users, questions)
+    return measure(
+        lambda: build_lobby_info(lobby, True).model_dump_json(),
+        iterations_for(users * questions * 20)
+    )
+
+
+def bench_lobby_info_cached(users: int, questions: int) -> float:
+    lobby = make_lobby(users, questions)
+    cache = LobbySnapshotCache()
+    return measure(lambda: cache.get(lobby, True), 20_000)
+
+
+def bench_add_participant(users: int) -> float:
+    lobby = make_lobby(users, 0)
+    players = [User(name=f"Late {i}") for i in range(2000)]
+    joined = iter(players)
+
+    def add():
+        player = next(joined)
+        lobby.add_participant(player)
+        lobby.participants.pop(player.user_id)
+
+    return measure(add, len(players) // (ROUNDS + 1))
+
+
+def bench_generate_pin(lobbies: int) -> float:
+    open_pins = {}
+    while len(open_pins) < lobbies:
+        open_pins[Lobby.generate_pin()] = None
+
+    def unique_pin():
+        pin = Lobby.generate_pin()
+        while pin in open_pins:
+            pin = Lobby.generate_pin()
+        return pin
+
+    return measure(unique_pin, 20_000)
+
+
+def bench_process_question(questions: int) -> float:
+    master = GameMasterAgent()
+    master.agent._llm = FakeChatModel(latency=0, jitter=0, seed=1)
+    lobby = master.create_lobby(make_lobby(2, questions))
+    player_id = next(iter(lobby.participants))
+
+    async def ask_many(count: int) -> float:
+        best = float("inf")
+        for _ in range(ROUNDS):
+            started = time.perf_counter()
+            for i in range(count):
+                # Distinct numbers so the near-duplicate index misses and every question reaches the model
+                await master.process_question(lobby.pin, player_id, f"Does it live deeper than {i} meters?")
+            best = min(best, (time.perf_counter() - started) / count * 1e6)
+        return best
+
+    return asyncio.run(ask_many(500))
+
+
+def bench_question_reuse(questions: int) -> float:
+    index = QuestionIndex(("Narwhal", None))
+    for q in range(questions):
+        index.add(f"Is it thing number {q}?", "No")
+    asked = iter(f"Does it live deeper than {i} meters?" for i in range(100_000))
+
+    def lookup():
+        vectorize.cache_clear()
+        return index.search(next(asked), 0.9)
+
+    return measure(lookup, 2000)
+
+
+def bench_qr_render() -> float:
+    links = iter(f"https://askjimmy.example/?pin={i:07d}" for i in range(10_000))
+    return measure(lambda: QRService.render_png(next(links)), 20)
+
+
+def run(args: argparse.Namespace) -> Dict[str, float]:
+    results: Dict[str, float] = {}
+    for users in args.users:
+        for questions in args.questions:
+            results[f"leaderboard[users={users},questions={questions}]"] = bench_leaderboard(users, questions)
+            results[f"lobby_info_host_rebuild[users={users},questions={questions}]"] = bench_lobby_info_rebuild(users, questions)
+            results[f"lobby_info_host_cached[users={users},questions={questions}]"] = bench_lobby_info_cached(users, questions)
+        results[f"add_participant[users={users}]"] = bench_add_participant(users)
+    for lobbies in args.lobbies:
+        results[f"generate_pin[lobbies={lobbies}]"] = bench_generate_pin(lobbies)
+    for questions in args.questions:
+        results[f"process_question[questions={questions}]"] = bench_process_question(questions)
+        results[f"question_reuse[questions={questions}]"] = bench_question_reuse(questions)
+    results["qr_render[png]"] = bench_qr_render()
+    return results
+
+
+def compare(results: Dict[str, float], calibration: float, baseline: dict, threshold: float) -> List[dict]:
+    """Relative timings of every case the baseline also has, with regressions flagged."""
+    rows = []
+    for case, micros in results.items():
+        base = baseline["results"].get(case)
+        if base is None:
+            continue
+        ratio = (micros / calibration) / (base / baseline["calibration_us"])
+        rows.append({"case": case, "ratio": ratio, "regressed": ratio > threshold})
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, nargs="+", default=[6, 50], help="Users per lobby, host included")
+    parser.add_argument("--questions", type=int, nargs="+", default=[10, 100], help="Questions per user")
+    parser.add_argument("--lobbies", type=int, nargs="+", default=[1000, 100_000], help="Open lobbies for generate_pin")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if a case regressed past --threshold")
+    parser.add_argument("--threshold", type=float, default=1.3, help="Allowed slowdown factor vs the baseline")
+    parser.add_argument("--save-baseline", action="store_true", help=f"Write the results to {BASELINE_PATH.name}")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args()
+
+    calibration = calibrate()
+    results = run(args)
+    report = {"calibration_us": calibration, "results": results}
+
+    comparison: List[dict] = []
+    if args.check or (args.baseline.exists() and not args.save_baseline):
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        comparison = compare(results, calibration, baseline, args.threshold)
+        report["comparison"] = comparison
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps({"calibration_us": calibration, "results": results}, indent=2) + "\n", encoding="utf-8")
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        ratios = {row["case"]: row for row in comparison}
+        print(f"calibration: {calibration:.1f} us")
+        print(f"{'case':<58} {'us/op':>10} {'vs baseline':>12}")
+        for case, micros in results.items():
+            row = ratios.get(case)
+            versus = f"{row['ratio']:.2f}x{' !' if row['regressed'] else ''}" if row else "-"
+            print(f"{case:<58} {micros:>10.2f} {versus:>12}")
+
+    regressions = [row["case"] for row in comparison if row["regressed"]]
+    if args.check and regressions:
+        print(f"{len(regressions)} case(s) slower than {args.threshold}x the baseline: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
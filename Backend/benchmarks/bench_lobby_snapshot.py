@@ -0,0 +1,105 @@
+"""
+Lobby info serialization: per-request encoding vs cached snapshots.
+
+Usage (from the Backend folder):
+    python -m benchmarks.bench_lobby_snapshot [--iterations 2000]
+
+Builds lobbies with 10, 100 and 1000 answered questions spread over five
+participants and, for the host and a participant view, measures:
+  - per-request: build LobbyInfo, then jsonable_encoder + json.dumps, which
+    is what returning the model from the route used to cost
+  - rebuild: build LobbyInfo and serialize it with pydantic (a cache miss)
+  - cached: LobbySnapshotCache.get on an unchanged lobby (a cache hit)
+"""
+import argparse
+import json
+import sys
+import time
+
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import JSONResponse
+
+from app.models.lobby import Lobby
+from app.models.question import Question
+from app.models.user import User
+from app.services.LobbySnapshot import LobbySnapshotCache, build_lobby_info
+
+SIZES = (10, 100, 1000)
+PARTICIPANTS = 5
+
+
+def make_lobby(questions: int) -> Lobby:
+    lobby = Lobby(
+        pin="1234567",
+        host=User(name="Host"),
+        timelimit=10,
+        secret_concept="Photosynthesis",
+        topic="Biology",
+        context="Plants turn light into chemical energy"
+    )
+    players = [User(name=f"Player {i}") for i in range(PARTICIPANTS)]
+    for player in players:
+        lobby.add_participant(player)
+    for i in range(questions):
+        player = players[i % PARTICIPANTS]
+        question = Question(message=f"Is it related to question number {i}?", user_id=player.user_id)
+        question.set_answer("Yes" if i % 3 else "No")
+        lobby.add_question(player.user_id, question)
+    return lobby
+
+
+def per_request(lobby: Lobby, is_host: bool) -> bytes:
+    return JSONResponse(jsonable_encoder(build_lobby_info(lobby, is_host))).body
+
+
+def rebuild(lobby: Lobby, is_host: bool) -> bytes:
+    return build_lobby_info(lobby, is_host).model_dump_json().encode("utf-8")
+
+
+def measure(fn, iterations: int) -> float:
+    fn()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args()
+
+    results = []
+    for size in SIZES:
+        lobby = make_lobby(size)
+        cache = LobbySnapshotCache()
+        # Fewer rounds for the slow paths on big lobbies keeps the run short
+        slow_iterations = max(20, args.iterations * 10 // size)
+        for role, is_host in (("host", True), ("participant", False)):
+            results.append({
+                "questions": size,
+                "role": role,
+                "body_bytes": len(cache.get(lobby, is_host)),
+                "per_request_us": measure(lambda: per_request(lobby, is_host), slow_iterations),
+                "rebuild_us": measure(lambda: rebuild(lobby, is_host), slow_iterations),
+                "cached_us": measure(lambda: cache.get(lobby, is_host), args.iterations),
+            })
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(
+            f"{'questions':>9} {'role':<12} {'bytes':>8} {'per-request us':>15}"
+            f" {'rebuild us':>11} {'cached us':>10} {'speedup':>9}"
+        )
+        for r in results:
+            print(
+                f"{r['questions']:>9} {r['role']:<12} {r['body_bytes']:>8} {r['per_request_us']:>15.1f}"
+                f" {r['rebuild_us']:>11.1f} {r['cached_us']:>10.2f} {r['per_request_us'] / r['cached_us']:>8.0f}x"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""
+Polling route throughput with inline vs queued, sampled logging.
+
+Usage (from the Backend folder):
+    python -m benchmarks.bench_logging [--requests 20000]
+
+Drives GET /api/v1/lobby/{pin} (the 3-second poll) straight through the
+ASGI app - no server or network, so logging cost is not hidden behind
+socket time - with app logs at INFO written to /dev/null:
+  - inline: no route sampling and a plain StreamHandler, every record
+    formatted and written by the request itself (what a basicConfig-style
+    setup does)
+  - queued: setup_logging(), i.e. the route sampler, a queue handler and
+    the background JSON writer
+Reports requests per second and how many records reached the writer.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+
+from app.core import logs
+from app.core.config import settings
+from app.main import app
+from app.models.lobby import Lobby
+from app.models.user import User
+from app.services.GameMasterAgent import game_master
+
+
+class _CountingStream:
+    def __init__(self, sink):
+        self.sink = sink
+        self.lines = 0
+
+    def write(self, text):
+        self.lines += text.count("\n")
+        return self.sink.write(text)
+
+    def flush(self):
+        self.sink.flush()
+
+
+async def poll(path: str, query: bytes, requests: int) -> float:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": query, "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 1), "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    started = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return requests / (time.perf_counter() - started)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args()
+
+    host = User(name="Host")
+    lobby = Lobby(pin="1234567", host=host, timelimit=10, secret_concept="Photosynthesis", topic="Biology")
+    lobby.add_participant(User(name="Player"))
+    game_master.create_lobby(lobby)
+    path = f"{settings.API_V1_STR}/lobby/{lobby.pin}"
+    query = f"user_id={host.user_id}".encode()
+
+    devnull = open(os.devnull, "w")
+    app_logger = logging.getLogger("app")
+    results = {}
+
+    # inline: every record formatted and written on the request path
+    rates, logs.sampled.rates = logs.sampled.rates, {}
+    stream = _CountingStream(devnull)
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logs.TextFormatter())
+    app_logger.addHandler(handler)
+    app_logger.setLevel(logging.INFO)
+    app_logger.propagate = False
+    results["inline"] = {"requests_per_sec": asyncio.run(poll(path, query, args.requests)), "records": stream.lines}
+    app_logger.removeHandler(handler)
+    logs.sampled.rates = rates
+
+    # queued: sampled, handed to the background writer unformatted
+    stream = _CountingStream(devnull)
+    original_stdout, sys.stdout = sys.stdout, stream
+    try:
+        logs.setup_logging()
+    finally:
+        sys.stdout = original_stdout
+    rps = asyncio.run(poll(path, query, args.requests))
+    logs.shutdown_logging()
+    results["queued"] = {"requests_per_sec": rps, "records": stream.lines}
+    results["speedup"] = results["queued"]["requests_per_sec"] / results["inline"]["requests_per_sec"]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'mode':<8} {'req/s':>9} {'records':>8}")
+        for mode in ("inline", "queued"):
+            print(f"{mode:<8} {results[mode]['requests_per_sec']:>9.0f} {results[mode]['records']:>8}")
+        print(f"speedup  {results['speedup']:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
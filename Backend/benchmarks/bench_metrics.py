@@ -0,0 +1,84 @@
+"""
+Instrumentation overhead of the metrics registry and middleware.
+
+Usage (from the Backend folder):
+    python -m benchmarks.bench_metrics [--iterations 200000]
+
+Measures a labelled Counter.inc and Histogram.observe, and the extra cost
+MetricsMiddleware adds to a request by driving a trivial ASGI app directly
+(no server, no network) with and without the middleware in front of it.
+Reports nanoseconds per operation.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+from app.core.metrics import MetricsMiddleware, MetricsRegistry
+
+
+class _Route:
+    path = "/api/v1/lobby/{pin}"
+
+
+async def plain_app(scope, receive, send):
+    scope["route"] = _Route
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def receive():
+    return {"type": "http.request", "body": b""}
+
+
+async def send(message):
+    pass
+
+
+def per_call_ns(fn, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1e9
+
+
+async def per_request_ns(app, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await app({"type": "http", "method": "GET", "path": "/api/v1/lobby/1234567"}, receive, send)
+    return (time.perf_counter() - started) / iterations * 1e9
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=200_000)
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args()
+
+    registry = MetricsRegistry()
+    counter = registry.counter("bench_total", "Benchmark counter", ("method", "route", "status"))
+    histogram = registry.histogram("bench_seconds", "Benchmark histogram", ("method", "route"))
+    instrumented = MetricsMiddleware(plain_app, registry=registry)
+
+    bare_ns = asyncio.run(per_request_ns(plain_app, args.iterations))
+    instrumented_ns = asyncio.run(per_request_ns(instrumented, args.iterations))
+    results = {
+        "counter_inc_ns": per_call_ns(lambda: counter.inc("GET", "/api/v1/lobby/{pin}", "200"), args.iterations),
+        "histogram_observe_ns": per_call_ns(lambda: histogram.observe(0.0042, "GET", "/api/v1/lobby/{pin}"), args.iterations),
+        "request_bare_ns": bare_ns,
+        "request_instrumented_ns": instrumented_ns,
+        "middleware_overhead_ns": instrumented_ns - bare_ns,
+        "render_ms": per_call_ns(registry.render, 1000) / 1e6,
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for name, value in results.items():
+            print(f"{name:<26} {value:>12.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
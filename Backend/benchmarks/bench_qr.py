@@ -0,0 +1,64 @@
+"""
+QR rendering throughput with and without the QRService LRU cache.
+
+Usage (from the Backend folder):
+    python -m benchmarks.bench_qr [--requests 500] [--links 20]
+
+Replays a host-screen-like workload: `--requests` data-URL renders drawn
+from `--links` distinct lobby join links with a skewed (Zipf-like)
+popularity, first with caching disabled and then with the configured cache.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+
+from app.services.QRService import QRCache, QRService
+
+
+def workload(requests: int, links: int, seed: int = 42) -> list:
+    rng = random.Random(seed)
+    join_links = [f"https://askjimmy.example/?pin={rng.randrange(10**6, 10**7)}" for _ in range(links)]
+    weights = [1 / (rank + 1) for rank in range(links)]
+    return rng.choices(join_links, weights=weights, k=requests)
+
+
+def run(links: list, cache_size: int) -> dict:
+    QRService.cache = QRCache(max_entries=cache_size)
+    started = time.perf_counter()
+    for link in links:
+        QRService.generate_qr_code_data_url(link)
+    elapsed = time.perf_counter() - started
+    return {
+        "cache_size": cache_size,
+        "renders_per_sec": len(links) / elapsed,
+        "mean_ms": elapsed / len(links) * 1000,
+        **{f"cache_{k}": v for k, v in QRService.cache.stats().items()},
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--links", type=int, default=20)
+    parser.add_argument("--cache-size", type=int, default=256)
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args()
+
+    links = workload(args.requests, args.links)
+    results = {"uncached": run(links, 0), "cached": run(links, args.cache_size)}
+    results["speedup"] = results["cached"]["renders_per_sec"] / results["uncached"]["renders_per_sec"]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for name in ("uncached", "cached"):
+            r = results[name]
+            print(f"{name:<9} {r['renders_per_sec']:>10.1f} renders/s  {r['mean_ms']:>7.3f} ms/render  hit rate {r['cache_hit_rate']:.1%}")
+        print(f"speedup   {results['speedup']:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
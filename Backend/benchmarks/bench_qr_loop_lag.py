@@ -0,0 +1,111 @@
+"""
+Event-loop lag under concurrent QR rendering and question load.
+
+Usage (from the Backend folder):
+    python -m benchmarks.bench_qr_loop_lag [--renders 200] [--concurrency 16] [--executor thread|process]
+
+Runs the same workload twice in one event loop: `--renders` uncached QR
+renders issued `--concurrency` at a time while simulated questions (a
+50 ms fake LLM await each) run continuously. "inline" renders on the loop,
+as the QR routes used to; "offloaded" uses QRService.render_async. Reports
+how late a 10 ms sleeper wakes up (loop lag) and how much the simulated
+questions overshoot their 50 ms.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from typing import List
+
+from app.core.config import settings
+from app.services.QRService import QRCache, QRService
+
+LAG_INTERVAL = 0.01
+QUESTION_LATENCY = 0.05
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def scenario(mode: str, renders: int, concurrency: int) -> dict:
+    # Disable caching so every request renders
+    QRService.cache = QRCache(max_entries=0)
+    loop = asyncio.get_running_loop()
+    done = asyncio.Event()
+    lag_ms: List[float] = []
+    question_overshoot_ms: List[float] = []
+
+    async def lag_sampler():
+        while not done.is_set():
+            started = loop.time()
+            await asyncio.sleep(LAG_INTERVAL)
+            lag_ms.append((loop.time() - started - LAG_INTERVAL) * 1000)
+
+    async def question_load():
+        while not done.is_set():
+            started = loop.time()
+            await asyncio.sleep(QUESTION_LATENCY)  # stands in for the upstream LLM call
+            question_overshoot_ms.append((loop.time() - started - QUESTION_LATENCY) * 1000)
+
+    async def render(i: int):
+        link = f"https://askjimmy.example/?pin={1000000 + i}"
+        if mode == "inline":
+            QRService.render_png(link)
+        else:
+            await QRService.render_async(link)
+
+    background = [asyncio.create_task(lag_sampler())] + [asyncio.create_task(question_load()) for _ in range(20)]
+    started = time.perf_counter()
+    for batch in range(0, renders, concurrency):
+        await asyncio.gather(*(render(i) for i in range(batch, min(batch + concurrency, renders))))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await asyncio.gather(*background)
+
+    return {
+        "renders_per_sec": renders / elapsed,
+        "loop_lag_p50_ms": percentile(lag_ms, 50),
+        "loop_lag_p99_ms": percentile(lag_ms, 99),
+        "loop_lag_max_ms": max(lag_ms, default=0.0),
+        "question_overshoot_p99_ms": percentile(question_overshoot_ms, 99),
+    }
+
+
+async def run(args) -> dict:
+    results = {}
+    for mode in ("inline", "offloaded"):
+        results[mode] = await scenario(mode, args.renders, args.concurrency)
+    QRService.shutdown()
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--renders", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--executor", choices=["thread", "process"], default=settings.QR_RENDER_EXECUTOR)
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args()
+
+    settings.QR_RENDER_EXECUTOR = args.executor
+    results = asyncio.run(run(args))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'mode':<10} {'renders/s':>10} {'lag p50':>9} {'lag p99':>9} {'lag max':>9} {'question p99':>13}  (ms)")
+        for mode, r in results.items():
+            print(
+                f"{mode:<10} {r['renders_per_sec']:>10.1f} {r['loop_lag_p50_ms']:>9.2f} {r['loop_lag_p99_ms']:>9.2f} "
+                f"{r['loop_lag_max_ms']:>9.2f} {r['question_overshoot_p99_ms']:>13.2f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""
+PIL vs NumPy QR rasterizer: speed and PNG size.
+
+Usage (from the Backend folder):
+    python -m benchmarks.bench_qr_rasterizer [--iterations 200]
+
+For a short join link and a long link, at two box sizes, measures the
+full uncached `QRService.render_png` with each QR_RASTERIZER setting, and
+the rasterize+encode step alone (the module matrix built once up front,
+since building it costs the same for both paths). Reports renders per
+second and the size of the resulting PNG.
+"""
+import io
+import argparse
+import json
+import sys
+import time
+
+from app.core.config import settings
+from app.services.QRService import QRService
+
+CASES = [
+    ("join link", "https://askjimmy.example/?pin=1234567"),
+    ("long link", "https://askjimmy.example/?pin=1234567&ref=" + "x" * 300),
+]
+BOX_SIZES = (10, 20)
+
+
+def rasterize_pil(qr, box_size: int) -> bytes:
+    buffer = io.BytesIO()
+    qr.make_image(fill_color="black", back_color="white").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def rasterize_numpy(qr, box_size: int) -> bytes:
+    return QRService._rasterize_numpy(qr.modules, "black", "white", box_size, qr.border)
+
+
+def measure(rasterizer: str, link: str, box_size: int, iterations: int) -> dict:
+    settings.QR_RASTERIZER = rasterizer
+    png = QRService.render_png(link, box_size=box_size)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        QRService.render_png(link, box_size=box_size)
+    full = time.perf_counter() - started
+
+    qr = QRService._make_qr(link, box_size, 4)
+    rasterize = rasterize_numpy if rasterizer == "numpy" else rasterize_pil
+    started = time.perf_counter()
+    for _ in range(iterations):
+        rasterize(qr, box_size)
+    raster_only = time.perf_counter() - started
+
+    return {
+        "renders_per_sec": iterations / full,
+        "rasterize_per_sec": iterations / raster_only,
+        "png_bytes": len(png),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args()
+
+    original = settings.QR_RASTERIZER
+    results = []
+    for name, link in CASES:
+        for box_size in BOX_SIZES:
+            row = {"case": name, "box_size": box_size}
+            for rasterizer in ("pil", "numpy"):
+                row[rasterizer] = measure(rasterizer, link, box_size, args.iterations)
+            row["speedup"] = row["numpy"]["renders_per_sec"] / row["pil"]["renders_per_sec"]
+            row["rasterize_speedup"] = row["numpy"]["rasterize_per_sec"] / row["pil"]["rasterize_per_sec"]
+            results.append(row)
+    settings.QR_RASTERIZER = original
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(
+            f"{'case':<10} {'box':>4} {'pil r/s':>9} {'numpy r/s':>10} {'speedup':>8}"
+            f" {'raster pil/s':>13} {'raster np/s':>12} {'speedup':>8} {'pil B':>7} {'numpy B':>8}"
+        )
+        for r in results:
+            print(
+                f"{r['case']:<10} {r['box_size']:>4} {r['pil']['renders_per_sec']:>9.1f} {r['numpy']['renders_per_sec']:>10.1f} "
+                f"{r['speedup']:>7.1f}x {r['pil']['rasterize_per_sec']:>13.1f} {r['numpy']['rasterize_per_sec']:>12.1f} "
+                f"{r['rasterize_speedup']:>7.1f}x {r['pil']['png_bytes']:>7} {r['numpy']['png_bytes']:>8}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""
+Import-time and cold-start benchmark for the FastAPI app.
+
+Usage (from the Backend folder):
+    python -m benchmarks.bench_startup [--runs 5] [--max-import-ms 600] [--max-cold-start-ms 1500]
+
+Every run starts a fresh interpreter, imports `app.main`, then runs the app
+lifespan and serves a first `/health` request. Exits non-zero if a budget is
+exceeded or if a heavy dependency (LangChain, SQLAlchemy) is imported eagerly,
+so regressions can be caught in CI.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Modules that must only be loaded on first use, never by `import app.main`
+LAZY_MODULES = ("langchain", "langchain_core", "langchain_google_genai", "sqlalchemy", "qrcode")
+
+CHILD_SCRIPT = """
+import json, sys, time
+t0 = time.perf_counter()
+import app.main
+t1 = time.perf_counter()
+eager = sorted({m.split('.')[0] for m in sys.modules} & set(%r))
+from fastapi.testclient import TestClient
+with TestClient(app.main.app) as client:
+    client.get('/health').raise_for_status()
+    t2 = time.perf_counter()
+print(json.dumps({'import_ms': (t1 - t0) * 1000, 'cold_start_ms': (t2 - t0) * 1000, 'eager': eager}))
+""" % (LAZY_MODULES,)
+
+
+def run_once() -> dict:
+    """Measure one cold start in a fresh interpreter."""
+    env = dict(os.environ)
+    env.setdefault("GOOGLE_API_KEY", "benchmark")
+    # Keep the run hermetic: no remote database, no on-disk event log, and no background
+    # LangChain import competing with the measured first request
+    env["DATABASE_URL"] = ""
+    env["EVENT_LOG_DIR"] = ""
+    env["LLM_PRELOAD"] = "false"
+
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD_SCRIPT],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-import-ms", type=float, default=None, help="Fail if the median import time exceeds this")
+    parser.add_argument("--max-cold-start-ms", type=float, default=None, help="Fail if the median cold start exceeds this")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args()
+
+    runs = [run_once() for _ in range(args.runs)]
+    summary = {
+        "runs": args.runs,
+        "import_ms_median": statistics.median(r["import_ms"] for r in runs),
+        "cold_start_ms_median": statistics.median(r["cold_start_ms"] for r in runs),
+        "eager_heavy_modules": sorted({m for r in runs for m in r["eager"]}),
+    }
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print(f"import app.main  median {summary['import_ms_median']:8.1f} ms")
+        print(f"cold start       median {summary['cold_start_ms_median']:8.1f} ms")
+        print(f"eager heavy modules: {', '.join(summary['eager_heavy_modules']) or 'none'}")
+
+    failures = []
+    if summary["eager_heavy_modules"]:
+        failures.append(f"heavy modules imported eagerly: {summary['eager_heavy_modules']}")
+    if args.max_import_ms and summary["import_ms_median"] > args.max_import_ms:
+        failures.append(f"import time {summary['import_ms_median']:.1f} ms > {args.max_import_ms} ms")
+    if args.max_cold_start_ms and summary["cold_start_ms_median"] > args.max_cold_start_ms:
+        failures.append(f"cold start {summary['cold_start_ms_median']:.1f} ms > {args.max_cold_start_ms} ms")
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
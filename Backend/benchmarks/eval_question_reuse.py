@@ -0,0 +1,99 @@
+"""
+Offline evaluation of near-duplicate question reuse: false-reuse rate and recall by threshold.
+
+Usage (from the Backend folder):
+    python -m benchmarks.eval_question_reuse
+    python -m benchmarks.eval_question_reuse --thresholds 0.8 0.85 0.9 --show-errors
+    python -m benchmarks.eval_question_reuse --pairs my_pairs.jsonl --json
+
+The labeled set is a JSONL file of {"first", "second", "same"} question pairs,
+where "same" means the second question must get the first one's answer. For
+each pair the first question is answered into an empty lobby index and the
+second is looked up, exactly as QuestionReuseCache does in a game.
+
+  - false-reuse rate: share of "different" pairs whose second question was
+    answered from the first (a wrong answer shown to a player)
+  - recall: share of "same" pairs that were reused (an LLM call saved)
+
+The default set (benchmarks/data/question_pairs.jsonl) is deliberately rich
+in hard negatives: one-letter edits, antonyms, negations and numbers.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+from app.core.config import settings
+from app.services.QuestionReuse import QuestionIndex
+
+DEFAULT_PAIRS = Path(__file__).parent / "data" / "question_pairs.jsonl"
+
+
+def load_pairs(path: Path) -> List[Dict]:
+    with path.open(encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def evaluate(pairs: List[Dict], threshold: float) -> Dict:
+    """Reuse outcome of every pair at one threshold."""
+    false_reuses = []
+    missed = []
+    reused_same = 0
+    for pair in pairs:
+        index = QuestionIndex(("concept", None))
+        index.add(pair["first"], "Yes")
+        match = index.search(pair["second"], threshold)
+        if pair["same"]:
+            if match:
+                reused_same += 1
+            else:
+                missed.append(pair)
+        elif match:
+            false_reuses.append({**pair, "similarity": round(match[1], 4)})
+
+    same = sum(1 for p in pairs if p["same"])
+    different = len(pairs) - same
+    return {
+        "threshold": threshold,
+        "false_reuse_rate": len(false_reuses) / different if different else 0.0,
+        "recall": reused_same / same if same else 0.0,
+        "false_reuses": false_reuses,
+        "missed": missed,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pairs", type=Path, default=DEFAULT_PAIRS, help="Labeled JSONL question pairs")
+    parser.add_argument(
+        "--thresholds", type=float, nargs="+",
+        default=sorted({0.7, 0.75, 0.8, 0.85, 0.9, 0.95, settings.QUESTION_REUSE_THRESHOLD}),
+        help="Cosine similarity thresholds to evaluate"
+    )
+    parser.add_argument("--show-errors", action="store_true", help="List false reuses at each threshold")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args()
+
+    pairs = load_pairs(args.pairs)
+    results = [evaluate(pairs, threshold) for threshold in args.thresholds]
+
+    if args.json:
+        print(json.dumps({"pairs": len(pairs), "results": results}, indent=2))
+        return 0
+
+    same = sum(1 for p in pairs if p["same"])
+    print(f"{len(pairs)} pairs ({same} same, {len(pairs) - same} different); "
+          f"configured threshold {settings.QUESTION_REUSE_THRESHOLD}")
+    print(f"{'threshold':>9} {'false reuse':>12} {'recall':>8}")
+    for result in results:
+        marker = "  <- configured" if result["threshold"] == settings.QUESTION_REUSE_THRESHOLD else ""
+        print(f"{result['threshold']:>9.2f} {result['false_reuse_rate']:>11.1%} {result['recall']:>7.1%}{marker}")
+        if args.show_errors:
+            for error in result["false_reuses"]:
+                print(f"{'':>12}{error['similarity']:.3f}  {error['first']!r} -> {error['second']!r}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
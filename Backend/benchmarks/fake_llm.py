@@ -0,0 +1,152 @@
+"""
+Fake LLM backend for load tests and benchmarks.
+
+Usage (from the Backend folder), to serve the app with the fake backend:
+    python -m benchmarks.fake_llm [--port 8000] [--latency 0.4] [--jitter 0.2]
+
+`FakeChatModel` stands in for the LangChain chat model inside GeminiAgent:
+`ainvoke` sleeps for a configurable latency and returns one of the game's
+allowed answers (or, for a batched prompt, a JSON object with one answer
+per numbered question), and `astream` streams a reply word by word, with
+token usage metadata shaped like Gemini's, so the whole request path runs
+without network access or an API key.
+"""
+import argparse
+import asyncio
+import os
+import json
+import random
+import re
+import sys
+from typing import Optional
+
+# Answer mix of a typical game; CORRECT is rare
+ANSWERS = ["Yes"] * 40 + ["No"] * 45 + ["I don't know"] * 8 + ["Off-topic"] * 4 + ["Invalid question"] * 2 + ["CORRECT"]
+# Words of a streamed (non-game) reply
+STREAM_WORDS = ["the", "game", "master", "thinks", "about", "your", "question", "and", "answers", "it", "carefully"]
+# Numbered question lines of a batched prompt (PromptsEngineering.batch_questions_prompt)
+BATCH_QUESTION = re.compile(r"^(\d+)\. ", re.MULTILINE)
+
+
+class FakeMessage:
+    """The parts of a LangChain AIMessage the app reads."""
+
+    def __init__(self, content: str, input_tokens: int, output_tokens: int):
+        self.content = content
+        self.usage_metadata = {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        }
+
+
+class FakeChatModel:
+    """
+    Drop-in for the chat model's `ainvoke` and `astream`.
+
+    Latency is `latency` seconds plus a uniform jitter of up to `jitter`
+    seconds, plus `per_answer` seconds for each answer of a batched prompt
+    beyond the first (generation time grows with the output). `astream`
+    yields a `stream_chunks`-word reply, the first word after the latency
+    and each next one `per_chunk` seconds later. At most
+    `concurrency` calls run at once, like a provider's concurrency quota;
+    the rest queue (0 means unlimited). `calls` counts invocations and
+    `streamed_chunks` the chunks generated, so benchmarks can check how many
+    upstream requests were made and how much was streamed.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.4,
+        jitter: float = 0.2,
+        seed: Optional[int] = None,
+        per_answer: float = 0.0,
+        concurrency: int = 0,
+        stream_chunks: int = 20,
+        per_chunk: float = 0.02
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.per_answer = per_answer
+        self.stream_chunks = stream_chunks
+        self.per_chunk = per_chunk
+        self.streamed_chunks = 0
+        self.calls = 0
+        self._random = random.Random(seed)
+        self._slots = asyncio.Semaphore(concurrency) if concurrency > 0 else None
+
+    async def ainvoke(self, messages, **kwargs) -> FakeMessage:
+        self.calls += 1
+        if self._slots is None:
+            return await self._respond(messages)
+        async with self._slots:
+            return await self._respond(messages)
+
+    async def astream(self, messages, **kwargs):
+        self.calls += 1
+        if self._slots is None:
+            async for chunk in self._stream(messages):
+                yield chunk
+            return
+        async with self._slots:
+            async for chunk in self._stream(messages):
+                yield chunk
+
+    async def _stream(self, messages):
+        input_tokens = sum(len(str(getattr(m, "content", m))) for m in messages) // 4
+        await asyncio.sleep(self.latency + self._random.uniform(0, self.jitter))
+        for i in range(self.stream_chunks):
+            if i:
+                await asyncio.sleep(self.per_chunk)
+            self.streamed_chunks += 1
+            # Usage comes as increments: the prompt with the first chunk, one output token per chunk
+            yield FakeMessage(("" if i == 0 else " ") + self._random.choice(STREAM_WORDS), input_tokens if i == 0 else 0, 1)
+
+    async def _respond(self, messages) -> FakeMessage:
+        input_tokens = sum(len(str(getattr(m, "content", m))) for m in messages) // 4
+        prompt = str(getattr(messages[-1], "content", messages[-1]))
+        delay = self.latency + self._random.uniform(0, self.jitter)
+        if "### QUESTIONS" in prompt:
+            numbers = BATCH_QUESTION.findall(prompt)
+            await asyncio.sleep(delay + self.per_answer * max(len(numbers) - 1, 0))
+            answers = {number: self._random.choice(ANSWERS) for number in numbers}
+            return FakeMessage(json.dumps(answers), input_tokens, 4 * len(answers))
+        await asyncio.sleep(delay)
+        return FakeMessage(self._random.choice(ANSWERS), input_tokens, 2)
+
+
+def install(
+    latency: float = 0.4,
+    jitter: float = 0.2,
+    seed: Optional[int] = None,
+    per_answer: float = 0.0,
+    concurrency: int = 0
+) -> FakeChatModel:
+    """Replace the game master's chat model with a fake one and return it."""
+    from app.services.GameMasterAgent import game_master
+
+    model = FakeChatModel(latency, jitter, seed, per_answer, concurrency)
+    # Both model tiers, so tiered routing (GEMINI_FAST_MODEL) also runs on the fake
+    game_master.agent._llm = game_master.agent._fast_llm = model
+    return model
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.4, help="Base upstream latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.2, help="Extra uniform random latency in seconds")
+    args = parser.parse_args()
+
+    os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+    import uvicorn
+    from app.main import app
+
+    install(args.latency, args.jitter)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,242 @@
+"""
+End-to-end load test simulating real games against a fake LLM backend.
+
+Usage (from the Backend folder):
+    python -m benchmarks.load_game [--lobbies 20] [--players 5] [--duration 60] [--http]
+                                   [--llm-latency 0.4] [--question-interval 15] [--output results.json]
+
+Each lobby is created through /lobby/create, joined by `--players`
+players and started. Then, for `--duration` seconds, every client (host
+and players) polls /lobby/{pin} and the leaderboard every 3 seconds, the
+way the frontend does, and every player asks a question on average every
+`--question-interval` seconds (exponentially distributed) through
+/lobby/{pin}/question. Answers come from benchmarks.fake_llm.
+
+By default the app runs in-process behind an ASGI transport; with --http a
+server with the fake backend is started on a local port and driven over
+real sockets. Reports p50/p95/p99 latency per route, throughput and
+memory; --json prints the results, --output also writes them to a file.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+from benchmarks.load_launcher import percentile, wait_ready
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+API = "/api/v1"
+POLL_INTERVAL = 3.0  # seconds, as in the frontend's setInterval polling
+
+
+class Recorder:
+    """Latency samples and error counts per route."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    async def call(self, client: httpx.AsyncClient, route: str, method: str, url: str, **kwargs) -> Optional[dict]:
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            response, ok = None, False
+        self.latencies[route].append((time.perf_counter() - started) * 1000)
+        if not ok:
+            self.errors[route] += 1
+            return None
+        return response.json()
+
+    def summary(self, elapsed: float) -> dict:
+        routes = {}
+        for route, samples in sorted(self.latencies.items()):
+            routes[route] = {
+                "requests": len(samples),
+                "errors": self.errors.get(route, 0),
+                "rps": len(samples) / elapsed,
+                "p50_ms": percentile(samples, 50),
+                "p95_ms": percentile(samples, 95),
+                "p99_ms": percentile(samples, 99),
+                "max_ms": max(samples),
+            }
+        total = sum(len(s) for s in self.latencies.values())
+        return {
+            "requests": total,
+            "errors": sum(self.errors.values()),
+            "rps": total / elapsed,
+            "routes": routes,
+        }
+
+
+async def play_lobby(
+    client: httpx.AsyncClient,
+    recorder: Recorder,
+    index: int,
+    players: int,
+    stop_at: float,
+    question_interval: float,
+    rng: random.Random
+) -> bool:
+    lobby = await recorder.call(client, "create", "POST", f"{API}/lobby/create", json={
+        "host_name": f"host-{index}", "secret_concept": "Narwhal", "topic": "Animals", "time_limit": 600
+    })
+    if not lobby:
+        return False
+    pin, host_id = lobby["pin"], lobby["host_id"]
+
+    user_ids = []
+    for p in range(players):
+        joined = await recorder.call(client, "join", "POST", f"{API}/lobby/join", json={
+            "pin": pin, "participant_name": f"player-{p}"
+        })
+        if joined:
+            user_ids.append(joined["user_id"])
+    await recorder.call(client, "start", "POST", f"{API}/lobby/start", json={"pin": pin, "host_id": host_id})
+
+    async def poll(user_id: str) -> None:
+        # Clients opened the page at different moments, so spread the first poll
+        await asyncio.sleep(rng.uniform(0, POLL_INTERVAL))
+        while time.perf_counter() < stop_at:
+            await recorder.call(client, "lobby_info", "GET", f"{API}/lobby/{pin}", params={"user_id": user_id})
+            await recorder.call(client, "leaderboard", "GET", f"{API}/lobby/{pin}/leaderboard")
+            await asyncio.sleep(min(POLL_INTERVAL, max(stop_at - time.perf_counter(), 0)))
+
+    async def ask(user_id: str) -> None:
+        asked = 0
+        while True:
+            delay = rng.expovariate(1 / question_interval)
+            if time.perf_counter() + delay >= stop_at:
+                return
+            await asyncio.sleep(delay)
+            asked += 1
+            await recorder.call(client, "question", "POST", f"{API}/lobby/{pin}/question", json={
+                "user_id": user_id, "question": f"Is it question {asked} of this player?"
+            })
+
+    await asyncio.gather(
+        poll(host_id),
+        *(poll(user_id) for user_id in user_ids),
+        *(ask(user_id) for user_id in user_ids),
+    )
+    await recorder.call(client, "delete", "POST", f"{API}/lobby/delete", json={"pin": pin, "host_id": host_id})
+    return True
+
+
+async def run_games(client: httpx.AsyncClient, args: argparse.Namespace) -> dict:
+    recorder = Recorder()
+    rng = random.Random(args.seed)
+    started = time.perf_counter()
+    stop_at = started + args.duration
+    played = await asyncio.gather(*(
+        play_lobby(client, recorder, i, args.players, stop_at, args.question_interval, rng)
+        for i in range(args.lobbies)
+    ))
+    elapsed = time.perf_counter() - started
+    result = recorder.summary(elapsed)
+    result["lobbies_played"] = sum(played)
+    result["elapsed_seconds"] = elapsed
+    return result
+
+
+def rss_mb(pid: Optional[int] = None) -> float:
+    """Current resident memory of a process (this one by default), in MiB."""
+    with open(f"/proc/{pid or 'self'}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+async def run_in_process(args: argparse.Namespace) -> dict:
+    from app.main import app
+    from benchmarks.fake_llm import install
+
+    model = install(args.llm_latency, args.llm_jitter, args.seed)
+    memory_before = rss_mb()
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", limits=limits, timeout=60) as client:
+            result = await run_games(client, args)
+    result["memory"] = {
+        "rss_before_mb": memory_before,
+        "rss_after_mb": rss_mb(),
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+    result["llm_calls"] = model.calls
+    return result
+
+
+async def run_over_http(args: argparse.Namespace) -> dict:
+    env = dict(os.environ, DATABASE_URL="", EVENT_LOG_DIR="", LOG_LEVEL="warning")
+    env.setdefault("GOOGLE_API_KEY", "benchmark")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.fake_llm", "--port", str(args.port),
+         "--latency", str(args.llm_latency), "--jitter", str(args.llm_jitter)],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        await wait_ready(base_url)
+        memory_before = rss_mb(server.pid)
+        clients = args.lobbies * (args.players + 1)
+        limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+            result = await run_games(client, args)
+        result["memory"] = {"rss_before_mb": memory_before, "rss_after_mb": rss_mb(server.pid)}
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lobbies", type=int, default=20)
+    parser.add_argument("--players", type=int, default=5)
+    parser.add_argument("--duration", type=float, default=60, help="Seconds of play after the lobbies start")
+    parser.add_argument("--question-interval", type=float, default=15, help="Mean seconds between a player's questions")
+    parser.add_argument("--llm-latency", type=float, default=0.4)
+    parser.add_argument("--llm-jitter", type=float, default=0.2)
+    parser.add_argument("--http", action="store_true", help="Drive a local server over HTTP instead of in-process")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="Also write the JSON results to this file")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args()
+
+    os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+    os.environ.setdefault("LOG_LEVEL", "warning")
+    runner = run_over_http if args.http else run_in_process
+    result = asyncio.run(runner(args))
+    result["config"] = {k: v for k, v in vars(args).items() if k not in ("output", "json")}
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(result, indent=2), encoding="utf-8")
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"{result['lobbies_played']} lobbies, {result['requests']} requests in {result['elapsed_seconds']:.1f}s "
+              f"({result['rps']:.1f} req/s, {result['errors']} errors)")
+        print(f"{'route':<12} {'requests':>9} {'errors':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+        for route, r in result["routes"].items():
+            print(f"{route:<12} {r['requests']:>9} {r['errors']:>7} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} "
+                  f"{r['p99_ms']:>8.2f} {r['max_ms']:>8.2f}")
+        print("memory: " + ", ".join(f"{k}={v:.1f}" for k, v in result["memory"].items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""
+Load test comparing the development and production launch profiles.
+
+Usage (from the Backend folder):
+    python -m benchmarks.load_launcher [--modes development production] [--clients 50] [--duration 10]
+
+For each mode the server is started through `run.py` on a local port, one
+lobby is created and joined, and `--clients` concurrent clients then poll
+`/lobby/{pin}` and the leaderboard as fast as they can for `--duration`
+seconds. Reports throughput and latency percentiles per mode.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+API = "/api/v1"
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def start_server(mode: str, port: int) -> subprocess.Popen:
+    env = dict(os.environ)
+    env.update(
+        SERVER_MODE=mode,
+        PORT=str(port),
+        # Lobbies live in process memory: with more workers, polls for the PIN would 404 on the others
+        WEB_CONCURRENCY="1",
+        DATABASE_URL="",
+        EVENT_LOG_DIR="",
+        LOG_LEVEL="warning",
+    )
+    env.setdefault("GOOGLE_API_KEY", "benchmark")
+    return subprocess.Popen(
+        [sys.executable, "run.py"],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+async def wait_ready(base_url: str, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not become healthy")
+
+
+async def run_load(base_url: str, clients: int, duration: float) -> dict:
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        lobby = (await client.post(f"{API}/lobby/create", json={
+            "host_name": "host", "secret_concept": "Narwhal", "topic": "Animals", "time_limit": 600
+        })).json()
+        pin = lobby["pin"]
+        player = (await client.post(f"{API}/lobby/join", json={"pin": pin, "participant_name": "player"})).json()
+
+        latencies: List[float] = []
+        errors = 0
+        stop_at = time.perf_counter() + duration
+
+        async def worker(index: int) -> None:
+            nonlocal errors
+            paths = [
+                f"{API}/lobby/{pin}?user_id={player['user_id']}",
+                f"{API}/lobby/{pin}/leaderboard",
+            ]
+            i = index
+            while time.perf_counter() < stop_at:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(paths[i % len(paths)])
+                    if response.status_code != 200:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append((time.perf_counter() - started) * 1000)
+                i += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(clients)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "mean_ms": statistics.fmean(latencies) if latencies else 0.0,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--modes", nargs="+", default=["development", "production"])
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args()
+
+    results = {}
+    for mode in args.modes:
+        base_url = f"http://127.0.0.1:{args.port}"
+        server = start_server(mode, args.port)
+        try:
+            asyncio.run(wait_ready(base_url))
+            results[mode] = asyncio.run(run_load(base_url, args.clients, args.duration))
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'mode':<12} {'rps':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+        for mode, r in results.items():
+            print(f"{mode:<12} {r['rps']:>9.1f} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} {r['p99_ms']:>8.2f} {r['errors']:>7}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,25 +1,22 @@
 """
 Simple script to run the FastAPI server.
 Usage: python run.py
+
+Set SERVER_MODE=production for the deployment profile (see app/core/server.py).
 """
 import uvicorn
+from app.core.config import settings
+from app.core.server import APP_PATH, uvicorn_options
 
 if __name__ == "__main__":
     print("=" * 60)
-    print("🚀 Starting Questions Game API")
+    print(f"🚀 Starting Questions Game API ({settings.SERVER_MODE})")
     print("=" * 60)
     print("\n📍 Server will be available at:")
-    print("   http://localhost:8000")
-    print("   http://localhost:8000/docs (API Documentation)")
-    print("   http://localhost:8000/health (Health Check)")
+    print(f"   http://localhost:{settings.PORT}")
+    print(f"   http://localhost:{settings.PORT}/docs (API Documentation)")
+    print(f"   http://localhost:{settings.PORT}/health (Health Check)")
     print("\n⌨️  Press CTRL+C to stop the server\n")
     print("=" * 60 + "\n")
 
-    uvicorn.run(
-        "app.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
-        log_level="info"
-    )
-
+    uvicorn.run(APP_PATH, **uvicorn_options())